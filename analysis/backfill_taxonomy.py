@@ -4,7 +4,7 @@ from __future__ import annotations
 import os
 import sys
 import time
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
 import pandas as pd
 
@@ -18,7 +18,7 @@ if PROJECT_ROOT not in sys.path:
     sys.path.insert(0, PROJECT_ROOT)
 
 from config import CONFIG  # noqa: E402
-from scraper_core import categorize_role_taxonomy, clean  # noqa: E402
+from scraper_core import categorize_role_taxonomy_batch  # noqa: E402
 
 
 # ============================================================
@@ -34,20 +34,19 @@ TAX_COLS = ["category_primary", "domain_l1", "domain_l2", "domain_l3", "tax_conf
 
 PLACEHOLDERS = {"", "non", "none", "na", "n/a", "-", "—", "<na>", "nan"}
 
+# what a blank classifier field becomes (never 'Non' for domain_l3, so old data gets something visible)
+TAX_DEFAULTS = {
+    "category_primary": "Non-IT",
+    "domain_l1": "Non-IT-Other",
+    "domain_l2": "Other",
+    "domain_l3": "Other",  # ✅ KEY
+    "tax_confidence": "0.35",
+}
+
 
 # ============================================================
 # Helpers
 # ============================================================
-def is_missing(x) -> bool:
-    # pd.NA-safe missing check
-    if pd.isna(x):
-        return True
-    s = str(x).strip()
-    if not s:
-        return True
-    return s.lower() in PLACEHOLDERS
-
-
 def _ensure_cols(df: pd.DataFrame) -> pd.DataFrame:
     for c in TAX_COLS:
         if c not in df.columns:
@@ -69,101 +68,118 @@ def _atomic_write_excel(df: pd.DataFrame, out_path: str) -> None:
     os.replace(tmp, out_path)
 
 
-def _normalize_tax_dict(tax: Dict) -> Dict[str, str]:
+# ============================================================
+# Backfill core
+# ============================================================
+def missing_mask(values: pd.Series) -> pd.Series:
     """
-    Make taxonomy stable and NEVER return 'Non' for domain_l3.
-    (So old data actually gets filled with something visible.)
+    True where a taxonomy cell is NA, blank or a placeholder ("Non", "N/A", ...).
     """
-    def nz(v, default: str) -> str:
-        s = "" if v is None else str(v).strip()
-        if not s or s.lower() in PLACEHOLDERS:
-            return default
-        return s
-
-    out = {
-        "category_primary": nz(tax.get("category_primary"), "Non-IT"),
-        "domain_l1": nz(tax.get("domain_l1"), "Non-IT-Other"),
-        "domain_l2": nz(tax.get("domain_l2"), "Other"),
-        "domain_l3": nz(tax.get("domain_l3"), "Other"),  # ✅ KEY
-        "tax_confidence": nz(tax.get("tax_confidence"), "0.35"),
-    }
-    return out
+    s = values.astype("string").str.strip().str.lower()
+    return (s.isna() | s.isin(PLACEHOLDERS)).fillna(True).astype(bool)
 
 
-# ============================================================
-# Backfill core
-# ============================================================
-def backfill_file(path: str, portal_name: str) -> None:
-    if not os.path.exists(path):
-        print(f"⚠️ {portal_name}: file not found -> {path}")
-        return
+def _text(df: pd.DataFrame, col: str) -> pd.Series:
+    # clean() per column: collapse whitespace, NA -> ""
+    if col not in df.columns:
+        return pd.Series("", index=df.index, dtype="string")
+    return df[col].astype("string").str.replace(r"\s+", " ", regex=True).str.strip().fillna("")
+
 
-    # Read
-    df = pd.read_excel(path, engine="openpyxl")
+def classify_rows(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Taxonomy for every row of `df` (TAX_COLS, same index).
+    """
+    title = _text(df, "title")
+    skills = _text(df, "skills")
+    position = _text(df, "position")
+    employment_type = _text(df, "employment_type")
+    industry = _text(df, "industry")
+    industry = industry.where(industry != "", _text(df, "category_primary"))
+    description = _text(df, "description")
+    # If description isn't present in your portal files, use skills as fallback
+    description = description.where(description != "", skills)
+
+    tax = categorize_role_taxonomy_batch(pd.DataFrame({
+        "title": title,
+        "skills": skills,
+        "position": position,
+        "employment_type": employment_type,
+        "description": description,
+        "industry": industry,
+    }))
+
+    # stable strings: blanks / placeholders -> TAX_DEFAULTS
+    out = pd.DataFrame(index=df.index)
+    for c in TAX_COLS:
+        values = tax[c].astype(object).map(str, na_action="ignore").astype("string")
+        out[c] = values.mask(missing_mask(values), TAX_DEFAULTS[c])
+    return out
+
+
+def backfill_frame(df: pd.DataFrame) -> Tuple[pd.DataFrame, Dict[str, int]]:
+    """
+    Fill missing taxonomy fields on a copy of one portal frame.
+    Only rows missing ANY taxonomy field are classified; good values are never overwritten.
+    """
     df = df.loc[:, ~df.columns.duplicated()].copy()  # defensive
     df = _ensure_cols(df)
     df = _to_string_cols(df, TAX_COLS)
 
-    # Count missing before
-    before_missing = df["domain_l3"].apply(is_missing).sum()
-
-    changed_rows = 0
-    updated_rows = 0
-
-    for idx, row in df.iterrows():
-        # Only backfill rows that are missing ANY of the taxonomy fields
-        needs = any(is_missing(row.get(c)) for c in TAX_COLS)
-        if not needs:
-            continue
-
-        title = clean(row.get("title")) or ""
-        skills = clean(row.get("skills")) or ""
-        position = clean(row.get("position")) or ""
-        employment_type = clean(row.get("employment_type")) or ""
-        industry = clean(row.get("industry")) or clean(row.get("category_primary")) or ""
-        description = clean(row.get("description")) or ""
-
-        # If description isn't present in your portal files, use skills as fallback
-        if not description:
-            description = skills
-
-        tax = categorize_role_taxonomy(
-            title=title,
-            skills=skills,
-            position=position,
-            employment_type=employment_type,
-            description=description,
-            industry=industry,
-        )
-        tax = _normalize_tax_dict(tax)
-
-        # Track change
-        old_snapshot = {c: ("" if pd.isna(df.at[idx, c]) else str(df.at[idx, c]).strip()) for c in TAX_COLS}
-        new_snapshot = {c: str(tax.get(c, "")).strip() for c in TAX_COLS}
-
-        # Apply only where missing (prevents overwriting good values)
-        wrote_any = False
-        for c in TAX_COLS:
-            if is_missing(df.at[idx, c]):
-                df.at[idx, c] = new_snapshot[c]
-                wrote_any = True
-
-        if wrote_any:
-            updated_rows += 1
-
-        # consider "changed" if any field differs (even if it wasn't missing)
-        if any(old_snapshot[c] != new_snapshot[c] and not is_missing(new_snapshot[c]) for c in TAX_COLS):
-            changed_rows += 1
-
-    after_missing = df["domain_l3"].apply(is_missing).sum()
-
-    _atomic_write_excel(df, path)
+    missing = pd.DataFrame({c: missing_mask(df[c]) for c in TAX_COLS}, index=df.index)
+    needs = missing.any(axis=1).to_numpy()
+    before_missing = int(missing["domain_l3"].sum())
+
+    stats = {
+        "updated_rows": int(needs.sum()),
+        "changed_rows": 0,
+        "filled_cells": int(missing.to_numpy().sum()),
+        "missing_before": before_missing,
+        "missing_after": before_missing,
+    }
+    if not needs.any():
+        return df, stats
+
+    sub = df.loc[needs, TAX_COLS]
+    tax = classify_rows(df.loc[needs])
+
+    # consider "changed" if any field differs (even if it wasn't missing)
+    stats["changed_rows"] = int((sub.fillna("").apply(lambda c: c.str.strip()) != tax).any(axis=1).sum())
 
+    # Apply only where missing (prevents overwriting good values)
+    df.loc[needs, TAX_COLS] = sub.mask(missing.loc[needs], tax)
+
+    stats["missing_after"] = int(missing_mask(df["domain_l3"]).sum())
+    return df, stats
+
+
+def print_stats(portal_name: str, stats: Dict[str, int]) -> None:
     print(f"\n🔄 Backfilling taxonomy for {portal_name}...")
-    print(f"✅ {portal_name} updated rows: {updated_rows}")
-    print(f"   Rows changed : {changed_rows}")
-    print(f"   Missing before (domain_l3): {before_missing}")
-    print(f"   Missing after  (domain_l3): {after_missing}")
+    print(f"✅ {portal_name} updated rows: {stats['updated_rows']}")
+    print(f"   Rows changed : {stats['changed_rows']}")
+    print(f"   Missing before (domain_l3): {stats['missing_before']}")
+    print(f"   Missing after  (domain_l3): {stats['missing_after']}")
+
+
+def backfill_file(path: str, portal_name: str, df: Optional[pd.DataFrame] = None) -> Optional[pd.DataFrame]:
+    """
+    Backfill one portal workbook. `df` = the workbook already loaded.
+    The workbook is rewritten only when at least one row was filled.
+    """
+    if df is None:
+        if not os.path.exists(path):
+            print(f"⚠️ {portal_name}: file not found -> {path}")
+            return None
+        df = pd.read_excel(path, engine="openpyxl")
+
+    df, stats = backfill_frame(df)
+    print_stats(portal_name, stats)
+
+    if stats["updated_rows"]:
+        _atomic_write_excel(df, path)
+    else:
+        print(f"   {portal_name}: nothing to fill, workbook not rewritten")
+    return df
 
 
 def main() -> None:
@@ -2,14 +2,24 @@ import os
 import sys
 
 ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
-if ROOT_DIR not in sys.path:
-    sys.path.insert(0, ROOT_DIR)
+ANALYSIS_DIR = os.path.join(ROOT_DIR, "analysis")
+for _p in (ROOT_DIR, ANALYSIS_DIR):
+    if _p not in sys.path:
+        sys.path.insert(0, _p)
     
 import time
+import json
 import shutil
+import argparse
 from datetime import datetime
 from typing import Dict, List, Optional
-from scraper_core import categorize_role_taxonomy
+from config import CONFIG
+from backfill_taxonomy import backfill_frame
+from gazetteer import resolve_locations
+from job_store import read_rows_since
+from key_index import workbook_stamp
+from master_store import MASTER_PARQUET_DIR, parquet_available, read_master, write_master_parquet
+from scraper_core import EXPERIENCE_COLS, SALARY_COLS, normalize_experience_columns, normalize_salary_columns
 
 import pandas as pd
 
@@ -21,6 +31,12 @@ DATA_DIR = "/Users/bikal/Library/CloudStorage/OneDrive-Personal/Nepal_Job_Market
 LOCAL_CACHE_DIR = "/Users/bikal/Data_scraping/data_local"
 LOCAL_DASH_CSV = os.path.join(LOCAL_CACHE_DIR, "jobs_master_local.csv")
 
+# incremental builds: per-portal high-water mark (workbook stamp + max scraped_at)
+MASTER_STATE_JSON = os.path.join(LOCAL_CACHE_DIR, "jobs_master_state.json")
+
+# incremental builds refresh the big OneDrive workbook at most this often (--full always does)
+MASTER_XLSX_MIN_INTERVAL_SEC = 30 * 60
+
 MASTER_XLSX = os.path.join(DATA_DIR, "jobs_master.xlsx")
 MASTER_CSV = os.path.join(DATA_DIR, "jobs_master.csv")  # fast for dashboards
 
@@ -30,9 +46,13 @@ FILES = {
     "linkedin": os.path.join(DATA_DIR, "linkedin_jobs.xlsx"),
 }
 
+# portals that only list one country's jobs: a location overrides that country only when it names another one
+SINGLE_COUNTRY_PORTALS = {"merojob": "Nepal", "jobsnepal": "Nepal"}
+
 # master schema (you can add more columns anytime)
 MASTER_SCHEMA = [
     "global_key",
+    "global_key_hash",
     "source",
     "job_id",
     "job_url",
@@ -40,6 +60,8 @@ MASTER_SCHEMA = [
     "company",
     "company_link",
     "location",
+    "city",              # city / region / country resolved from location
+    "region",
     "country",
     "posted_date",
     "num_applicants",
@@ -49,6 +71,12 @@ MASTER_SCHEMA = [
     "type",
     "compensation",
     "commitment",
+    "salary_min",        # salary_* parsed from compensation
+    "salary_max",
+    "salary_currency",
+    "salary_period",
+    "exp_min_years",     # exp_* parsed from commitment
+    "exp_max_years",
     "skills",
     "category_primary",
     "domain_l1",
@@ -65,52 +93,57 @@ PLACEHOLDERS = {
     "<na>", "<NA>", "nan", "NaN", "NULL", "null"
 }
 
-TAX_COLS = ["category_primary", "domain_l1", "domain_l2", "domain_l3", "tax_confidence"]
 
 def _ensure_taxonomy(master: pd.DataFrame) -> pd.DataFrame:
     """
-    Backfill taxonomy for old rows that don't have it yet.
+    Backfill taxonomy for rows that don't have it yet (same rules as backfill_taxonomy).
+    In the post-cycle pipeline the frames arrive already backfilled, so this is a mask check.
     Uses existing columns only (no re-scrape).
     """
-    master = master.copy()
-
-    # make sure columns exist
-    for c in TAX_COLS:
-        if c not in master.columns:
-            master[c] = pd.NA
-
-    def _missing(x) -> bool:
-        if pd.isna(x): 
-            return True
-        s = str(x).strip().lower()
-        return (s == "") or (s in {"non", "none", "na", "n/a", "null", "nan", "<na>", "<na>"})
-
-    # rows that need taxonomy
-    mask = master["domain_l1"].apply(_missing) | master["category_primary"].apply(_missing)
-    if not mask.any():
-        return master
+    master, _ = backfill_frame(master)
+    return master
 
-    subset_idx = master.index[mask].tolist()
+def _add_pay_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    compensation -> salary_min/max/currency/period, commitment -> exp_min/max_years
+    (scraper_core's normalize_salary / normalize_experience_years, whole columns at once).
+    """
+    for src, parse in (("compensation", normalize_salary_columns), ("commitment", normalize_experience_columns)):
+        for c, values in parse(df[src]).items():
+            df[c] = values
+    return df
 
-    for idx in subset_idx:
-        row = master.loc[idx]
 
-        tax = categorize_role_taxonomy(
-            title=str(row.get("title", "") or ""),
-            skills=str(row.get("skills", "") or ""),
-            position=str(row.get("position", "") or ""),
-            employment_type=str(row.get("employment_type", "") or ""),
-            description=str(row.get("description", "") or row.get("full_text", "") or ""),
-            industry=str(row.get("industry", "") or ""),
-        )
+def _typed_pay_columns(master: pd.DataFrame) -> pd.DataFrame:
+    """
+    Re-type the parsed columns of a stored master (read back as strings);
+    masters built before the columns existed get them parsed here.
+    """
+    if not all(c in master.columns for c in SALARY_COLS + EXPERIENCE_COLS):
+        return _add_pay_columns(master)
+    for c in ("salary_min", "salary_max"):
+        master[c] = pd.to_numeric(master[c], errors="coerce").astype("Int64")
+    for c in EXPERIENCE_COLS:
+        master[c] = pd.to_numeric(master[c], errors="coerce").astype("Float64")
+    return master
 
-        master.at[idx, "category_primary"] = tax.get("category_primary")
-        master.at[idx, "domain_l1"] = tax.get("domain_l1")
-        master.at[idx, "domain_l2"] = tax.get("domain_l2")
-        master.at[idx, "domain_l3"] = tax.get("domain_l3")
-        master.at[idx, "tax_confidence"] = tax.get("tax_confidence")
 
-    return master
+def _add_place_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    location -> city / region / country (gazetteer.py). A location the gazetteer
+    can't place ("APAC", "Remote") keeps the portal's country; on SINGLE_COUNTRY_PORTALS
+    so does one that only implies another country ("Hyderabad, Sindh" is not India there).
+    City / region are kept only when they lie in the final country.
+    """
+    places = resolve_locations(df["location"])
+    portal_country = df["source"].map(SINGLE_COUNTRY_PORTALS).astype("string")
+    implied = portal_country.notna() & ~places["country_stated"]
+    country = places["country"].mask(implied, portal_country).fillna(df["country"].astype("string"))
+    inside = (places["country"] == country).fillna(False)
+    df["city"] = places["city"].where(inside)
+    df["region"] = places["region"].where(inside)
+    df["country"] = country
+    return df
 
 # =========================
 # HELPERS
@@ -208,40 +241,45 @@ def _build_global_key(df: pd.DataFrame) -> pd.DataFrame:
       1) job_url (best)
       2) source:job_id
       3) source:title:company:location fallback
+    Also adds global_key_hash (int64) for cheap joins / dedupe downstream.
     """
 
-    def _s(x) -> str:
-        if pd.isna(x):
-            return ""
-        return str(x).strip()
+    def _s(col: str) -> pd.Series:
+        if col not in df.columns:
+            return pd.Series("", index=df.index, dtype="string")
+        return df[col].astype("string").str.strip().fillna("")
 
-    url = df["job_url"] if "job_url" in df.columns else pd.Series([""] * len(df))
-    job_id = df["job_id"] if "job_id" in df.columns else pd.Series([""] * len(df))
-    source = df["source"] if "source" in df.columns else pd.Series([""] * len(df))
-    title = df["title"] if "title" in df.columns else pd.Series([""] * len(df))
-    company = df["company"] if "company" in df.columns else pd.Series([""] * len(df))
-    location = df["location"] if "location" in df.columns else pd.Series([""] * len(df))
+    url = _s("job_url")
+    source = _s("source").str.lower()
+    job_id = _s("job_id")
 
-    keys: List[str] = []
-    for i in range(len(df)):
-        u = _s(url.iloc[i])
-        s = _s(source.iloc[i]).lower()
-        j = _s(job_id.iloc[i])
+    fallback = (
+        source + ":" + _s("title").str.lower() + ":" + _s("company").str.lower() + ":" + _s("location").str.lower()
+    ).str.strip(":")
+    by_id = (source + ":" + job_id).where((source != "") & (job_id != ""), fallback)
 
-        if u:
-            keys.append(u)
-            continue
-        if s and j:
-            keys.append(f"{s}:{j}")
-            continue
+    df["global_key"] = url.where(url != "", by_id)
+    df["global_key_hash"] = _key_hash(df["global_key"])
+    return df
 
-        t = _s(title.iloc[i]).lower()
-        c = _s(company.iloc[i]).lower()
-        l = _s(location.iloc[i]).lower()
-        keys.append(f"{s}:{t}:{c}:{l}".strip(":"))
 
-    df["global_key"] = keys
-    return df
+def _key_hash(keys: pd.Series) -> pd.Series:
+    """
+    Stable 64-bit hash of the (stripped) global_key, as signed int64.
+    """
+    values = keys.astype("string").str.strip().fillna("").to_numpy(dtype=object)
+    return pd.Series(pd.util.hash_array(values).view("int64"), index=keys.index, dtype="Int64")
+
+
+def _scraped_ts(values: pd.Series) -> pd.Series:
+    """
+    scraped_at -> naive timestamps (NaT when unparseable).
+    """
+    try:
+        return pd.to_datetime(values, errors="coerce", format="mixed")
+    except (TypeError, ValueError):
+        # mixed naive / tz-aware stamps
+        return pd.to_datetime(values, errors="coerce", format="mixed", utc=True).dt.tz_convert(None)
 
 
 def _parse_scraped_at(master: pd.DataFrame) -> pd.DataFrame:
@@ -249,73 +287,233 @@ def _parse_scraped_at(master: pd.DataFrame) -> pd.DataFrame:
     Parse scraped_at to datetime safely (keeps original column but also provides parsed values).
     """
     if SORT_BY in master.columns:
-        master[SORT_BY] = pd.to_datetime(master[SORT_BY], errors="coerce")
+        master[SORT_BY] = _scraped_ts(master[SORT_BY])
     return master
 
 
+# =========================
+# INCREMENTAL STATE
+# =========================
+def _load_state() -> Dict:
+    try:
+        with open(MASTER_STATE_JSON, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_state(state: Dict) -> None:
+    _ensure_dir(os.path.dirname(MASTER_STATE_JSON))
+    tmp = MASTER_STATE_JSON + f".tmp_{int(time.time())}"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(state, f, indent=1, sort_keys=True)
+    os.replace(tmp, MASTER_STATE_JSON)
+
+
+def _store_path(portal: str) -> Optional[str]:
+    """
+    SQLite store of a portal when it is the source of truth (the workbook is only its export).
+    """
+    if CONFIG.storage_backend != "sqlite":
+        return None
+    path = os.path.join(CONFIG.store_dir, f"{portal}_jobs.sqlite")
+    return path if os.path.exists(path) else None
+
+
+def portal_since(full: bool = False) -> Dict[str, str]:
+    """
+    Day of each portal's high-water mark: the first scraped_at day an incremental build reads.
+    Empty for a full rebuild.
+    """
+    if full:
+        return {}
+    portals = _load_state().get("portals", {})
+    return {p: v["hwm"][:10] for p, v in portals.items() if v.get("hwm")}
+
+
+def _load_existing_master() -> Optional[pd.DataFrame]:
+    """
+    Last built master (Parquet first, local CSV fallback), or None.
+    """
+    master = None
+    if parquet_available():
+        try:
+            master = read_master(root=MASTER_PARQUET_DIR)
+        except Exception as e:
+            print(f"[WARN] Could not read Parquet master: {e}")
+            master = None
+    if (master is None or master.empty) and os.path.exists(LOCAL_DASH_CSV):
+        try:
+            master = pd.read_csv(LOCAL_DASH_CSV, dtype="string", keep_default_na=False)
+        except Exception as e:
+            print(f"[WARN] Could not read local master csv: {e}")
+            return None
+    if master is None or master.empty or "global_key" not in master.columns:
+        return None
+
+    master = master.drop(columns=[c for c in ["master_built_at"] if c in master.columns])
+    master = _clean_placeholders(master.astype("string"))
+    master["global_key_hash"] = _key_hash(master["global_key"])  # also fills masters built before the column existed
+    return _typed_pay_columns(_ensure_columns(master, ["compensation", "commitment"]))
+
+
+def _read_portal(portal: str, path: str, since: Optional[str]) -> Optional[pd.DataFrame]:
+    """
+    Portal rows from the SQLite store (only days >= since) or the latest workbook.
+    """
+    store = _store_path(portal)
+    if store:
+        try:
+            return read_rows_since(store, since_day=since[:10] if since else None)
+        except Exception as e:
+            print(f"[WARN] Store read failed for {portal}, using the workbook: {e}")
+
+    # Always read the latest portal Excel
+    try:
+        return _read_excel_with_retry(path, retries=3, pause=1.5)
+    except Exception as e:
+        print(f"[WARN] Direct read failed for {portal}: {e}")
+        cached = _copy_to_local_cache(path, LOCAL_CACHE_DIR)
+        if not cached:
+            print(f"❌ Could not read {portal} (direct+cache failed). Skipping.")
+            return None
+        return _read_excel_with_retry(cached, retries=3, pause=1.0)
+
+
+def _prepare_rows(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Portal rows -> master rows (schema, taxonomy, salary / experience, global_key, parsed scraped_at).
+    """
+    df = _ensure_columns(df, MASTER_SCHEMA)
+    df = _ensure_taxonomy(df)
+    df = _add_pay_columns(df)
+
+    # Build global key for dedupe
+    df = _build_global_key(df)
+    df["global_key"] = df["global_key"].astype("string").str.strip()
+
+    remaining_cols = [c for c in df.columns if c not in MASTER_SCHEMA]
+    return _parse_scraped_at(df[MASTER_SCHEMA + remaining_cols])
+
+
 # =========================
 # MAIN
 # =========================
-def main():
-    print("\n🧩 BUILDING MASTER DATASET (always from latest portal files)")
+def main(
+    full: bool = False,
+    frames: Optional[Dict[str, pd.DataFrame]] = None,
+    stamps: Optional[Dict[str, str]] = None,
+    since: Optional[Dict[str, Optional[str]]] = None,
+) -> Optional[pd.DataFrame]:
+    """
+    Build (or incrementally update) the master and return it.
+    frames/stamps: portal workbooks already loaded by the post-cycle pipeline
+    (their workbook stamps at read time), so nothing is read twice.
+    since: first scraped_at day of a frame that holds only part of its portal
+    (portal_since()); such a frame is used only when it covers this build.
+    """
+    frames = frames or {}
+    stamps = stamps or {}
+    since = since or {}
+    state = {} if full else _load_state()
+    base = None if full or not state.get("portals") else _load_existing_master()
+    incremental = base is not None
+
+    mode = "incremental" if incremental else "full rebuild"
+    print(f"\n🧩 BUILDING MASTER DATASET ({mode})")
     print("=" * 70)
 
     dfs: List[pd.DataFrame] = []
     counts: Dict[str, int] = {}
+    old_portals: Dict[str, Dict] = state.get("portals", {}) if incremental else {}
+    new_portals: Dict[str, Dict] = {}
 
     for portal, path in FILES.items():
-        if not os.path.exists(path):
+        prev = old_portals.get(portal, {})
+        hwm = prev.get("hwm")
+        first_day = since.get(portal)
+        preloaded = portal in frames and (not first_day or bool(incremental and hwm and hwm[:10] >= first_day))
+        from_store = not preloaded and _store_path(portal) is not None
+
+        if not preloaded and not from_store and not os.path.exists(path):
             print(f"❌ Missing portal file: {portal} -> {path}")
+            if prev:
+                new_portals[portal] = prev
             continue
 
-        # Always read the latest portal Excel
-        try:
-            df = _read_excel_with_retry(path, retries=3, pause=1.5)
-        except Exception as e:
-            print(f"[WARN] Direct read failed for {portal}: {e}")
-            cached = _copy_to_local_cache(path, LOCAL_CACHE_DIR)
-            if not cached:
-                print(f"❌ Could not read {portal} (direct+cache failed). Skipping.")
-                continue
-            df = _read_excel_with_retry(cached, retries=3, pause=1.0)
+        if preloaded:
+            stamp = stamps.get(portal)
+        else:
+            stamp = None if from_store else workbook_stamp(path)
+        if incremental and stamp is not None and stamp == prev.get("stamp"):
+            print(f"⏭️ {portal}: workbook unchanged since last build")
+            new_portals[portal] = prev
+            continue
+
+        if preloaded:
+            df = frames[portal].copy()  # shared with other stages
+        else:
+            df = _read_portal(portal, path, hwm if incremental else None)
+        if df is None:
+            if prev:
+                new_portals[portal] = prev
+            continue
 
         df = _standardize_columns(df)
         df = _normalize_source(portal, df)
         df = _clean_placeholders(df)
 
+        # high-water mark: keep rows scraped after the last build only
+        # (rows without a parseable scraped_at cannot be placed: they stay in every delta)
+        ts = _scraped_ts(df[SORT_BY]) if SORT_BY in df.columns else pd.Series(pd.NaT, index=df.index)
+        if incremental and hwm:
+            undated = ts.isna()
+            df = df[((ts > pd.Timestamp(hwm)) | undated).to_numpy()]
+            if undated.any():
+                print(f"[WARN] {portal}: {int(undated.sum())} rows without a parseable {SORT_BY} re-merged")
+        top = ts.max()
+        if pd.notna(top) and (not hwm or top > pd.Timestamp(hwm)):
+            hwm = top.isoformat()
+
+        new_portals[portal] = {"stamp": stamp, "hwm": hwm}
         counts[portal] = len(df)
-        dfs.append(df)
+        if len(df):
+            dfs.append(df)
         print(f"✅ Loaded {portal}: rows={len(df)} cols={df.shape[1]}")
 
-    if not dfs:
+    if not dfs and not incremental:
         print("\n❌ No portal files loaded. Master build aborted.")
-        return
-
-    master = pd.concat(dfs, ignore_index=True)
-
-    # Ensure schema columns exist
-    master = _ensure_columns(master, MASTER_SCHEMA)
+        return None
 
-    master = _ensure_taxonomy(master)
+    state = {**state, "portals": new_portals}
+    if incremental and not dfs:
+        _save_state(state)
+        print("\n✅ No new or updated portal rows; master unchanged.")
+        return base
 
-    # Build global key for dedupe
-    master = _build_global_key(master)
-    master["global_key"] = master["global_key"].astype("string").str.strip()
+    delta = _prepare_rows(pd.concat(dfs, ignore_index=True))
 
-    # Reorder schema first
-    remaining_cols = [c for c in master.columns if c not in MASTER_SCHEMA]
-    master = master[MASTER_SCHEMA + remaining_cols]
+    if incremental:
+        # newest wins; on equal scraped_at the fresh portal row (placed first) wins
+        base = _parse_scraped_at(_ensure_columns(base, MASTER_SCHEMA))
+        master = pd.concat([delta, base], ignore_index=True)
+        remaining_cols = [c for c in master.columns if c not in MASTER_SCHEMA]
+        master = master[MASTER_SCHEMA + remaining_cols]
+    else:
+        master = delta
 
-    # Parse + sort so newest scraped_at is first (newest wins)
-    master = _parse_scraped_at(master)
+    # Sort so newest scraped_at is first (newest wins)
     if SORT_BY in master.columns:
-        master = master.sort_values(SORT_BY, ascending=False, na_position="last").reset_index(drop=True)
+        master = master.sort_values(SORT_BY, ascending=False, na_position="last", kind="mergesort").reset_index(drop=True)
 
     # Drop duplicates across all portals (keep newest)
     before = len(master)
     master = master.drop_duplicates(subset=["global_key"], keep="first").reset_index(drop=True)
     after = len(master)
 
+    # whole master (well under a second): gazetteer edits reach rows built before them
+    master = _add_place_columns(master)
+
     # Add metadata columns
     master["master_built_at"] = datetime.now().isoformat(timespec="seconds")
 
@@ -324,17 +522,43 @@ def main():
     _ensure_dir(LOCAL_CACHE_DIR)
     _atomic_write_csv(master, LOCAL_DASH_CSV)
 
-    # 2) Write to OneDrive outputs
-    _atomic_write_excel(master, MASTER_XLSX)
+    # 1.5) Parquet master (dashboards read only the columns/partitions they need)
+    parquet_stats = None
+    if parquet_available():
+        try:
+            parquet_stats = write_master_parquet(master, MASTER_PARQUET_DIR)
+        except Exception as e:
+            print(f"[WARN] Parquet master write failed: {e}")
+    else:
+        print("[WARN] pyarrow not installed; skipping Parquet master.")
+
+    # 2) Write to OneDrive outputs (the xlsx is the slow one: throttled in incremental mode)
+    last_xlsx = float(state.get("xlsx_written_at") or 0)
+    write_xlsx = not incremental or (time.time() - last_xlsx) >= MASTER_XLSX_MIN_INTERVAL_SEC
+    if write_xlsx:
+        _atomic_write_excel(master, MASTER_XLSX)
+        state["xlsx_written_at"] = time.time()
     _atomic_write_csv(master, MASTER_CSV)
 
+    # state last: a failed write re-merges the same delta next time
+    _save_state(state)
+
     print("\n✅ saved local dashboard csv:", LOCAL_DASH_CSV)
-    print("✅ saved:", MASTER_XLSX, "rows:", len(master))
+    if write_xlsx:
+        print("✅ saved:", MASTER_XLSX, "rows:", len(master))
+    else:
+        print(f"⏭️ {MASTER_XLSX} refreshed less than {MASTER_XLSX_MIN_INTERVAL_SEC // 60} min ago (rows now: {len(master)})")
     print("✅ saved:", MASTER_CSV)
+    if parquet_stats is not None:
+        print(f"✅ saved parquet: {MASTER_PARQUET_DIR} partitions={parquet_stats}")
     print("   portal_rows_loaded:", counts)
     print(f"   dedupe_removed: {before - after}")
     print("Done.")
+    return master
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Build jobs_master from the portal workbooks.")
+    parser.add_argument("--full", action="store_true", help="Rebuild from every portal row (ignore the high-water marks).")
+    args = parser.parse_args()
+    main(full=args.full)
@@ -133,7 +133,12 @@ def _atomic_write_excel_multisheet(sheets: Dict[str, pd.DataFrame], out_path: st
 # =========================
 # MAIN
 # =========================
-def main():
+def main(frames: Optional[Dict[str, pd.DataFrame]] = None):
+    """
+    frames: portal/master frames already in memory (post-cycle pipeline);
+    anything not given is read from FILES.
+    """
+    frames = frames or {}
     print("\n📊 PORTAL QUALITY SUMMARY (recalculated every run)")
     print("=" * 70)
 
@@ -141,19 +146,21 @@ def main():
     per_portal_missing_tables: Dict[str, pd.DataFrame] = {}
 
     for portal, path in FILES.items():
-        if not os.path.exists(path):
+        if portal in frames:
+            df = frames[portal]
+        elif not os.path.exists(path):
             print(f"\n❌ Missing file for {portal}: {path}")
             continue
-
-        try:
-            df = _read_excel_with_retry(path)
-        except Exception as e:
-            print(f"\n[WARN] Direct read failed for {portal}: {e}")
-            cached = _copy_to_local_cache(path, LOCAL_CACHE_DIR)
-            if not cached:
-                print(f"❌ Could not read {portal}. Skipping.")
-                continue
-            df = _read_excel_with_retry(cached)
+        else:
+            try:
+                df = _read_excel_with_retry(path)
+            except Exception as e:
+                print(f"\n[WARN] Direct read failed for {portal}: {e}")
+                cached = _copy_to_local_cache(path, LOCAL_CACHE_DIR)
+                if not cached:
+                    print(f"❌ Could not read {portal}. Skipping.")
+                    continue
+                df = _read_excel_with_retry(cached)
 
         df = _clean_placeholders(df)
 
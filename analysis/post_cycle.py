@@ -0,0 +1,231 @@
+# analysis/post_cycle.py
+from __future__ import annotations
+
+import os
+import sys
+import time
+import logging
+import argparse
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+ANALYSIS_DIR = os.path.join(ROOT_DIR, "analysis")
+for _p in (ROOT_DIR, ANALYSIS_DIR):
+    if _p not in sys.path:
+        sys.path.insert(0, _p)
+
+import backfill_taxonomy  # noqa: E402
+import build_master  # noqa: E402
+import portal_quality  # noqa: E402
+from job_store import JobStore, primary_key, read_rows_since  # noqa: E402
+from key_index import workbook_stamp  # noqa: E402
+
+
+# =========================
+# Post-cycle pipeline (in-process)
+# =========================
+# One interpreter, each portal read once, stages share the frames:
+#
+#   load_portals ── backfill_taxonomy ──┬── save_workbooks
+#                                       └── build_master ── portal_quality
+#
+# A portal whose SQLite store is the source of truth is read from the store, and
+# only the rows the incremental master build needs (from the day of its high-water
+# mark); the full workbook is parsed only for the Excel backend.
+#
+# Taxonomy is classified once (before the master build, only rows missing it);
+# save_workbooks stores only portals where rows were actually filled: into the
+# SQLite store when it is the source of truth (the workbook is its export and
+# would be overwritten by the next export), else into the workbook.
+#
+# Independent stages run concurrently; a failed stage skips only its dependents.
+
+POST_CYCLE_WORKERS = 3
+
+
+@dataclass
+class Stage:
+    name: str
+    fn: Callable[[Dict[str, Any]], Any]   # gets the results of finished stages, by name
+    deps: Tuple[str, ...] = ()
+
+
+def run_stages(stages: List[Stage], logger: logging.Logger, max_workers: int = POST_CYCLE_WORKERS) -> Dict[str, float]:
+    """
+    Run a small DAG of stages. Returns seconds per finished stage.
+    """
+    by_name = {s.name: s for s in stages}
+    for s in stages:
+        missing = [d for d in s.deps if d not in by_name]
+        if missing:
+            raise RuntimeError(f"Stage '{s.name}' depends on unknown stage(s): {missing}")
+
+    results: Dict[str, Any] = {}
+    timings: Dict[str, float] = {}
+    failed: set = set()
+    pending = list(stages)
+    running: Dict[Any, Tuple[Stage, float]] = {}
+
+    def _timed(stage: Stage, inputs: Dict[str, Any]) -> Tuple[Any, float]:
+        t0 = time.perf_counter()
+        out = stage.fn(inputs)
+        return out, time.perf_counter() - t0
+
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="post-cycle") as pool:
+        while pending or running:
+            for stage in list(pending):
+                if any(d in failed for d in stage.deps):
+                    logger.warning(f"[Post-cycle] ⏭️ {stage.name}: skipped (dependency failed)")
+                    failed.add(stage.name)
+                    pending.remove(stage)
+                elif all(d in results for d in stage.deps):
+                    logger.info(f"[Post-cycle] ▶ {stage.name}")
+                    running[pool.submit(_timed, stage, dict(results))] = (stage, time.perf_counter())
+                    pending.remove(stage)
+
+            if not running:
+                break
+
+            done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+            for fut in done:
+                stage, started = running.pop(fut)
+                try:
+                    results[stage.name], timings[stage.name] = fut.result()
+                    logger.info(f"[Post-cycle] ✅ {stage.name}: {timings[stage.name]:.1f}s")
+                except Exception:
+                    failed.add(stage.name)
+                    logger.exception(
+                        f"[Post-cycle] ❌ {stage.name} failed after {time.perf_counter() - started:.1f}s"
+                    )
+
+    return timings
+
+
+# =========================
+# Stages
+# =========================
+def load_portal_frames(full: bool = False) -> Dict[str, Dict[str, Any]]:
+    """
+    Read every portal once: portal -> {"df", "stamp", "path", "since"}.
+    since = first scraped_at day of a store delta (None = every row).
+    """
+    since = build_master.portal_since(full)
+
+    def _load(portal: str, path: str) -> Optional[Dict[str, Any]]:
+        store = build_master._store_path(portal)
+        if store:
+            try:
+                df = read_rows_since(store, since_day=since.get(portal))
+                return {"df": df, "stamp": None, "path": path, "since": since.get(portal)}
+            except Exception as e:
+                print(f"[WARN] Store read failed for {portal}, using the workbook: {e}")
+        if not os.path.exists(path):
+            print(f"❌ Missing portal file: {portal} -> {path}")
+            return None
+        stamp = workbook_stamp(path)  # before the read: a later write must not look "already merged"
+        try:
+            df = build_master._read_excel_with_retry(path, retries=3, pause=1.5)
+        except Exception as e:
+            print(f"[WARN] Direct read failed for {portal}: {e}")
+            cached = build_master._copy_to_local_cache(path, build_master.LOCAL_CACHE_DIR)
+            if not cached:
+                print(f"❌ Could not read {portal} (direct+cache failed). Skipping.")
+                return None
+            df = build_master._read_excel_with_retry(cached, retries=3, pause=1.0)
+        return {"df": df, "stamp": stamp, "path": path, "since": None}
+
+    with ThreadPoolExecutor(max_workers=len(build_master.FILES) or 1, thread_name_prefix="load") as pool:
+        futures = {p: pool.submit(_load, p, path) for p, path in build_master.FILES.items()}
+        loaded = {p: f.result() for p, f in futures.items()}
+    return {p: v for p, v in loaded.items() if v is not None}
+
+
+def _stage_backfill(results: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    out: Dict[str, Dict[str, Any]] = {}
+    for portal, item in results["load_portals"].items():
+        df, stats = backfill_taxonomy.backfill_frame(item["df"])
+        backfill_taxonomy.print_stats(portal, stats)
+        out[portal] = {"df": df, "updated_rows": stats["updated_rows"]}
+    return out
+
+
+def _stage_save_workbooks(results: Dict[str, Any]) -> int:
+    loaded = results["load_portals"]
+    saved = 0
+    for portal, item in results["backfill_taxonomy"].items():
+        if not item["updated_rows"]:
+            continue
+        store_path = build_master._store_path(portal)
+        if store_path:
+            store = JobStore(store_path, primary_key(store_path))
+            try:
+                n = store.fill_blanks(item["df"], backfill_taxonomy.TAX_COLS)
+            finally:
+                store.close()
+            print(f"   {portal}: taxonomy filled for {n} stored rows (in the workbook from the next export)")
+            saved += 1
+            continue
+        path = loaded[portal]["path"]
+        if workbook_stamp(path) != loaded[portal]["stamp"]:
+            print(f"[WARN] {portal}: workbook changed since it was loaded; backfill not written this cycle")
+            continue
+        backfill_taxonomy._atomic_write_excel(item["df"], path)
+        saved += 1
+    return saved
+
+
+def _stage_master(results: Dict[str, Any], full: bool = False) -> Optional[pd.DataFrame]:
+    loaded = results["load_portals"]
+    return build_master.main(
+        full=full,
+        frames={p: v["df"] for p, v in results["backfill_taxonomy"].items()},
+        stamps={p: v["stamp"] for p, v in loaded.items()},
+        since={p: v["since"] for p, v in loaded.items()},
+    )
+
+
+def _stage_quality(results: Dict[str, Any]) -> None:
+    loaded = results["load_portals"]
+    frames: Dict[str, pd.DataFrame] = {
+        p: v["df"] for p, v in results["backfill_taxonomy"].items() if loaded[p]["since"] is None
+    }  # a store delta is not the whole portal: quality reads those from their workbooks
+    if results.get("build_master") is not None:
+        frames["master"] = results["build_master"]
+    portal_quality.main(frames=frames)
+
+
+def run_post_cycle(logger: Optional[logging.Logger] = None, full: bool = False) -> Dict[str, float]:
+    """
+    After scraping + UPSERT: backfill taxonomy, then build master / save workbooks, then quality report.
+    Returns seconds per stage.
+    """
+    logger = logger or logging.getLogger("post_cycle")
+    t0 = time.perf_counter()
+
+    timings = run_stages(
+        [
+            Stage("load_portals", lambda r: load_portal_frames(full=full)),
+            Stage("backfill_taxonomy", _stage_backfill, deps=("load_portals",)),
+            Stage("save_workbooks", _stage_save_workbooks, deps=("load_portals", "backfill_taxonomy")),
+            Stage("build_master", lambda r: _stage_master(r, full=full), deps=("load_portals", "backfill_taxonomy")),
+            Stage("portal_quality", _stage_quality, deps=("load_portals", "backfill_taxonomy", "build_master")),
+        ],
+        logger,
+    )
+
+    parts = " | ".join(f"{name} {sec:.1f}s" for name, sec in timings.items())
+    logger.info(f"[Post-cycle] {parts} | wall {time.perf_counter() - t0:.1f}s")
+    return timings
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the post-cycle pipeline once (backfill, master, quality).")
+    parser.add_argument("--full", action="store_true", help="Full master rebuild instead of incremental.")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s | %(levelname)s | %(name)s | %(message)s")
+    run_post_cycle(full=args.full)
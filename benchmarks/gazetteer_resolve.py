@@ -0,0 +1,75 @@
+# benchmarks/gazetteer_resolve.py
+"""
+Location -> (city, region, country) with the compiled gazetteer (gazetteer.py) over the
+`location` column of data_local/jobs_master_local.csv: coverage, the most common
+unresolved strings, and batch timings (cold = empty memo, warm = memoized).
+
+Usage:
+  python benchmarks/gazetteer_resolve.py
+  python benchmarks/gazetteer_resolve.py --csv /path/to/jobs_master_local.csv --copies 200
+"""
+from __future__ import annotations
+
+import os
+import sys
+import time
+import argparse
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+import pandas as pd  # noqa: E402
+
+import gazetteer  # noqa: E402
+
+
+DEFAULT_CSV = os.path.join(ROOT_DIR, "data_local", "jobs_master_local.csv")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Gazetteer location resolver: coverage + batch speed.")
+    parser.add_argument("--csv", default=DEFAULT_CSV)
+    parser.add_argument("--copies", type=int, default=200, help="timings: location column repeated N times")
+    parser.add_argument("--top", type=int, default=15, help="unresolved strings to list")
+    args = parser.parse_args()
+
+    df = pd.read_csv(args.csv, dtype="string")
+    locations = df["location"] if "location" in df.columns else pd.Series(dtype="string")
+
+    print("\n🌍 GAZETTEER RESOLVER")
+    print("=" * 70)
+
+    t0 = time.perf_counter()
+    g = gazetteer.load_gazetteer()
+    print(f"compile: {(time.perf_counter() - t0) * 1e3:.1f}ms  countries={len(g.countries)}")
+
+    places = g.resolve_many(locations)
+    present = locations.notna()
+    n = int(present.sum())
+    for c in gazetteer.PLACE_COLS:
+        hit = int(places.loc[present, c].notna().sum())
+        print(f"{c:<8} resolved {hit}/{n} ({hit / n if n else 0:.0%})")
+
+    unresolved = locations[present & places["country"].isna()].value_counts().head(args.top)
+    if len(unresolved):
+        print("\nmost common unresolved:")
+        for loc, count in unresolved.items():
+            print(f"  {count:>5}  {loc[:70]!r}")
+
+    big = pd.concat([locations] * max(1, args.copies), ignore_index=True)
+    g._cache.clear()
+    t0 = time.perf_counter()
+    g.resolve_many(big)
+    cold = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    g.resolve_many(big)
+    warm = time.perf_counter() - t0
+    distinct = locations.nunique()
+    print(
+        f"\nbatch n={len(big)} distinct={distinct}  cold={cold * 1e3:.1f}ms  warm={warm * 1e3:.1f}ms"
+    )
+
+
+if __name__ == "__main__":
+    main()
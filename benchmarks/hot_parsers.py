@@ -0,0 +1,293 @@
+# benchmarks/hot_parsers.py
+"""
+classify_it_non_it / normalize_experience_years / normalize_salary: the original
+per-call regex versions (before) vs the precompiled single-pass ones in scraper_core (after),
+over the historical titles, skills, compensation and commitment strings.
+Then the whole-column versions used by build_master (normalize_*_columns) vs the
+scalar parsers applied row by row.
+
+Usage:
+  python benchmarks/hot_parsers.py
+  python benchmarks/hot_parsers.py --csv /path/to/jobs_master_local.csv --repeat 5
+Exit code 1 when any output differs.
+"""
+from __future__ import annotations
+
+import os
+import re
+import sys
+import time
+import random
+import argparse
+from typing import Callable, List, Optional, Tuple
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+import pandas as pd  # noqa: E402
+
+import scraper_core  # noqa: E402
+
+
+DEFAULT_CSV = os.path.join(ROOT_DIR, "data_local", "jobs_master_local.csv")
+
+EDGE_EXPERIENCE = [
+    "", "Not required", "No experience needed", "2-5 years", "2 - 5 Years", "2.5-3.5 years", "3+ years",
+    "3 + years", "More than 2 years", "more than2years", "1 year", "5 years, 2-3 years", "10 years - 5 years",
+    "more than 5+ years", "more than 5-7 years", "1 2-3 years", "2 - 3 - 4 years", "12.5 years", "years", "5 yrs",
+    "minimum 4 years of experience, including at least 2 years", "0-1 year",
+]
+EDGE_SALARY = [
+    "", "Not Disclosed", "Negotiable", "NRs. 22,000 - 25,000 Monthly", "Rs. - 10000 to 20000 / Month",
+    "USD 50 per hour", "2 years", "रु 30,000", "NPR 5,00,000 per annum", "1,000 per day", "no digits",
+    "रु ३०,००० - ४०,००० मासिक", "  ", "Contact 98412345678901234567 / 25,000", "hours: 20",
+]
+EDGE_TEXT = ["c++ dev", "c#", ".net", "asp.net", "go to market", "golang", "java", "javascript", "email", "ai/ml", "qa", "full  stack", ""]
+
+
+# -------------------------
+# Reference: the per-call versions these replaced (verbatim)
+# -------------------------
+def legacy_classify_it_non_it(designation: str = "", industry: str = "", full_text: str = "") -> str:
+    text = f"{designation} {industry} {full_text}".lower()
+
+    # ✅ longer phrases are safe as substring matches
+    phrase_keywords = [
+        "information technology",
+        "software development", "software engineer",
+        "full stack", "fullstack",
+        "data engineer", "data scientist",
+        "machine learning", "cybersecurity", "cyber security",
+        "system administrator", "technical support", "help desk", "helpdesk",
+        "cloud computing", "devops",
+        "rest api", "api development",
+    ]
+
+    # ✅ single words must be WHOLE WORD matches (avoid false positives)
+    word_keywords = [
+        "developer", "programmer", "engineer",
+        "python", "java", "javascript", "react", "node", "django", "flask",
+        "php", "laravel",
+        "docker", "kubernetes",
+        "aws", "azure", "gcp",
+        "network", "database", "sql",
+        "ai", "ml", "qa", "sdet",
+    ]
+
+    special_patterns = [
+        r"\.net\b",
+        r"\bc\+\+\b",
+        r"\bc#\b",
+        r"\bgolang\b",
+        r"\bgo\b",
+    ]
+
+    for k in phrase_keywords:
+        if k in text:
+            return "IT"
+
+    for w in word_keywords:
+        if re.search(rf"\b{re.escape(w)}\b", text):
+            return "IT"
+
+    for pat in special_patterns:
+        if re.search(pat, text):
+            return "IT"
+
+    return "Non-IT"
+
+
+def legacy_normalize_experience_years(experience_raw: Optional[str]) -> Tuple[Optional[float], Optional[float]]:
+    if not experience_raw:
+        return None, None
+
+    s = experience_raw.lower().strip()
+
+    if "not required" in s or "no experience" in s:
+        return 0.0, 0.0
+
+    m = re.search(r"(\d+(\.\d+)?)\s*-\s*(\d+(\.\d+)?)\s*year", s)
+    if m:
+        return float(m.group(1)), float(m.group(3))
+
+    m = re.search(r"(\d+(\.\d+)?)\s*\+\s*year", s)
+    if m:
+        return float(m.group(1)), None
+
+    m = re.search(r"more than\s*(\d+(\.\d+)?)\s*year", s)
+    if m:
+        return float(m.group(1)), None
+
+    m = re.search(r"(\d+(\.\d+)?)\s*year", s)
+    if m:
+        v = float(m.group(1))
+        return v, v
+
+    return None, None
+
+
+def legacy_normalize_salary(salary_raw: Optional[str]) -> Tuple[Optional[int], Optional[int], Optional[str], Optional[str]]:
+    if not salary_raw:
+        return None, None, None, None
+
+    s = salary_raw.strip()
+    low = s.lower()
+
+    if any(k in low for k in ["not disclosed", "based on experience", "negotiable"]):
+        return None, None, None, None
+
+    currency = None
+    if any(k in low for k in ["npr", "rs", "रु"]):
+        currency = "NPR"
+
+    period = None
+    if "month" in low:
+        period = "month"
+    elif "year" in low or "annum" in low:
+        period = "year"
+    elif "day" in low:
+        period = "day"
+
+    nums = [int(x.replace(",", "")) for x in re.findall(r"(\d[\d,]*)", s)]
+    if not nums:
+        return None, None, currency, period
+
+    if len(nums) == 1:
+        return nums[0], nums[0], currency, period
+
+    return min(nums), max(nums), currency, period
+
+
+def _time(fn: Callable, args: List[Tuple], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        for a in args:
+            fn(*a)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def _values(df: pd.DataFrame, col: str) -> List[str]:
+    return df[col].dropna().astype(str).tolist() if col in df.columns else []
+
+
+def _column_case(
+    name: str, scalar: Callable, columns_fn: Callable, values: pd.Series, cols: List[str], repeat: int, copies: int
+) -> int:
+    """
+    Whole-column parser vs the scalar one per row. Returns mismatches
+    (salary digit runs past int64 are NA by design and reported apart).
+    Timed over `values` repeated `copies` times (a master column repeats the same strings).
+    """
+    expected = [scalar(None if pd.isna(v) else v) for v in values]
+    got = columns_fn(values)[cols].astype(object)
+    got = [tuple(None if pd.isna(x) else x for x in row) for row in got.itertuples(index=False)]
+
+    bad = overflow = 0
+    for v, e, g in zip(values, expected, got):
+        if e == g:
+            continue
+        if any(isinstance(x, int) and abs(x) > 2**63 - 1 for x in e):
+            overflow += 1
+            continue
+        bad += 1
+        if bad <= 3:
+            print(f"❌ {name}({str(v)[:60]!r}): scalar={e} columns={g}")
+
+    timed = pd.concat([values] * max(1, copies), ignore_index=True)
+    before = after = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        [scalar(None if pd.isna(v) else v) for v in timed]
+        before = min(before, time.perf_counter() - t0)
+        t0 = time.perf_counter()
+        columns_fn(timed)
+        after = min(after, time.perf_counter() - t0)
+    print(
+        f"{name:<36} n={len(timed):<7} rows={before * 1e3:7.1f}ms  "
+        f"columns={after * 1e3:7.1f}ms  speedup={before / after if after else 0:5.1f}x  "
+        f"mismatches={bad}" + (f"  int64_overflow={overflow}" if overflow else "")
+    )
+    return bad
+
+
+def _fuzz_experience(n: int, rng: random.Random) -> List[str]:
+    parts = ["2", "3.5", "10", "-", " - ", "+", " + ", "more than ", "year", "years", " ", ",", "exp", "0"]
+    return ["".join(rng.choice(parts) for _ in range(rng.randint(1, 8))) for _ in range(n)]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Precompiled hot-path parsers vs the per-call originals.")
+    parser.add_argument("--csv", default=DEFAULT_CSV)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--fuzz", type=int, default=20_000, help="random experience strings for the parity check")
+    parser.add_argument("--copies", type=int, default=50, help="column timings: historical column repeated N times")
+    args = parser.parse_args()
+
+    df = pd.read_csv(args.csv, dtype="string")
+    titles, skills = _values(df, "title"), _values(df, "skills")
+    it_args = [(t, "", s) for t, s in zip(titles, skills)] + [(t, "", "") for t in titles] + [(x, "", "") for x in EDGE_TEXT]
+    exp_args = [(x,) for x in _values(df, "commitment") + _values(df, "experience") + EDGE_EXPERIENCE]
+    exp_args += [(x,) for x in _fuzz_experience(args.fuzz, random.Random(7))]
+    sal_args = [(x,) for x in _values(df, "compensation") + _values(df, "salary") + EDGE_SALARY]
+
+    # memoization would hide the engine cost; the shipped cache is timed on its own below
+    shipped_cache = scraper_core.IT_NON_IT_CACHE
+    scraper_core.IT_NON_IT_CACHE = scraper_core.ClassifierCache("it_non_it", "bench", maxsize=0)
+
+    print("\n⚡ HOT-PATH PARSERS")
+    print("=" * 70)
+
+    mismatches = 0
+    cases = (
+        ("classify_it_non_it", legacy_classify_it_non_it, scraper_core.classify_it_non_it, it_args),
+        ("normalize_experience_years", legacy_normalize_experience_years, scraper_core.normalize_experience_years, exp_args),
+        ("normalize_salary", legacy_normalize_salary, scraper_core.normalize_salary, sal_args),
+    )
+    for name, before_fn, after_fn, fn_args in cases:
+        bad = [a for a in fn_args if before_fn(*a) != after_fn(*a)]
+        mismatches += len(bad)
+        for a in bad[:3]:
+            print(f"❌ {name}{tuple(x[:60] for x in a)!r}: before={before_fn(*a)} after={after_fn(*a)}")
+
+        before = _time(before_fn, fn_args, args.repeat)
+        after = _time(after_fn, fn_args, args.repeat)
+        print(
+            f"{name:<27} n={len(fn_args):<6} before={before / len(fn_args) * 1e6:7.2f}us  "
+            f"after={after / len(fn_args) * 1e6:7.2f}us  speedup={before / after if after else 0:5.1f}x  mismatches={len(bad)}"
+        )
+
+    # classify_it_non_it as shipped (IT_NON_IT_CACHE with the CONFIG defaults): first pass, then repeats
+    scraper_core.IT_NON_IT_CACHE = shipped_cache
+    direct = _time(scraper_core._classify_it_non_it, [(f"{d} {i} {t}".lower(),) for d, i, t in it_args], args.repeat)
+    cold = _time(scraper_core.classify_it_non_it, it_args, 1)
+    warm = _time(scraper_core.classify_it_non_it, it_args, args.repeat)
+    n = len(it_args)
+    print(
+        f"{'classify_it_non_it (cache)':<27} n={n:<6} regex={direct / n * 1e6:7.2f}us  "
+        f"cold={cold / n * 1e6:7.2f}us  warm={warm / n * 1e6:7.2f}us  store={shipped_cache.db_path or 'none'}"
+    )
+
+    print("\nwhole columns (build_master) vs scalar per row")
+    empty = pd.Series(dtype="string")
+    for name, scalar, columns_fn, col, extra, cols in (
+        ("normalize_experience_columns", scraper_core.normalize_experience_years,
+         scraper_core.normalize_experience_columns, "commitment", EDGE_EXPERIENCE, scraper_core.EXPERIENCE_COLS),
+        ("normalize_salary_columns", scraper_core.normalize_salary,
+         scraper_core.normalize_salary_columns, "compensation", EDGE_SALARY, scraper_core.SALARY_COLS),
+    ):
+        historical = df[col] if col in df.columns else empty  # NA rows included, like the master column
+        mismatches += _column_case(name, scalar, columns_fn, historical, cols, args.repeat, args.copies)
+        mismatches += _column_case(name + " (edges)", scalar, columns_fn, pd.Series(extra, dtype="string"), cols, 1, 1)
+    mismatches += _column_case(
+        "normalize_experience_columns (fuzz)", scraper_core.normalize_experience_years, scraper_core.normalize_experience_columns,
+        pd.Series([a[0] for a in exp_args], dtype="string"), scraper_core.EXPERIENCE_COLS, 1, 1,
+    )
+
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == "__main__":
+    main()
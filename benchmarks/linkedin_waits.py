@@ -0,0 +1,162 @@
+# benchmarks/linkedin_waits.py
+"""
+Per-job latency of the LinkedIn card -> detail flow: the old fixed sleeps (before) vs the
+DOM-event readiness waits in portals/linkedin.py (after), on a local page that mimics the
+two-pane search UI (detail pane and description render after random delays, more cards
+mount on scroll). Also counts rows read while the pane still showed another job.
+
+Usage:
+  python benchmarks/linkedin_waits.py
+  python benchmarks/linkedin_waits.py --jobs 30 --render-ms 150 900 --description-ms 50 400
+"""
+from __future__ import annotations
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+import statistics
+from typing import Callable, Dict, List
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from selenium.webdriver.common.by import By  # noqa: E402
+from selenium.common.exceptions import TimeoutException  # noqa: E402
+
+from portals import linkedin  # noqa: E402
+from scraper_core import make_fast_driver, snapshot_soup, soup_pick_text  # noqa: E402
+
+
+PAGE = """<!doctype html><html><body>
+<div class="scaffold-layout__list" style="height:600px;overflow:auto;width:400px;float:left"></div>
+<div class="jobs-search__job-details--container" style="margin-left:420px"><h1>loading</h1></div>
+<script>
+const [RENDER_LO, RENDER_HI, DESC_LO, DESC_HI, TOTAL] = [%(render_lo)d, %(render_hi)d, %(desc_lo)d, %(desc_hi)d, %(total)d];
+const list = document.querySelector(".scaffold-layout__list");
+const pane = document.querySelector(".jobs-search__job-details--container");
+const rand = (lo, hi) => lo + Math.random() * (hi - lo);
+let mounted = 0, loading = false, clicks = 0;
+function mount(n) {
+  for (let i = 0; i < n && mounted < TOTAL; i++, mounted++) {
+    const id = String(4000000000 + mounted);
+    const card = document.createElement("div");
+    card.className = "job-card-container";
+    card.dataset.jobId = id;
+    card.style.height = "120px";
+    card.innerHTML = `<a class="job-card-container__link" href="#">Job ${id}</a>`;
+    card.querySelector("a").addEventListener("click", (e) => { e.preventDefault(); openJob(id); });
+    list.appendChild(card);
+  }
+}
+function openJob(id) {
+  const mine = ++clicks;
+  history.replaceState(null, "", "?currentJobId=" + id);
+  setTimeout(() => {
+    if (mine !== clicks) return;
+    pane.innerHTML = `<div class="job-details-jobs-unified-top-card__job-title"><h1><a href="/jobs/view/${id}/">Job ${id}</a></h1></div>`;
+    setTimeout(() => {
+      if (mine !== clicks) return;
+      pane.insertAdjacentHTML("beforeend", `<div class="jobs-description__content"><div class="mt4">Position: P${id}</div></div>`);
+    }, rand(DESC_LO, DESC_HI));
+  }, rand(RENDER_LO, RENDER_HI));
+}
+list.addEventListener("scroll", () => {
+  if (loading || list.scrollTop + list.clientHeight < list.scrollHeight - 50) return;
+  loading = true;
+  setTimeout(() => { mount(5); loading = false; }, rand(RENDER_LO, RENDER_HI));
+});
+mount(10);
+</script></body></html>"""
+
+
+# -------------------------
+# Reference: the flow before the readiness waits (verbatim sleeps)
+# -------------------------
+def legacy_wait_for_any(driver, selectors: List[str], timeout: int = linkedin.WAIT_TIMEOUT) -> str:
+    end = time.time() + timeout
+    while time.time() < end:
+        for sel in selectors:
+            if driver.find_elements(By.CSS_SELECTOR, sel):
+                return sel
+        time.sleep(0.2)
+    raise TimeoutException(f"Timeout waiting for any of: {selectors}")
+
+
+def legacy_open_job(driver, link, job_id: str) -> bool:
+    driver.execute_script("arguments[0].scrollIntoView({block:'center'});", link)
+    time.sleep(0.15)
+    link.click()
+    time.sleep(1.2)
+    try:
+        legacy_wait_for_any(driver, linkedin.DETAIL_READY_SELECTORS)
+    except TimeoutException:
+        return False
+    time.sleep(0.6)
+    return True
+
+
+def event_open_job(driver, link, job_id: str) -> bool:
+    return linkedin._safe_click(driver, link) and linkedin._wait_detail_for_job(driver, job_id) == "ready"
+
+
+def _run(driver, url: str, open_job: Callable, jobs: int) -> Dict[str, float]:
+    driver.get(url)
+    cards = linkedin._scroll_left_results_until_loaded(driver, target=jobs, timeout=60)
+    secs: List[float] = []
+    wrong = 0
+    for card in cards[:jobs]:
+        job_id = linkedin._extract_job_id_from_card(card)
+        link = card.find_element(By.CSS_SELECTOR, linkedin.JOB_LINK_SELECTORS[0])
+        t0 = time.perf_counter()
+        if not open_job(driver, link, job_id):
+            continue
+        detail = snapshot_soup(driver, linkedin.DETAIL_READY_SELECTORS)
+        secs.append(time.perf_counter() - t0)
+        title = soup_pick_text(detail, linkedin.TITLE_SELECTORS) or ""
+        wrong += job_id not in title
+    ordered = sorted(secs) or [0.0]
+    return {
+        "jobs": len(secs),
+        "mean": statistics.mean(ordered),
+        "p50": ordered[len(ordered) // 2],
+        "p90": ordered[int(len(ordered) * 0.9)],
+        "wrong": wrong,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="LinkedIn detail flow: fixed sleeps vs DOM readiness waits.")
+    parser.add_argument("--jobs", type=int, default=20)
+    parser.add_argument("--render-ms", type=int, nargs=2, default=[150, 900], help="detail pane / new cards render delay range")
+    parser.add_argument("--description-ms", type=int, nargs=2, default=[50, 400], help="description block delay after the pane")
+    args = parser.parse_args()
+
+    html = PAGE % {
+        "render_lo": args.render_ms[0], "render_hi": args.render_ms[1],
+        "desc_lo": args.description_ms[0], "desc_hi": args.description_ms[1],
+        "total": args.jobs,
+    }
+    with tempfile.NamedTemporaryFile("w", suffix=".html", delete=False, encoding="utf-8") as f:
+        f.write(html)
+    url = "file://" + f.name
+
+    print("\n⏱️ LINKEDIN READINESS WAITS")
+    print("=" * 70)
+    driver = make_fast_driver(headless=True, blocked_url_patterns=[])
+    try:
+        for label, open_job in (("fixed sleeps (before)", legacy_open_job), ("DOM events (after)", event_open_job)):
+            r = _run(driver, url, open_job, args.jobs)
+            print(
+                f"{label:<22} jobs={r['jobs']:<4} mean={r['mean']:.2f}s  p50={r['p50']:.2f}s  "
+                f"p90={r['p90']:.2f}s  wrong_job_rows={r['wrong']}"
+            )
+    finally:
+        driver.quit()
+        os.unlink(f.name)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+# benchmarks/resource_blocking.py
+"""
+Page-ready latency and bytes transferred, with vs without the resource-blocking
+profile (ScrapeConfig.blocked_url_patterns).
+
+Usage:
+  python benchmarks/resource_blocking.py --portal merojob --n 10
+  python benchmarks/resource_blocking.py --urls https://merojob.com/... https://...
+"""
+from __future__ import annotations
+
+import os
+import sys
+import time
+import argparse
+import statistics
+from typing import Dict, List
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from selenium.webdriver.common.by import By  # noqa: E402
+from selenium.webdriver.support import expected_conditions as EC  # noqa: E402
+from selenium.webdriver.support.ui import WebDriverWait  # noqa: E402
+
+from config import CONFIG  # noqa: E402
+from scraper_core import effective_block_patterns, make_fast_driver  # noqa: E402
+
+
+# navigation + every resource entry; blocked requests never show up here
+BYTES_JS = """
+const nav = performance.getEntriesByType('navigation');
+const res = performance.getEntriesByType('resource');
+let total = 0;
+for (const e of nav) total += (e.transferSize || 0);
+for (const e of res) total += (e.transferSize || 0);
+return [total, res.length];
+"""
+
+
+def _load_urls(portal: str, n: int) -> List[str]:
+    path = os.path.join(CONFIG.data_dir, "_internal", f"{portal}_urls_latest.txt")
+    if not os.path.exists(path):
+        raise SystemExit(f"❌ No URL list found: {path} (run the pipeline once or pass --urls)")
+    with open(path, "r", encoding="utf-8") as f:
+        urls = [line.strip() for line in f if line.strip()]
+    return urls[:n]
+
+
+def _run(urls: List[str], blocked: List[str], ready_css: str) -> Dict[str, float]:
+    driver = make_fast_driver(headless=True, blocked_url_patterns=blocked)
+    latencies: List[float] = []
+    bytes_total: List[float] = []
+    requests_total: List[float] = []
+
+    try:
+        for u in urls:
+            driver.execute_script("performance.clearResourceTimings();")
+            t0 = time.perf_counter()
+            driver.get(u)
+            try:
+                WebDriverWait(driver, 25).until(EC.presence_of_element_located((By.CSS_SELECTOR, ready_css)))
+            except Exception:
+                pass
+            latencies.append(time.perf_counter() - t0)
+
+            # let late subresources finish so bytes are comparable
+            time.sleep(1.0)
+            size, n_req = driver.execute_script(BYTES_JS)
+            bytes_total.append(float(size or 0))
+            requests_total.append(float(n_req or 0))
+    finally:
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    return {
+        "pages": len(latencies),
+        "ready_p50_s": statistics.median(latencies) if latencies else 0.0,
+        "ready_mean_s": statistics.mean(latencies) if latencies else 0.0,
+        "kb_per_page": (statistics.mean(bytes_total) / 1024.0) if bytes_total else 0.0,
+        "requests_per_page": statistics.mean(requests_total) if requests_total else 0.0,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark Chrome resource blocking.")
+    parser.add_argument("--portal", type=str, default="merojob")
+    parser.add_argument("--n", type=int, default=10)
+    parser.add_argument("--urls", nargs="*", default=None)
+    parser.add_argument("--ready-css", type=str, default="h1")
+    args = parser.parse_args()
+
+    urls = args.urls or _load_urls(args.portal, args.n)
+    if not urls:
+        raise SystemExit("❌ No URLs to benchmark.")
+
+    blocked = effective_block_patterns(CONFIG.blocked_url_patterns, CONFIG.allowed_url_patterns)
+
+    print(f"\n⏱️ RESOURCE BLOCKING BENCHMARK ({len(urls)} pages)")
+    print("=" * 70)
+
+    results = {
+        "no_blocking": _run(urls, [], args.ready_css),
+        "blocking": _run(urls, blocked, args.ready_css),
+    }
+
+    for name, r in results.items():
+        print(
+            f"{name:<12} pages={r['pages']:<3} ready_p50={r['ready_p50_s']:.2f}s "
+            f"ready_mean={r['ready_mean_s']:.2f}s kb/page={r['kb_per_page']:.0f} "
+            f"requests/page={r['requests_per_page']:.0f}"
+        )
+
+    base, blk = results["no_blocking"], results["blocking"]
+    if base["kb_per_page"]:
+        print(f"\nBytes saved: {100.0 * (1 - blk['kb_per_page'] / base['kb_per_page']):.1f}%")
+    if base["ready_mean_s"]:
+        print(f"Latency saved: {100.0 * (1 - blk['ready_mean_s'] / base['ready_mean_s']):.1f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+# benchmarks/rows_mode_streak.py
+"""
+Check: rows-mode listing early-stop (KnownPageStreak) with a streaming collector.
+
+run_portal_once() is driven with a fake LinkedIn-style generator: every listing page
+holds only NEW jobs, rows are yielded (and saved) before the page is scored.
+Every page must be walked; jobs scraped this cycle must not count as "known".
+
+Usage:
+  python benchmarks/rows_mode_streak.py
+  python benchmarks/rows_mode_streak.py --pages 6 --per-page 4 --stop-after 1
+Exit code 1 when the crawl stops early.
+"""
+from __future__ import annotations
+
+import os
+import sys
+import logging
+import argparse
+import tempfile
+from typing import Dict, Iterator, List
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+import run_pipeline  # noqa: E402
+from job_store import JobStore  # noqa: E402
+from scraper_core import KnownPageStreak  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Rows-mode early stop must ignore jobs scraped this cycle.")
+    parser.add_argument("--pages", type=int, default=4)
+    parser.add_argument("--per-page", type=int, default=3)
+    parser.add_argument("--stop-after", type=int, default=1)
+    args = parser.parse_args()
+
+    walked: List[int] = []
+
+    def collect(config, skip_key=None, known_keys=None, stop_after_known_pages=0) -> Iterator[Dict]:
+        streak = KnownPageStreak(known_keys, stop_after_known_pages)
+        for page in range(args.pages):
+            walked.append(page)
+            ids = [f"new-{page}-{i}" for i in range(args.per_page)]
+            for job_id in ids:
+                yield {"job_id": job_id, "title": job_id, "scraped_at": "2026-01-01T00:00:00"}
+            if streak.page(ids):
+                return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = {
+            "xlsx": os.path.join(tmp, "linkedin_jobs.xlsx"),
+            "urls": os.path.join(tmp, "linkedin_urls_latest.txt"),
+            "store": os.path.join(tmp, "linkedin_jobs.sqlite"),
+        }
+        seed = JobStore(paths["store"], "job_id")  # one stored job => early stop is active
+        seed.upsert([{"job_id": "old-0", "title": "old", "scraped_at": "2025-01-01T00:00:00"}])
+        seed.close()
+
+        run_pipeline.get_output_paths = lambda portal_name: paths
+        run_pipeline.LOCAL_CACHE_DIR = os.path.join(tmp, "cache")
+
+        logger = logging.getLogger("rows_mode_streak")
+        logger.addHandler(logging.NullHandler())
+        logger.propagate = False
+        cfg = {
+            "mode": "rows",
+            "collect_rows": collect,
+            "dedupe_key": "job_id",
+            "autosave_every": 2,
+            "listing_stop_after_known_pages": args.stop_after,
+        }
+        inserted = run_pipeline.run_portal_once("linkedin", cfg, logger)
+
+    ok = len(walked) == args.pages and inserted == args.pages * args.per_page
+    print(f"{'✅' if ok else '❌'} pages walked={len(walked)}/{args.pages} inserted={inserted}/{args.pages * args.per_page}")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
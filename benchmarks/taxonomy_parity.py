@@ -0,0 +1,497 @@
+# benchmarks/taxonomy_parity.py
+"""
+Parity + speed of the compiled taxonomy engine (taxonomy.py, per row and batch) against
+the original per-call rules of categorize_role_taxonomy, over data_local/jobs_master_local.csv.
+
+Usage:
+  python benchmarks/taxonomy_parity.py
+  python benchmarks/taxonomy_parity.py --csv /path/to/jobs_master_local.csv --repeat 3
+Exit code 1 when any row differs.
+"""
+from __future__ import annotations
+
+import os
+import re
+import sys
+import time
+import argparse
+from typing import Dict, List, Optional, Tuple
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+import pandas as pd  # noqa: E402
+
+import taxonomy  # noqa: E402
+from classify_cache import ClassifierCache  # noqa: E402
+
+
+DEFAULT_CSV = os.path.join(ROOT_DIR, "data_local", "jobs_master_local.csv")
+
+EDGE_CASES = [
+    "c++ developer", "c++x", "c#", "c#5 dev", ".net core", "asp.net mvc", "golang", "go to market",
+    "soc analyst", "associate", "socket", "java", "javascript", "next.js react", "react native flutter",
+    "ai/ml", "email", "qa", "l&d", "ci/cd jenkins", "İstanbul office", "naïve_ai", "ai_ml", "", "   ",
+]
+
+
+# -------------------------
+# Reference: categorize_role_taxonomy before the compiled engine (verbatim)
+# -------------------------
+def legacy_categorize_role_taxonomy(
+    title: str = "",
+    skills: str = "",
+    position: str = "",
+    employment_type: str = "",
+    description: str = "",
+    industry: str = "",
+) -> Dict[str, Optional[str]]:
+    """
+    Returns unified taxonomy for BOTH IT and Non-IT:
+      category_primary: IT | Non-IT
+      domain_l1: e.g. Frontend | Sales | Finance | Healthcare ...
+      domain_l2: e.g. React | B2B Sales | Accounting ...
+      domain_l3: e.g. Next.js | SEO | Payroll ...
+      tax_confidence: float 0..1
+
+    Rule-based and safe. You can expand keywords anytime.
+    """
+
+    def _norm(x: str) -> str:
+        x = (x or "").lower()
+        x = re.sub(r"\s+", " ", x).strip()
+        return x
+
+    text = _norm(f"{title} {skills} {position} {employment_type} {industry} {description}")
+
+    # -----------------------------
+    # 1) IT detection (reuse your robust signals)
+    # -----------------------------
+    it_phrase_keywords = [
+        "information technology",
+        "software development", "software engineer",
+        "full stack", "fullstack",
+        "data engineer", "data scientist",
+        "machine learning", "cybersecurity", "cyber security",
+        "system administrator", "technical support", "help desk", "helpdesk",
+        "cloud computing", "devops",
+        "rest api", "api development",
+    ]
+    it_word_keywords = [
+        "developer", "programmer", "engineer",
+        "python", "java", "javascript", "react", "node", "django", "flask",
+        "php", "laravel",
+        "docker", "kubernetes",
+        "aws", "azure", "gcp",
+        "network", "database", "sql",
+        "ai", "ml", "qa", "sdet",
+    ]
+    it_special_patterns = [
+        r"\.net\b",
+        r"\bc\+\+\b",
+        r"\bc#\b",
+        r"\bgolang\b",
+        r"\bgo\b",
+    ]
+
+    it_hits = 0
+    for k in it_phrase_keywords:
+        if k in text:
+            it_hits += 2
+    for w in it_word_keywords:
+        if re.search(rf"\b{re.escape(w)}\b", text):
+            it_hits += 1
+    for pat in it_special_patterns:
+        if re.search(pat, text):
+            it_hits += 2
+
+    is_it = it_hits >= 2
+
+    # -----------------------------
+    # 2) IT taxonomy (L1/L2/L3)
+    # -----------------------------
+    if is_it:
+        # L1 buckets
+        it_l1_rules = {
+            "Security": [r"\bsoc\b", "siem", "pentest", "penetration", "vulnerability", "blue team", "red team", "grc", "iso 27001", "owasp", "incident response"],
+            "DevOps": ["devops", "sre", "kubernetes", "docker", "ci/cd", "jenkins", "github actions", "terraform", "ansible", "helm", "prometheus", "grafana"],
+            "Data": ["data engineer", "etl", "data warehouse", "power bi", "tableau", "dbt", "spark", "hadoop", "analytics", "bi developer"],
+            "AI": ["machine learning", "deep learning", "nlp", "computer vision", "llm", "pytorch", "tensorflow", "genai", "generative ai"],
+            "Frontend": ["frontend", "front end", "react", "vue", "angular", "javascript", "typescript", "next.js", "nuxt", "tailwind", "html", "css"],
+            "Backend": ["backend", "back end", "api", "django", "fastapi", "flask", "spring", "node", "express", ".net", "asp.net", "laravel", "rails"],
+            "Mobile": ["android", "ios", "swift", "kotlin", "flutter", "react native", "xamarin"],
+            "QA": ["qa", "quality assurance", "sdet", "automation testing", "selenium", "cypress", "playwright", "jmeter"],
+            "IT-Other": ["system admin", "sysadmin", "it support", "helpdesk", "network engineer", "ccna", "linux admin", "windows server"],
+        }
+
+        def _score_bucket(rules: list) -> int:
+            s = 0
+            for r in rules:
+                if r.startswith(r"\b"):
+                    if re.search(r, text):
+                        s += 2
+                else:
+                    if r in text:
+                        s += 1
+            return s
+
+        l1_scores = {k: _score_bucket(v) for k, v in it_l1_rules.items()}
+        domain_l1 = max(l1_scores, key=lambda k: l1_scores[k]) if l1_scores else "IT-Other"
+        if l1_scores.get(domain_l1, 0) == 0:
+            domain_l1 = "IT-Other"
+
+        # L2 / L3
+        domain_l2 = None
+        domain_l3 = None
+
+        if domain_l1 == "Frontend":
+            if "react" in text:
+                domain_l2 = "React"
+                if "next" in text:
+                    domain_l3 = "Next.js"
+            elif "vue" in text:
+                domain_l2 = "Vue"
+                if "nuxt" in text:
+                    domain_l3 = "Nuxt"
+            elif "angular" in text:
+                domain_l2 = "Angular"
+            else:
+                domain_l2 = "Vanilla"
+
+        elif domain_l1 == "Backend":
+            if "python" in text:
+                domain_l2 = "Python"
+                if "django" in text:
+                    domain_l3 = "Django"
+                elif "fastapi" in text:
+                    domain_l3 = "FastAPI"
+                elif "flask" in text:
+                    domain_l3 = "Flask"
+            elif ".net" in text or "asp.net" in text or "c#" in text:
+                domain_l2 = ".NET"
+                if "asp.net" in text:
+                    domain_l3 = "ASP.NET"
+            elif "java" in text:
+                domain_l2 = "Java"
+                if "spring" in text:
+                    domain_l3 = "Spring"
+            elif "node" in text or "express" in text:
+                domain_l2 = "Node"
+                if "express" in text:
+                    domain_l3 = "Express"
+            elif "php" in text:
+                domain_l2 = "PHP"
+                if "laravel" in text:
+                    domain_l3 = "Laravel"
+
+        elif domain_l1 == "AI":
+            if "nlp" in text or "language model" in text or "llm" in text:
+                domain_l2 = "NLP"
+            elif "computer vision" in text or "opencv" in text:
+                domain_l2 = "CV"
+            else:
+                domain_l2 = "ML"
+
+            if "pytorch" in text:
+                domain_l3 = "PyTorch"
+            elif "tensorflow" in text:
+                domain_l3 = "TensorFlow"
+
+        elif domain_l1 == "Data":
+            if "data engineer" in text or "etl" in text:
+                domain_l2 = "Engineering"
+            elif "power bi" in text or "tableau" in text or "analytics" in text:
+                domain_l2 = "Analytics"
+            else:
+                domain_l2 = "Science"
+
+        elif domain_l1 == "Security":
+            if "soc" in text or "siem" in text:
+                domain_l2 = "SOC"
+            elif "pentest" in text or "penetration" in text:
+                domain_l2 = "Offensive"
+            elif "grc" in text or "compliance" in text:
+                domain_l2 = "GRC"
+            else:
+                domain_l2 = "Defensive"
+
+        elif domain_l1 == "DevOps":
+            if "kubernetes" in text or "helm" in text:
+                domain_l2 = "Kubernetes"
+            elif "terraform" in text or "iac" in text:
+                domain_l2 = "IaC"
+            elif "ci/cd" in text or "jenkins" in text or "github actions" in text:
+                domain_l2 = "CI/CD"
+            else:
+                domain_l2 = "Cloud"
+
+        elif domain_l1 == "QA":
+            if "automation" in text or "selenium" in text or "cypress" in text or "playwright" in text:
+                domain_l2 = "Automation"
+            else:
+                domain_l2 = "Manual"
+
+        elif domain_l1 == "Mobile":
+            if "flutter" in text:
+                domain_l2 = "Cross-platform"
+                domain_l3 = "Flutter"
+            elif "react native" in text:
+                domain_l2 = "Cross-platform"
+                domain_l3 = "React Native"
+            elif "android" in text or "kotlin" in text:
+                domain_l2 = "Android"
+            elif "ios" in text or "swift" in text:
+                domain_l2 = "iOS"
+            else:
+                domain_l2 = "Cross-platform"
+
+        # confidence: based on it_hits + l1 score
+        base = min(1.0, 0.35 + (it_hits * 0.08) + (l1_scores.get(domain_l1, 0) * 0.05))
+
+        return {
+            "category_primary": "IT",
+            "domain_l1": domain_l1,
+            "domain_l2": domain_l2,
+            "domain_l3": domain_l3,
+            "tax_confidence": round(float(base), 3),
+        }
+
+    # -----------------------------
+    # 3) NON-IT taxonomy (L1/L2/L3)
+    # -----------------------------
+    non_it_rules = {
+        "Sales": ["sales", "business development", "b2b", "b2c", "account executive", "lead generation", "cold call", "crm", "pipeline", "inside sales", "field sales"],
+        "Marketing": ["marketing", "seo", "sem", "google ads", "facebook ads", "content", "copywriting", "brand", "social media", "digital marketing", "growth"],
+        "Finance": ["finance", "account", "accounting", "audit", "tax", "vat", "payroll", "budget", "cfo", "controller", "banking", "treasury"],
+        "HR": ["human resource", "hr", "recruit", "talent", "onboarding", "payroll", "performance", "training", "compensation", "benefits"],
+        "Operations": ["operations", "admin", "administration", "office", "procurement", "supply chain", "inventory", "warehouse", "compliance", "process"],
+        "Customer Support": ["customer support", "customer service", "call center", "support", "helpdesk", "complaint", "ticket", "csr"],
+        "Education": ["teacher", "teaching", "instructor", "lecturer", "school", "college", "curriculum", "tutor", "training"],
+        "Healthcare": ["nurse", "doctor", "medical", "clinic", "hospital", "pharmacy", "lab", "health", "dentist", "radiology"],
+        "Engineering": ["civil engineer", "mechanical engineer", "electrical engineer", "architect", "construction", "site engineer", "autocad", "quantity surveyor"],
+        "Legal": ["legal", "lawyer", "advocate", "paralegal", "contract", "litigation", "compliance officer"],
+        "Hospitality": ["hotel", "restaurant", "chef", "cook", "barista", "waiter", "front desk", "housekeeping", "hospitality"],
+        "Logistics": ["logistics", "delivery", "driver", "fleet", "transport", "shipment", "dispatch", "courier", "import", "export", "customs"],
+        "Design": ["graphic designer", "designer", "photoshop", "illustrator", "indesign", "video editor", "motion graphics", "premiere", "after effects"],
+        "Management": ["manager", "project manager", "product manager", "team lead", "director", "head of", "supervisor", "coordinator"],
+        "Non-IT-Other": [],
+    }
+
+    def _score_list(lst) -> int:
+        s = 0
+        for k in lst:
+            if k in text:
+                # phrases get higher weight
+                s += 2 if " " in k else 1
+        return s
+
+    scores = {k: _score_list(v) for k, v in non_it_rules.items()}
+    domain_l1 = max(scores, key=lambda k: scores[k]) if scores else "Non-IT-Other"
+    if scores.get(domain_l1, 0) == 0:
+        domain_l1 = "Non-IT-Other"
+
+    domain_l2 = None
+    domain_l3 = None
+
+    # L2/L3 specialization examples
+    if domain_l1 == "Sales":
+        if "b2b" in text:
+            domain_l2 = "B2B"
+        elif "b2c" in text:
+            domain_l2 = "B2C"
+        else:
+            domain_l2 = "General"
+        if "crm" in text or "salesforce" in text:
+            domain_l3 = "CRM"
+
+    elif domain_l1 == "Marketing":
+        if "seo" in text:
+            domain_l2 = "SEO"
+        elif "sem" in text or "google ads" in text:
+            domain_l2 = "Performance"
+            domain_l3 = "Google Ads" if "google ads" in text else None
+        elif "social media" in text:
+            domain_l2 = "Social"
+        else:
+            domain_l2 = "General"
+
+    elif domain_l1 == "Finance":
+        if "audit" in text:
+            domain_l2 = "Audit"
+        elif "tax" in text or "vat" in text:
+            domain_l2 = "Tax"
+        elif "payroll" in text:
+            domain_l2 = "Payroll"
+        else:
+            domain_l2 = "Accounting"
+
+    elif domain_l1 == "HR":
+        if "recruit" in text or "talent" in text:
+            domain_l2 = "Recruitment"
+        elif "training" in text or "l&d" in text:
+            domain_l2 = "L&D"
+        elif "payroll" in text:
+            domain_l2 = "Payroll"
+        else:
+            domain_l2 = "General"
+
+    elif domain_l1 == "Operations":
+        if "procurement" in text:
+            domain_l2 = "Procurement"
+        elif "supply chain" in text or "inventory" in text:
+            domain_l2 = "Supply Chain"
+        elif "admin" in text or "administration" in text or "office" in text:
+            domain_l2 = "Admin"
+        else:
+            domain_l2 = "General"
+
+    elif domain_l1 == "Customer Support":
+        if "call center" in text:
+            domain_l2 = "Call Center"
+        elif "chat" in text:
+            domain_l2 = "Chat Support"
+        else:
+            domain_l2 = "General"
+
+    elif domain_l1 == "Engineering":
+        if "civil" in text:
+            domain_l2 = "Civil"
+        elif "mechanical" in text:
+            domain_l2 = "Mechanical"
+        elif "electrical" in text:
+            domain_l2 = "Electrical"
+        elif "architect" in text:
+            domain_l2 = "Architecture"
+        else:
+            domain_l2 = "General"
+
+    elif domain_l1 == "Healthcare":
+        if "nurse" in text:
+            domain_l2 = "Nursing"
+        elif "pharmacy" in text:
+            domain_l2 = "Pharmacy"
+        elif "lab" in text:
+            domain_l2 = "Lab"
+        else:
+            domain_l2 = "General"
+
+    elif domain_l1 == "Design":
+        if "video" in text or "premiere" in text or "after effects" in text:
+            domain_l2 = "Video"
+        else:
+            domain_l2 = "Graphic"
+
+    elif domain_l1 == "Management":
+        if "project manager" in text:
+            domain_l2 = "Project"
+        elif "product manager" in text:
+            domain_l2 = "Product"
+        else:
+            domain_l2 = "General"
+
+    # confidence: based on best bucket score
+    best = scores.get(domain_l1, 0)
+    conf = min(1.0, 0.30 + (best * 0.12))
+    if domain_l1 == "Non-IT-Other":
+        conf = 0.35
+
+    return {
+        "category_primary": "Non-IT",
+        "domain_l1": domain_l1,
+        "domain_l2": domain_l2,
+        "domain_l3": domain_l3,
+        "tax_confidence": round(float(conf), 3),
+    }
+
+
+Inputs = Tuple[str, str, str, str, str, str]
+
+
+def build_inputs(df: pd.DataFrame) -> List[Inputs]:
+    """
+    The argument shapes the callers use: LinkedIn parser (description = about text or skills),
+    backfill (description = skills, industry = category), plus edge strings.
+    """
+    s = {c: (df[c].fillna("").astype(str).tolist() if c in df.columns else [""] * len(df))
+         for c in ["title", "skills", "position", "employment_type", "category_primary"]}
+    rows: List[Inputs] = []
+    for t, sk, p, e, cat in zip(s["title"], s["skills"], s["position"], s["employment_type"], s["category_primary"]):
+        rows.append((t, sk, p, e, p or sk, ""))
+        rows.append((t, sk, p, e, sk, cat))
+    rows += [(x, "", "", "", x, "") for x in EDGE_CASES]
+    return rows
+
+
+def _time(fn, rows: List[Inputs], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        for r in rows:
+            fn(*r)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compiled taxonomy engine vs the original rules.")
+    parser.add_argument("--csv", default=DEFAULT_CSV)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--long", type=int, default=2000, help="chars: rows at least this long count as 'long'")
+    args = parser.parse_args()
+
+    df = pd.read_csv(args.csv, dtype="string")
+    rows = build_inputs(df)
+
+    # engine timings: no memoization (and never touch the real cache store)
+    taxonomy.CACHE = ClassifierCache("taxonomy", taxonomy.engine().version, maxsize=0)
+
+    print("\n🏷️ TAXONOMY PARITY")
+    print("=" * 70)
+
+    mismatches = 0
+    for r in rows:
+        a = legacy_categorize_role_taxonomy(*r)
+        b = taxonomy.categorize(*r)
+        if a != b:
+            mismatches += 1
+            if mismatches <= 5:
+                print(f"❌ {r[0][:60]!r}\n   before: {a}\n   after : {b}")
+    print(f"rows={len(rows)} mismatches={mismatches}")
+
+    long_rows = [r for r in rows if sum(len(x) for x in r) >= args.long]
+    for label, subset in (("all", rows), (f"long (>= {args.long} chars)", long_rows)):
+        if not subset:
+            continue
+        before = _time(legacy_categorize_role_taxonomy, subset, args.repeat)
+        after = _time(taxonomy.categorize, subset, args.repeat)
+        print(
+            f"{label:<24} n={len(subset):<6} before={before / len(subset) * 1e6:8.1f}us/row  "
+            f"after={after / len(subset) * 1e6:7.1f}us/row  speedup={before / after if after else 0:5.1f}x"
+        )
+
+    # batch API: whole frame at once vs legacy row by row
+    frame = pd.DataFrame(rows, columns=["title", "skills", "position", "employment_type", "description", "industry"])
+    t0 = time.perf_counter()
+    batch = taxonomy.categorize_batch(frame)
+    after = time.perf_counter() - t0
+    expected = pd.DataFrame([legacy_categorize_role_taxonomy(*r) for r in rows], columns=taxonomy.TAX_COLS)
+    batch_mismatches = int((batch.astype(object).fillna("∅") != expected.astype(object).fillna("∅")).any(axis=1).sum())
+    before = _time(legacy_categorize_role_taxonomy, rows, 1)
+    print(
+        f"{'batch (categorize_batch)':<24} n={len(rows):<6} before={before * 1000:8.1f}ms      "
+        f"after={after * 1000:7.1f}ms      speedup={before / after if after else 0:5.1f}x  mismatches={batch_mismatches}"
+    )
+    mismatches += batch_mismatches
+
+    # memoized: second pass over the same rows (in-memory LRU only)
+    taxonomy.CACHE = ClassifierCache("taxonomy", taxonomy.engine().version, maxsize=len(rows))
+    _time(taxonomy.categorize, rows, 1)
+    warm = _time(taxonomy.categorize, rows, args.repeat)
+    print(f"{'memoized (warm LRU)':<24} n={len(rows):<6} after={warm / len(rows) * 1e6:7.1f}us/row  {taxonomy.CACHE.stats()}")
+
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == "__main__":
+    main()
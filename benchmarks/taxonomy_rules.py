@@ -0,0 +1,132 @@
+# benchmarks/taxonomy_rules.py
+"""
+Compare two versions of the taxonomy rules (resources/taxonomy_rules.json) on real rows:
+compile time, classification throughput (rows/sec) and how the label distribution moves.
+
+A version is a rules file path, or git:<rev> for the committed file at that revision.
+
+Usage:
+  python benchmarks/taxonomy_rules.py                                  # HEAD vs working copy
+  python benchmarks/taxonomy_rules.py --old git:HEAD~3 --new resources/taxonomy_rules.json
+  python benchmarks/taxonomy_rules.py --old rules_a.json --new rules_b.json --csv /path/to/jobs_master_local.csv
+"""
+from __future__ import annotations
+
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+import subprocess
+from typing import Dict, Tuple
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+import pandas as pd  # noqa: E402
+
+import taxonomy  # noqa: E402
+
+
+DEFAULT_CSV = os.path.join(ROOT_DIR, "data_local", "jobs_master_local.csv")
+RULES_REL = os.path.relpath(taxonomy.RULES_PATH, ROOT_DIR)
+
+
+def resolve_rules(spec: str, tmp_dir: str) -> str:
+    """
+    "git:<rev>" -> the rules file at that revision (written to tmp_dir); else a path.
+    """
+    if not spec.startswith("git:"):
+        return spec
+    rev = spec[len("git:"):] or "HEAD"
+    blob = subprocess.run(
+        ["git", "show", f"{rev}:{RULES_REL}"], cwd=ROOT_DIR, capture_output=True, text=True, check=False
+    )
+    if blob.returncode != 0:
+        raise RuntimeError(f"No {RULES_REL} at {rev}: {blob.stderr.strip()}")
+    path = os.path.join(tmp_dir, f"rules_{rev.replace('/', '_').replace('~', '-')}.json")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(blob.stdout)
+    return path
+
+
+def run_version(path: str, texts: pd.Series, repeat: int) -> Tuple[str, pd.DataFrame, Dict[str, float]]:
+    rules = taxonomy.load_rules(path)
+    t0 = time.perf_counter()
+    engine = taxonomy.TaxonomyEngine(rules, taxonomy.rules_version(rules))
+    compile_sec = time.perf_counter() - t0
+
+    uniques = texts.drop_duplicates().tolist()
+    best = float("inf")
+    out = None
+    for _ in range(repeat):
+        engine.matcher._word_cache.clear()  # cold word cache every run
+        t0 = time.perf_counter()
+        out = engine.classify_texts(uniques)
+        best = min(best, time.perf_counter() - t0)
+
+    labels = out.set_index(pd.Index(uniques)).loc[texts.tolist()].reset_index(drop=True)
+    return engine.version, labels, {"compile_ms": compile_sec * 1000, "rows_per_sec": len(uniques) / best if best else 0.0}
+
+
+def distribution_delta(old: pd.DataFrame, new: pd.DataFrame, col: str, top: int) -> pd.DataFrame:
+    a = old[col].fillna("(none)").value_counts()
+    b = new[col].fillna("(none)").value_counts()
+    d = pd.DataFrame({"old": a, "new": b}).fillna(0).astype(int)
+    d["delta"] = d["new"] - d["old"]
+    d = d[d["delta"] != 0]
+    return d.reindex(d["delta"].abs().sort_values(ascending=False).index).head(top)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark + diff two taxonomy rule versions.")
+    parser.add_argument("--old", default="git:HEAD", help="rules path or git:<rev> (default: git:HEAD)")
+    parser.add_argument("--new", default=taxonomy.RULES_PATH, help="rules path or git:<rev> (default: working copy)")
+    parser.add_argument("--csv", default=DEFAULT_CSV)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--top", type=int, default=15, help="rows per distribution table")
+    args = parser.parse_args()
+
+    df = pd.read_csv(args.csv, dtype="string")
+    # same inputs as backfill: description falls back to skills, industry to category_primary
+    frame = pd.DataFrame({c: df[c] if c in df.columns else pd.NA for c in taxonomy.TEXT_COLS}, index=df.index)
+    frame["description"] = frame["description"].fillna(frame["skills"])
+    if "category_primary" in df.columns:
+        frame["industry"] = frame["industry"].fillna(df["category_primary"])
+    texts = taxonomy.batch_text(frame)
+
+    print("\n🏷️ TAXONOMY RULES: OLD vs NEW")
+    print("=" * 70)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        results = {}
+        for name, spec in (("old", args.old), ("new", args.new)):
+            path = resolve_rules(spec, tmp)
+            version, labels, stats = run_version(path, texts, args.repeat)
+            results[name] = labels
+            print(
+                f"{name}: {spec}  version={version}  compile={stats['compile_ms']:.1f}ms  "
+                f"{stats['rows_per_sec']:,.0f} rows/sec (distinct texts, cold word cache)"
+            )
+
+    old, new = results["old"], results["new"]
+    changed = (old.astype(object).fillna("∅") != new.astype(object).fillna("∅"))
+    print(f"\nrows={len(old)}  rows with any label change: {int(changed[taxonomy.TAX_COLS[:4]].any(axis=1).sum())}")
+    for col in taxonomy.TAX_COLS[:4]:
+        print(f"  {col:<17} changed: {int(changed[col].sum())}")
+
+    for col in ("category_primary", "domain_l1", "domain_l2"):
+        delta = distribution_delta(old, new, col, args.top)
+        print(f"\n{col} distribution (labels that moved)")
+        print(delta.to_string() if len(delta) else "  (no change)")
+
+    moved = pd.DataFrame({"old": old["domain_l1"].fillna("(none)"), "new": new["domain_l1"].fillna("(none)")})[changed["domain_l1"]]
+    if len(moved):
+        print("\ndomain_l1 transitions (old -> new)")
+        print(json.dumps({f"{a} -> {b}": int(n) for (a, b), n in moved.value_counts().head(args.top).items()}, indent=1, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
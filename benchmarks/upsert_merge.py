@@ -0,0 +1,164 @@
+# benchmarks/upsert_merge.py
+"""
+Existing-key merge of upsert_rows_to_excel: per-cell loop (before) vs columnar masks (after),
+on synthetic 10k / 100k-row workbooks.
+
+Usage:
+  python benchmarks/upsert_merge.py
+  python benchmarks/upsert_merge.py --rows 10000 100000 --batch 5 1000 --overlap 0.8
+  python benchmarks/upsert_merge.py --rows 10000 --workbook   # also time the full xlsx upsert
+"""
+from __future__ import annotations
+
+import os
+import sys
+import time
+import random
+import argparse
+import tempfile
+from typing import Dict, List
+
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+import pandas as pd  # noqa: E402
+
+import run_pipeline  # noqa: E402
+from run_pipeline import TAX_COLS, _merge_existing, upsert_rows_to_excel  # noqa: E402
+
+
+PLACEHOLDERS = {"Non", "non", "", "N/A", "na", "NA", "-", "—", "None", "NONE", "<NA>", "nan"}
+
+COLUMNS = [
+    "job_url", "title", "company", "company_link", "location", "country", "work_mode",
+    "employment_type", "experience", "salary", "deadline", "skills",
+    "category_primary", "domain_l1", "domain_l2", "domain_l3", "tax_confidence",
+    "source", "scraped_at",
+]
+
+
+def _value(col: str, i: int, rng: random.Random):
+    if rng.random() < 0.25:
+        return rng.choice([None, "Non", "N/A", ""])
+    if col == "scraped_at":
+        return f"2026-0{rng.randint(1, 9)}-{rng.randint(10, 28)}T{rng.randint(10, 23)}:00:00"
+    return f"{col}_{i % 97}_{rng.randint(0, 9)}"
+
+
+def make_rows(n: int, start: int, rng: random.Random) -> List[Dict]:
+    return [
+        {c: (f"https://example.com/job/{start + i}" if c == "job_url" else _value(c, start + i, rng)) for c in COLUMNS}
+        for i in range(n)
+    ]
+
+
+def normalize(rows: List[Dict]) -> pd.DataFrame:
+    df = pd.DataFrame(rows)[COLUMNS].astype("string").replace(list(PLACEHOLDERS), pd.NA)
+    return df.set_index("job_url")
+
+
+# -------------------------
+# Reference: the per-cell loop this merge replaced
+# -------------------------
+def merge_loop(old_idx: pd.DataFrame, new_idx: pd.DataFrame, update_cols: List[str], overwrite_existing: bool) -> pd.DataFrame:
+    def _is_missingish(v) -> bool:
+        return v is None or str(v).strip() in PLACEHOLDERS
+
+    old_idx = old_idx.copy()
+    for jid in new_idx.index.intersection(old_idx.index):
+        for col in update_cols:
+            new_val = new_idx.at[jid, col]
+            if _is_missingish(new_val):
+                continue
+            if overwrite_existing:
+                old_idx.at[jid, col] = new_val
+            else:
+                if _is_missingish(old_idx.at[jid, col]):
+                    old_idx.at[jid, col] = new_val
+
+        o = old_idx.at[jid, "scraped_at"]
+        n = new_idx.at[jid, "scraped_at"]
+        if not _is_missingish(o) and not _is_missingish(n):
+            try:
+                if pd.to_datetime(n, errors="coerce") > pd.to_datetime(o, errors="coerce"):
+                    old_idx.at[jid, "scraped_at"] = n
+            except Exception:
+                pass
+    return old_idx
+
+
+def _time(fn, repeat: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def bench_merge(n_rows: int, batch: int, overlap: float, update_cols: List[str], overwrite: bool) -> None:
+    rng = random.Random(n_rows * 31 + batch)
+    old_idx = normalize(make_rows(n_rows, 0, rng))
+
+    n_old = int(batch * overlap)
+    batch_rows = make_rows(n_old, rng.randint(0, max(0, n_rows - n_old)), rng) + make_rows(batch - n_old, n_rows, rng)
+    new_idx = normalize(batch_rows)
+
+    before = _time(lambda: merge_loop(old_idx, new_idx, update_cols, overwrite), repeat=1 if n_old > 2000 else 3)
+    # _merge_existing updates in place: give every run its own copy (copy time excluded)
+    copies = [old_idx.copy() for _ in range(3)]
+    after = _time(lambda: _merge_existing(copies.pop(), new_idx, update_cols, overwrite, PLACEHOLDERS, True))
+
+    same = merge_loop(old_idx, new_idx, update_cols, overwrite).equals(
+        _merge_existing(old_idx.copy(), new_idx, update_cols, overwrite, PLACEHOLDERS, True)
+    )
+    mode = "overwrite" if overwrite else "fill"
+    cols = "tax" if update_cols == TAX_COLS else "all"
+    print(
+        f"rows={n_rows:<7} batch={batch:<5} existing={n_old:<5} cols={cols:<3} {mode:<9} "
+        f"loop={before * 1000:9.1f}ms  vectorized={after * 1000:7.1f}ms  "
+        f"speedup={before / after if after else 0:6.1f}x  same={same}"
+    )
+
+
+def bench_workbook(n_rows: int, batch: int, overlap: float) -> None:
+    rng = random.Random(7)
+    with tempfile.TemporaryDirectory() as tmp:
+        run_pipeline.LOCAL_CACHE_DIR = os.path.join(tmp, "local")
+        xlsx = os.path.join(tmp, "bench_jobs.xlsx")
+        pd.DataFrame(make_rows(n_rows, 0, rng)).to_excel(xlsx, index=False, engine="openpyxl")
+
+        n_old = int(batch * overlap)
+        rows = make_rows(n_old, 0, rng) + make_rows(batch - n_old, n_rows, rng)
+
+        t0 = time.perf_counter()
+        upsert_rows_to_excel(xlsx, rows, dedupe_key="job_url", update_cols=TAX_COLS)
+        print(f"workbook rows={n_rows:<7} batch={batch:<5} full upsert (read+merge+write) {time.perf_counter() - t0:.1f}s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the upsert merge step.")
+    parser.add_argument("--rows", type=int, nargs="*", default=[10_000, 100_000])
+    parser.add_argument("--batch", type=int, nargs="*", default=[5, 1_000])
+    parser.add_argument("--overlap", type=float, default=0.8, help="share of the batch that hits existing keys")
+    parser.add_argument("--workbook", action="store_true", help="also time the full xlsx upsert (slow)")
+    args = parser.parse_args()
+
+    print("\n⏱️ UPSERT MERGE BENCHMARK")
+    print("=" * 70)
+
+    for n in args.rows:
+        for b in args.batch:
+            bench_merge(n, b, args.overlap, TAX_COLS, overwrite=False)
+            bench_merge(n, b, args.overlap, [c for c in COLUMNS if c != "job_url"], overwrite=True)
+
+    if args.workbook:
+        print()
+        for n in args.rows:
+            for b in args.batch:
+                bench_workbook(n, b, args.overlap)
+
+
+if __name__ == "__main__":
+    main()
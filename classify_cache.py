@@ -0,0 +1,201 @@
+# classify_cache.py
+from __future__ import annotations
+
+import atexit
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from types import CodeType
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+
+# =========================
+# Classifier memoization
+# =========================
+# Job text is classified again and again (portal parser, backfill, master build,
+# every re-scrape of an unchanged posting). Results are memoized by a content hash
+# of the normalized classifier input:
+#
+#   - in-memory LRU (per process, thread-safe)
+#   - optional SQLite store shared across runs (data_local/store/classify_cache.sqlite)
+#
+# Every entry carries the classifier's rules version (fingerprint() of its rule
+# tables + rule code). A rules change = new version = old entries never match and
+# are purged from the store on first open.
+
+TABLE = "classify_cache"
+FLUSH_EVERY = 256   # buffered store writes from single lookups
+
+
+def _code_parts(code: CodeType) -> List[Any]:
+    # bytecode + constants, recursing into nested code (its repr carries a memory address)
+    return [code.co_code.hex(), code.co_names] + [
+        _code_parts(c) if isinstance(c, CodeType) else repr(c) for c in code.co_consts
+    ]
+
+
+def fingerprint(*parts: Any) -> str:
+    """
+    Stable short hash of rule data (lists / dicts / strings) and rule functions (their code).
+    """
+    def _plain(x: Any) -> Any:
+        if callable(x) and hasattr(x, "__code__"):
+            return _code_parts(x.__code__)
+        return x
+
+    payload = json.dumps([_plain(p) for p in parts], sort_keys=True, default=repr)
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=8).hexdigest()
+
+
+def content_key(text: str) -> str:
+    return hashlib.blake2b(text.encode("utf-8", "surrogatepass"), digest_size=16).hexdigest()
+
+
+class ClassifierCache:
+    """
+    text -> classifier result, valid for one rules `version`.
+
+    - maxsize = 0 turns memoization off (get() always misses, put() is a no-op)
+    - db_path = "" keeps it in memory only; a store that can't be opened also
+      falls back to memory only
+    - results must be JSON-serializable (str / dict of str, float, None)
+    """
+
+    def __init__(self, namespace: str, version: str, maxsize: int = 50_000, db_path: str = ""):
+        self.namespace = namespace
+        self.version = version
+        self.maxsize = max(0, int(maxsize or 0))
+        self.db_path = db_path
+
+        self._lock = threading.Lock()
+        self._lru: "OrderedDict[str, Any]" = OrderedDict()
+        self._pending: Dict[str, str] = {}
+        self._conn: Optional[sqlite3.Connection] = None
+        self._store_ready = False
+
+        self.hits = 0
+        self.store_hits = 0
+        self.misses = 0
+
+        if self.maxsize and db_path:
+            atexit.register(self.flush)
+
+    # -------------------------
+    # Persistent store
+    # -------------------------
+    def _store(self) -> Optional[sqlite3.Connection]:
+        # opened on first miss; caller holds the lock
+        if self._store_ready or not self.db_path or not self.maxsize:
+            return self._conn
+        self._store_ready = True
+        try:
+            os.makedirs(os.path.dirname(self.db_path) or ".", exist_ok=True)
+            conn = sqlite3.connect(self.db_path, check_same_thread=False, timeout=10)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {TABLE} ("
+                "namespace TEXT NOT NULL, key TEXT NOT NULL, version TEXT NOT NULL, value TEXT NOT NULL, "
+                "PRIMARY KEY (namespace, key))"
+            )
+            with conn:
+                # rules changed since these were written
+                conn.execute(f"DELETE FROM {TABLE} WHERE namespace = ? AND version != ?", (self.namespace, self.version))
+            self._conn = conn
+        except (OSError, sqlite3.Error) as e:
+            print(f"[WARN] Classifier cache store unavailable ({self.db_path}): {e}. Using memory only.")
+            self._conn = None
+        return self._conn
+
+    def _store_get(self, keys: List[str]) -> Dict[str, Any]:
+        conn = self._store()
+        if conn is None or not keys:
+            return {}
+        found: Dict[str, Any] = {}
+        for i in range(0, len(keys), 500):
+            chunk = keys[i:i + 500]
+            rows = conn.execute(
+                f"SELECT key, value FROM {TABLE} WHERE namespace = ? AND version = ? "
+                f"AND key IN ({', '.join('?' for _ in chunk)})",
+                [self.namespace, self.version] + chunk,
+            ).fetchall()
+            found.update((k, json.loads(v)) for k, v in rows)
+        return found
+
+    def _flush_locked(self) -> None:
+        conn = self._store()
+        if conn is None or not self._pending:
+            self._pending.clear()
+            return
+        try:
+            with conn:
+                conn.executemany(
+                    f"INSERT OR REPLACE INTO {TABLE} (namespace, key, version, value) VALUES (?, ?, ?, ?)",
+                    [(self.namespace, k, self.version, v) for k, v in self._pending.items()],
+                )
+        except sqlite3.Error as e:
+            print(f"[WARN] Classifier cache write failed: {e}")
+        self._pending.clear()
+
+    def flush(self) -> None:
+        with self._lock:
+            self._flush_locked()
+
+    # -------------------------
+    # LRU
+    # -------------------------
+    def _remember(self, key: str, value: Any) -> None:
+        self._lru[key] = value
+        self._lru.move_to_end(key)
+        if len(self._lru) > self.maxsize:
+            self._lru.popitem(last=False)
+
+    def get(self, text: str) -> Optional[Any]:
+        return self.get_many([text]).get(text)
+
+    def get_many(self, texts: Iterable[str]) -> Dict[str, Any]:
+        """
+        text -> cached result for the texts that are cached (LRU first, then the store).
+        """
+        if not self.maxsize:
+            return {}
+        keyed = {content_key(t): t for t in texts}
+        out: Dict[str, Any] = {}
+        with self._lock:
+            missing: List[str] = []
+            for k, t in keyed.items():
+                if k in self._lru:
+                    self._lru.move_to_end(k)
+                    out[t] = self._lru[k]
+                else:
+                    missing.append(k)
+            self.hits += len(out)
+
+            stored = self._store_get(missing)
+            for k, v in stored.items():
+                self._remember(k, v)
+                out[keyed[k]] = v
+            self.store_hits += len(stored)
+            self.misses += len(missing) - len(stored)
+        return out
+
+    def put(self, text: str, value: Any) -> None:
+        self.put_many([(text, value)], flush=False)
+
+    def put_many(self, items: Iterable[Tuple[str, Any]], flush: bool = True) -> None:
+        if not self.maxsize:
+            return
+        with self._lock:
+            for text, value in items:
+                k = content_key(text)
+                self._remember(k, value)
+                if self.db_path:
+                    self._pending[k] = json.dumps(value)
+            if self._pending and (flush or len(self._pending) >= FLUSH_EVERY):
+                self._flush_locked()
+
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "store_hits": self.store_hits, "misses": self.misses, "size": len(self._lru)}
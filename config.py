@@ -24,6 +24,52 @@ class ScrapeConfig:
     sleep_listing_sec: float = 2.0
     sleep_between_pages_sec: float = 0.5
 
+    # -------------------------
+    # Incremental crawl
+    # -------------------------
+    refresh_after_hours: float = 24.0   # re-scrape a stored job only if older than this (0 = always)
+    listing_stop_after_known_pages: int = 2   # stop paginating after K pages with no unseen keys (0 = walk all pages)
+    deep_crawl_every_cycles: int = 0          # watch mode: every Nth cycle walks all pages (0 = only with --deep)
+
+    # -------------------------
+    # Storage
+    # -------------------------
+    storage_backend: str = "sqlite"   # "sqlite" (store + Excel export once per cycle) | "excel" (upsert the workbook directly)
+    store_dir: str = "/Users/bikal/Data_scraping/data_local/store"   # keep SQLite OFF OneDrive (WAL files must stay local)
+    write_queue_batches: int = 8      # autosave batches waiting for the background writer before the scraper blocks
+
+    # -------------------------
+    # Classifier memoization (taxonomy + IT/Non-IT)
+    # -------------------------
+    classify_cache_size: int = 50_000   # in-memory LRU entries per classifier (0 = no memoization)
+    classify_cache_db: str = "/Users/bikal/Data_scraping/data_local/store/classify_cache.sqlite"   # "" = memory only
+
+    # -------------------------
+    # Detail-page workers (Selenium mode)
+    # -------------------------
+    detail_workers: int = 1              # Chrome instances parsing detail pages in parallel
+    max_concurrent_per_host: int = 2     # page loads in flight per host across all workers
+    min_host_interval_sec: float = 0.5   # gap between two page-load starts on the same host
+
+    # -------------------------
+    # Resource blocking (non-LinkedIn Chrome sessions)
+    # -------------------------
+    block_resources: bool = True
+    blocked_url_patterns: tuple = (
+        # images / icons
+        "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.ico", "*.avif",
+        # fonts
+        "*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot",
+        # media
+        "*.mp4", "*.webm", "*.mp3", "*.m4a", "*.ogg",
+        # third-party trackers / ads
+        "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*",
+        "*googlesyndication.com*", "*connect.facebook.net*", "*facebook.com/tr*",
+        "*hotjar.com*", "*clarity.ms*", "*sentry.io*", "*newrelic.com*",
+        "*fonts.googleapis.com*", "*fonts.gstatic.com*",
+    )
+    allowed_url_patterns: tuple = ()  # e.g. ("*.svg",) or ("sentry.io",) to let those through
+
     # -------------------------
     # Watch mode
     # -------------------------
@@ -49,6 +95,7 @@ class ScrapeConfig:
     )
 
     linkedin_page_size: int = 25
+    linkedin_jitter_sec: tuple = (0.0, 0.0)   # optional random pause (min, max) after each job; readiness waits are DOM events
 
     linkedin_email: str = os.getenv("LINKEDIN_EMAIL", "")
     linkedin_password: str = os.getenv("LINKEDIN_PASSWORD", "")
@@ -1,4 +1,5 @@
 import os
+import sys
 import pandas as pd
 from datetime import datetime
 
@@ -6,6 +7,12 @@ import dash
 from dash import dcc, html, Input, Output, State
 import plotly.express as px
 
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from master_store import master_mtime, parquet_available, read_master  # noqa: E402
+
 
 # =========================
 # CONFIG
@@ -38,11 +45,14 @@ DEFAULT_COMPARE_BY = "source"
 # DATA LOADING
 # =========================
 def load_master_csv() -> pd.DataFrame:
-    if not os.path.exists(MASTER_CSV):
+    # Parquet master: only the date + filter columns are read
+    if parquet_available() and master_mtime() is not None:
+        df = read_master(columns=[DATE_COL] + list(FILTER_FIELDS.keys()))
+    elif os.path.exists(MASTER_CSV):
+        df = pd.read_csv(MASTER_CSV)
+    else:
         return pd.DataFrame()
 
-    df = pd.read_csv(MASTER_CSV)
-
     # Ensure date column exists
     if DATE_COL not in df.columns:
         return pd.DataFrame()
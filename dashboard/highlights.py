@@ -3,6 +3,7 @@ from __future__ import annotations
 
 import os
 import re
+import sys
 from datetime import datetime
 from typing import Optional, List, Dict
 
@@ -12,6 +13,12 @@ import plotly.graph_objects as go
 
 from dash import Dash, dcc, html, Input, Output, State, callback
 
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from master_store import master_mtime, parquet_available, read_master  # noqa: E402
+
 
 # =========================
 # CONFIG
@@ -82,17 +89,34 @@ def _read_csv(path: str) -> pd.DataFrame:
         return pd.read_csv(path, engine="python")
 
 
-def _safe_load() -> pd.DataFrame:
-    if not os.path.exists(LOCAL_MASTER_CSV):
-        return pd.DataFrame()
+def _use_parquet() -> bool:
+    return parquet_available() and master_mtime() is not None
 
-    try:
-        df = _read_csv(LOCAL_MASTER_CSV)
-    except Exception:
-        return pd.DataFrame()
 
-    # ensure required columns exist
+def _data_mtime() -> Optional[float]:
+    return master_mtime() if _use_parquet() else _mtime(LOCAL_MASTER_CSV)
+
+
+def _safe_load(range_value: str = "all") -> pd.DataFrame:
     required = [COL_TIME, COL_TITLE, COL_COMPANY, COL_LOCATION, COL_COUNTRY, COL_SOURCE, COL_CAT]
+
+    if _use_parquet():
+        # only these columns, only the day partitions the range can reach
+        last_n = None if range_value == "all" else int(range_value)
+        try:
+            df = read_master(columns=required + [COL_KEY], last_n_days=last_n)
+        except Exception:
+            return pd.DataFrame()
+    else:
+        if not os.path.exists(LOCAL_MASTER_CSV):
+            return pd.DataFrame()
+
+        try:
+            df = _read_csv(LOCAL_MASTER_CSV)
+        except Exception:
+            return pd.DataFrame()
+
+    # ensure required columns exist
     for c in required:
         if c not in df.columns:
             df[c] = pd.NA
@@ -311,8 +335,8 @@ app.layout = html.Div(
     State("store-mtime", "data"),
 )
 def update_all(n_intervals, _refresh, range_value, count_mode, prev_mtime):
-    cur_mtime = _mtime(LOCAL_MASTER_CSV)
-    df = _safe_load()
+    cur_mtime = _data_mtime()
+    df = _safe_load(range_value or "30")
 
     if df.empty or df[COL_TIME].isna().all():
         msg = (
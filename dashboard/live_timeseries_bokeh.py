@@ -2,6 +2,7 @@
 from __future__ import annotations
 
 import os
+import sys
 import time
 import shutil
 from typing import Optional, List, Dict, Tuple
@@ -22,6 +23,12 @@ from bokeh.models import (
 from bokeh.plotting import figure
 from bokeh.palettes import Category10, Category20
 
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from master_store import master_mtime, parquet_available, read_master  # noqa: E402
+
 
 # ============================================================
 # CONFIG
@@ -91,9 +98,40 @@ def _read_csv_safe(path: str) -> pd.DataFrame:
         return pd.read_csv(path, engine="python")
 
 
+# columns this dashboard uses (Parquet master reads nothing else)
+NEEDED_COLS = list(dict.fromkeys(
+    [COL_TIME, COL_KEY, COL_SOURCE, COL_COUNTRY, COL_CAT, COL_WORKMODE, COL_EMP, COL_TITLE]
+    + [col for _, col in COMPARE_MAP.values() if col]
+))
+
+
+def _use_parquet() -> bool:
+    return parquet_available() and master_mtime() is not None
+
+
+def _data_mtime() -> Optional[float]:
+    if _use_parquet():
+        return master_mtime()
+    try:
+        return os.path.getmtime(MASTER_CSV)
+    except Exception:
+        return None
+
+
 def _safe_load_master() -> pd.DataFrame:
     global _last_good_df
 
+    if _use_parquet():
+        try:
+            df = read_master(columns=NEEDED_COLS)
+            _last_good_df = df
+            return df
+        except Exception as e:
+            print(f"[ERROR] failed reading parquet master: {e}")
+            if _last_good_df is not None:
+                return _last_good_df.copy()
+            return pd.DataFrame()
+
     if not os.path.exists(MASTER_CSV):
         return pd.DataFrame()
 
@@ -470,9 +508,8 @@ for w in [mc_source, mc_country, mc_cat, mc_work, mc_emp, in_keyword, dd_compare
 # ============================================================
 def poll_file_changes():
     global _last_mtime
-    try:
-        m = os.path.getmtime(MASTER_CSV)
-    except Exception:
+    m = _data_mtime()
+    if m is None:
         return
 
     if _last_mtime is None:
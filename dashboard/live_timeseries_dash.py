@@ -2,6 +2,7 @@
 from __future__ import annotations
 
 import os
+import sys
 import time
 import shutil
 from typing import Optional, List, Dict, Tuple
@@ -12,6 +13,12 @@ import plotly.graph_objects as go
 from dash import Dash, dcc, html, Input, Output, State, callback
 from dash.exceptions import PreventUpdate
 
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from master_store import master_mtime, parquet_available, read_master  # noqa: E402
+
 # =========================
 # CONFIG
 # =========================
@@ -99,9 +106,32 @@ def _read_csv_safe(path: str) -> pd.DataFrame:
         return pd.read_csv(path, engine="python")
 
 
+# columns this dashboard uses (Parquet master reads nothing else)
+NEEDED_COLS = [
+    COL_TIME, COL_KEY, COL_SOURCE, COL_COUNTRY, COL_DESIGNATION, COL_CATEGORY,
+    COL_WORKMODE, COL_EMP, COL_TITLE, COL_D1, COL_D2, COL_D3,
+]
+
+
+def _use_parquet() -> bool:
+    return parquet_available() and master_mtime() is not None
+
+
 def _safe_load_master(master_csv_path: str) -> pd.DataFrame:
     global _last_good_df
 
+    if _use_parquet():
+        try:
+            df = read_master(columns=NEEDED_COLS)
+            _last_good_df = df
+            return df
+        except Exception as e:
+            print(f"[ERROR] Failed reading parquet master: {e}")
+            if _last_good_df is not None:
+                print("[WARN] Using last known good dataframe (fallback).")
+                return _last_good_df.copy()
+            return pd.DataFrame()
+
     if not os.path.exists(master_csv_path):
         print(f"[WARN] master CSV not found: {master_csv_path}")
         return pd.DataFrame()
@@ -552,9 +582,11 @@ app.layout = html.Div(
 )
 def poll_mtime(_n: int, prev: Optional[float]):
     try:
-        m = os.path.getmtime(MASTER_CSV)
+        m = master_mtime() if _use_parquet() else os.path.getmtime(MASTER_CSV)
     except Exception:
         return prev
+    if m is None:
+        return prev
     if prev is None or m != prev:
         return m
     return prev
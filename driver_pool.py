@@ -0,0 +1,236 @@
+# driver_pool.py
+from __future__ import annotations
+
+import logging
+import queue
+import threading
+import time
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import urlparse
+
+from scraper_core import driver_command_count
+
+
+# errors that mean "this Chrome is no longer usable" -> restart the worker's driver
+RESTART_ERRORS = ("BLOCKED_OR_CHALLENGE", "DRIVER_DIED", "invalid session id", "disconnected")
+
+_DONE = object()
+
+
+class HostThrottle:
+    """
+    Per-host politeness shared by all workers:
+    - at most `max_concurrent` page loads in flight per host
+    - at least `min_interval_sec` between two page-load starts on the same host
+    """
+
+    def __init__(self, max_concurrent: int = 2, min_interval_sec: float = 0.5):
+        self.max_concurrent = max(1, int(max_concurrent or 1))
+        self.min_interval_sec = max(0.0, float(min_interval_sec or 0.0))
+        self._lock = threading.Lock()
+        self._sems: Dict[str, threading.BoundedSemaphore] = {}
+        self._next_start: Dict[str, float] = {}
+
+    def _sem(self, host: str) -> threading.BoundedSemaphore:
+        with self._lock:
+            if host not in self._sems:
+                self._sems[host] = threading.BoundedSemaphore(self.max_concurrent)
+            return self._sems[host]
+
+    def acquire(self, url: str) -> str:
+        host = (urlparse(url).netloc or "").lower()
+        self._sem(host).acquire()
+
+        # reserve the next start slot for this host, then sleep outside the lock
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_start.get(host, 0.0))
+            self._next_start[host] = start + self.min_interval_sec
+        if start > now:
+            time.sleep(start - now)
+        return host
+
+    def release(self, host: str) -> None:
+        self._sem(host).release()
+
+
+class _WorkerStats:
+    def __init__(self):
+        self.pages = 0
+        self.failed = 0
+        self.restarts = 0
+        self.started = time.monotonic()
+
+    def pages_per_sec(self) -> float:
+        elapsed = time.monotonic() - self.started
+        return self.pages / elapsed if elapsed > 0 else 0.0
+
+
+class DriverPool:
+    """
+    N worker threads, each owning one Chrome, parsing detail URLs concurrently.
+
+    imap(urls) yields (index, url, row) in the SAME order as `urls`
+    (row is None when the page failed), so callers can keep their
+    sequential autosave logic unchanged.
+    """
+
+    def __init__(
+        self,
+        make_driver: Callable[[], object],
+        parse_fn: Callable[[object, str], Optional[Dict]],
+        workers: int = 2,
+        throttle: Optional[HostThrottle] = None,
+        logger: Optional[logging.Logger] = None,
+        label: str = "POOL",
+        max_consec_fails: int = 3,
+        restart_cooldown_sec: float = 6.0,
+    ):
+        self.make_driver = make_driver
+        self.parse_fn = parse_fn
+        self.workers = max(1, int(workers or 1))
+        self.throttle = throttle or HostThrottle()
+        self.logger = logger or logging.getLogger("driver_pool")
+        self.label = label
+        self.max_consec_fails = max(1, int(max_consec_fails or 1))
+        self.restart_cooldown_sec = float(restart_cooldown_sec or 0.0)
+
+        self.stats: List[_WorkerStats] = [_WorkerStats() for _ in range(self.workers)]
+        self._stop = threading.Event()
+
+    # -------------------------
+    # Worker side
+    # -------------------------
+    def _quit(self, driver) -> None:
+        if driver is None:
+            return
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    def _parse(self, driver, url: str) -> Optional[Dict]:
+        host = self.throttle.acquire(url)
+        try:
+            return self.parse_fn(driver, url)
+        finally:
+            self.throttle.release(host)
+
+    def _worker(self, wid: int, tasks: "queue.Queue", results: "queue.Queue", total: int) -> None:
+        stats = self.stats[wid]
+        driver = None
+        consecutive_fails = 0
+
+        try:
+            while not self._stop.is_set():
+                item = tasks.get()
+                if item is _DONE:
+                    break
+                idx, url = item
+
+                row = None
+                for attempt in (1, 2):
+                    try:
+                        if driver is None:
+                            driver = self.make_driver()
+                        self.logger.info(f"[{self.label}] w{wid} {idx + 1}/{total} {url}")
+                        cmds_before = driver_command_count(driver)
+                        row = self._parse(driver, url)
+                        self.logger.info(f"[{self.label}] w{wid} webdriver_cmds={driver_command_count(driver) - cmds_before}")
+                        break
+                    except Exception as e:
+                        msg = str(e)
+                        if any(k in msg for k in RESTART_ERRORS):
+                            self.logger.warning(f"[{self.label}] w{wid} restarting driver ({msg.splitlines()[0][:80]}) + cooldown...")
+                            self._quit(driver)
+                            driver = None
+                            stats.restarts += 1
+                            time.sleep(self.restart_cooldown_sec)
+                            if attempt == 1:
+                                continue
+                        else:
+                            self.logger.exception(f"[{self.label}] w{wid} failed to parse URL (skipping): {url}")
+                        break
+
+                if row:
+                    stats.pages += 1
+                    consecutive_fails = 0
+                else:
+                    stats.failed += 1
+                    consecutive_fails += 1
+
+                if consecutive_fails >= self.max_consec_fails:
+                    self.logger.warning(f"[{self.label}] w{wid} too many consecutive failures ({consecutive_fails}). Restarting driver...")
+                    self._quit(driver)
+                    driver = None
+                    stats.restarts += 1
+                    consecutive_fails = 0
+
+                results.put((idx, url, row))
+        finally:
+            self._quit(driver)
+            results.put((wid, None, _DONE))
+
+    # -------------------------
+    # Caller side
+    # -------------------------
+    def imap(self, urls: List[str]) -> Iterator[Tuple[int, str, Optional[Dict]]]:
+        tasks: "queue.Queue" = queue.Queue()
+        results: "queue.Queue" = queue.Queue()
+
+        for idx, u in enumerate(urls):
+            tasks.put((idx, u))
+        n_workers = min(self.workers, max(1, len(urls)))
+        for _ in range(n_workers):
+            tasks.put(_DONE)
+
+        self._stop.clear()
+        self.stats = [_WorkerStats() for _ in range(self.workers)]
+        threads = [
+            threading.Thread(
+                target=self._worker,
+                args=(wid, tasks, results, len(urls)),
+                name=f"{self.label.lower()}-w{wid}",
+                daemon=True,
+            )
+            for wid in range(n_workers)
+        ]
+        for t in threads:
+            t.start()
+
+        # reorder buffer: release results strictly in input order
+        pending: Dict[int, Tuple[str, Optional[Dict]]] = {}
+        next_idx = 0
+        alive = n_workers
+
+        try:
+            while alive:
+                idx, url, row = results.get()
+                if row is _DONE:
+                    alive -= 1
+                    continue
+                pending[idx] = (url, row)
+                while next_idx in pending:
+                    u, r = pending.pop(next_idx)
+                    yield next_idx, u, r
+                    next_idx += 1
+        finally:
+            # caller stopped early (Ctrl+C / error): let workers exit after their current page
+            self._stop.set()
+            while True:
+                try:
+                    tasks.get_nowait()
+                except queue.Empty:
+                    break
+            for _ in threads:
+                tasks.put(_DONE)
+            for t in threads:
+                t.join(timeout=30)
+
+    def stats_line(self) -> str:
+        parts = [
+            f"w{i}: {s.pages} ok/{s.failed} fail {s.pages_per_sec():.2f} pages/s restarts={s.restarts}"
+            for i, s in enumerate(self.stats)
+        ]
+        total = sum(s.pages_per_sec() for s in self.stats)
+        return f"[{self.label}] " + " | ".join(parts) + f" | total {total:.2f} pages/s"
@@ -0,0 +1,228 @@
+# gazetteer.py
+from __future__ import annotations
+
+import json
+import os
+import re
+import threading
+import unicodedata
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+# =========================
+# Location resolver
+# =========================
+# Free-text `location` ("Kathmandu, Bāgmatī, Nepal", "Calgary, AB", "Greater London Area",
+# "Kathmandu/ Hetauda (On-site)") -> Place(city, region, country), from an offline table:
+#   resources/gazetteer.json   country -> regions -> cities (+ aliases, codes)
+#
+# Compiled once into a token trie (names are lowercased, accent-free \w+ runs):
+#   1) one pass over the location's tokens, longest name at each position
+#   2) codes ("AB", "UAE", "NSW") only when they are a whole comma-separated part
+#   3) every match votes for the countries it belongs to (a country's own name
+#      counts double); the best-supported country wins, ties go to file order
+#   4) region = last region match in that country, city = first city match
+#      in it (preferring one inside that region)
+#   5) the country is "stated" when the location names it (name, alias or code);
+#      portals that list one country's jobs override it only then
+#      ("Hyderabad, Sindh" on a Nepal portal is not evidence for India)
+# Cost is linear in the location length; results are memoized per raw string.
+
+ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
+GAZETTEER_PATH = os.path.join(ROOT_DIR, "resources", "gazetteer.json")
+
+PLACE_COLS = ["city", "region", "country"]
+
+CACHE_MAX = 100_000  # distinct location strings remembered
+
+COUNTRY, REGION, CITY = 0, 1, 2
+
+_TOKEN = re.compile(r"\w+")
+_PARTS = re.compile(r"[,/|;()]")
+
+
+class Place(NamedTuple):
+    city: Optional[str]
+    region: Optional[str]
+    country: Optional[str]
+
+
+NO_PLACE = Place(None, None, None)
+
+Entry = Tuple[int, Optional[str], Optional[str], str]  # (kind, city, region, country)
+
+
+def _fold(text: str) -> str:
+    # "Bāgmatī" -> "bagmati", "Île-de-France" -> "ile-de-france", "İstanbul" -> "istanbul"
+    decomposed = unicodedata.normalize("NFKD", text)
+    return "".join(ch for ch in decomposed if not unicodedata.combining(ch)).casefold()
+
+
+def tokens(text: str) -> List[str]:
+    return _TOKEN.findall(_fold(text))
+
+
+class Gazetteer:
+    """
+    One gazetteer file, compiled: token trie for names, dict for codes.
+    """
+
+    def __init__(self, table: Dict):
+        self.countries: List[str] = list(table["countries"])
+        self._rank = {c: i for i, c in enumerate(self.countries)}
+        self._trie: Dict = {}
+        self._codes: Dict[str, List[Entry]] = {}
+        self._cache: Dict[str, Tuple[Place, bool]] = {}  # location -> (place, country stated)
+
+        for country, spec in table["countries"].items():
+            self._add_names((COUNTRY, None, None, country), [country] + spec.get("aliases", []))
+            self._add_codes((COUNTRY, None, None, country), spec.get("codes", []))
+
+            cities = {None: spec.get("cities", [])}
+            for region, rspec in spec.get("regions", {}).items():
+                self._add_names((REGION, None, region, country), [region] + rspec.get("aliases", []))
+                self._add_codes((REGION, None, region, country), rspec.get("codes", []))
+                cities[region] = rspec.get("cities", [])
+
+            region_of: Dict[str, Optional[str]] = {}
+            for region, names in cities.items():
+                for city in names:
+                    region_of.setdefault(city, region)
+                    self._add_names((CITY, city, region, country), [city])
+            for alias, city in spec.get("city_aliases", {}).items():
+                if city not in region_of:
+                    raise ValueError(f"Gazetteer alias {alias!r} -> unknown city {city!r} in {country}")
+                self._add_names((CITY, city, region_of[city], country), [alias])
+
+    def _add_names(self, entry: Entry, names: List[str]) -> None:
+        for name in names:
+            node = self._trie
+            for tok in tokens(name):
+                node = node.setdefault(tok, {})
+            entries = node.setdefault("", [])  # tokens are never empty: "" marks the end of a name
+            if entry not in entries:
+                entries.append(entry)
+
+    def _add_codes(self, entry: Entry, codes: List[str]) -> None:
+        for code in codes:
+            self._codes.setdefault(code, []).append(entry)
+
+    # -------------------------
+    # Matching
+    # -------------------------
+    def _names_in(self, toks: List[str]) -> List[List[Entry]]:
+        # longest name starting at each position, non-overlapping, left to right
+        found: List[List[Entry]] = []
+        i, n = 0, len(toks)
+        while i < n:
+            node, j, best, end = self._trie, i, None, i + 1
+            while j < n and toks[j] in node:
+                node = node[toks[j]]
+                j += 1
+                if "" in node:
+                    best, end = node[""], j
+            if best is not None:
+                found.append(best)
+            i = end
+        return found
+
+    def _resolve(self, text: str) -> Tuple[Place, bool]:
+        matches = [(m, True) for m in self._names_in(tokens(text))]
+        matches += [(self._codes[p], False) for p in (p.strip() for p in _PARTS.split(text)) if p in self._codes]
+        if not matches:
+            return NO_PLACE, False
+
+        votes: Dict[str, int] = {}
+        for entries, by_name in matches:
+            for country in {e[3] for e in entries}:
+                stated = by_name and any(e[0] == COUNTRY and e[3] == country for e in entries)
+                votes[country] = votes.get(country, 0) + (2 if stated else 1)
+        country = min(votes, key=lambda c: (-votes[c], self._rank[c]))
+        stated = any(e[0] == COUNTRY and e[3] == country for entries, _ in matches for e in entries)
+
+        region = None
+        for entries, _ in matches:
+            region = next((e[2] for e in entries if e[0] == REGION and e[3] == country), region)
+
+        cities = [e for entries, _ in matches for e in entries if e[0] == CITY and e[3] == country]
+        city_entry = next((e for e in cities if region is None or e[2] == region), cities[0] if cities else None)
+        if city_entry is None:
+            return Place(None, region, country), stated
+        return Place(city_entry[1], region or city_entry[2], country), stated
+
+    def _lookup(self, location: Optional[str]) -> Tuple[Place, bool]:
+        if not isinstance(location, str) or not location.strip():
+            return NO_PLACE, False
+        found = self._cache.get(location)
+        if found is None:
+            found = self._resolve(location)
+            if len(self._cache) >= CACHE_MAX:
+                self._cache.clear()
+            self._cache[location] = found
+        return found
+
+    def resolve(self, location: Optional[str]) -> Place:
+        """
+        Location text -> Place; NO_PLACE when nothing in it is known.
+        """
+        return self._lookup(location)[0]
+
+    def stated_country(self, location: Optional[str]) -> Optional[str]:
+        """
+        Country the location names itself ("Dubai, UAE", "Berlin, Germany"); None when the
+        country is only implied by a city or region ("Hyderabad, Sindh", "Atlanta, GA").
+        """
+        place, stated = self._lookup(location)
+        return place.country if stated else None
+
+    def resolve_many(self, locations: pd.Series) -> pd.DataFrame:
+        """
+        resolve() for a whole column -> PLACE_COLS (string dtype) on its index, plus
+        "country_stated" (bool, see stated_country()). Each distinct location is resolved once.
+        """
+        codes, uniques = pd.factorize(locations.astype("string"))
+        found = [self._lookup(u) for u in uniques] + [(NO_PLACE, False)]  # last row = missing
+        rows = [(*place, stated) for place, stated in found]
+        table = np.array(rows, dtype=object).reshape(len(rows), len(PLACE_COLS) + 1)
+        picked = table[np.where(codes < 0, len(uniques), codes)]
+        out = pd.DataFrame(
+            {c: pd.Series(picked[:, i], index=locations.index, dtype="string") for i, c in enumerate(PLACE_COLS)}
+        )
+        out["country_stated"] = picked[:, -1].astype(bool)
+        return out
+
+
+def load_gazetteer(path: str = GAZETTEER_PATH) -> Gazetteer:
+    with open(path, "r", encoding="utf-8") as f:
+        return Gazetteer(json.load(f))
+
+
+_GAZETTEER: Optional[Gazetteer] = None
+_GAZETTEER_LOCK = threading.Lock()
+
+
+def gazetteer() -> Gazetteer:
+    """
+    The gazetteer for GAZETTEER_PATH, compiled on first use.
+    """
+    global _GAZETTEER
+    if _GAZETTEER is None:
+        with _GAZETTEER_LOCK:
+            if _GAZETTEER is None:
+                _GAZETTEER = load_gazetteer()
+    return _GAZETTEER
+
+
+def resolve_location(location: Optional[str]) -> Place:
+    return gazetteer().resolve(location)
+
+
+def stated_country(location: Optional[str]) -> Optional[str]:
+    return gazetteer().stated_country(location)
+
+
+def resolve_locations(locations: pd.Series) -> pd.DataFrame:
+    return gazetteer().resolve_many(locations)
@@ -0,0 +1,304 @@
+# job_store.py
+from __future__ import annotations
+
+import os
+import re
+import sqlite3
+import threading
+from typing import Dict, Iterable, List, Optional
+
+import pandas as pd
+
+
+# =========================
+# SQLite job store
+# =========================
+# One database per portal, one `jobs` table:
+#   - PRIMARY KEY on the portal's dedupe key
+#   - every other column is TEXT, added on first sight (same dynamic union as the Excel upsert)
+#   - placeholders ("Non", "N/A", "-", ...) are stored as NULL, so "blank" == NULL in SQL
+#
+# Conflict rules (same semantics as upsert_rows_to_excel):
+#   - fill-blanks (default):   col = COALESCE(jobs.col, excluded.col)
+#   - overwrite_existing=True: col = COALESCE(excluded.col, jobs.col)
+#   - scraped_at:              newest wins
+#
+# scraped_at is kept as ISO-8601 with a "T" ("2026-01-31T09:15:00"): legacy
+# "YYYY-MM-DD HH:MM:SS" stamps (Excel rows, str(Timestamp)) are rewritten on insert
+# and on open, so text comparison (MAX, ORDER BY) is chronological.
+
+TABLE = "jobs"
+
+PLACEHOLDERS = {"Non", "non", "", "N/A", "na", "NA", "-", "—", "None", "NONE", "<NA>", "nan"}
+
+_SPACED_STAMP = re.compile(r"^\d{4}-\d{2}-\d{2} \d")
+SPACED_STAMP_GLOB = "[0-9][0-9][0-9][0-9]-[0-9][0-9]-[0-9][0-9] [0-9]*"
+
+
+def _q(name: str) -> str:
+    return '"' + str(name).replace('"', '""') + '"'
+
+
+def _to_db(value) -> Optional[str]:
+    if value is None:
+        return None
+    try:
+        if pd.isna(value):
+            return None
+    except (TypeError, ValueError):
+        pass
+    s = str(value)
+    if s.strip() in PLACEHOLDERS:
+        return None
+    return s
+
+
+def _iso_stamp(value: Optional[str]) -> Optional[str]:
+    # "2026-01-31 09:15:00" -> "2026-01-31T09:15:00"; anything else unchanged
+    if value is not None and _SPACED_STAMP.match(value):
+        return value[:10] + "T" + value[11:]
+    return value
+
+
+def read_rows_since(db_path: str, since_day: Optional[str] = None) -> pd.DataFrame:
+    """
+    Read-only scan for other processes (build_master): rows scraped on/after
+    `since_day` ("YYYY-MM-DD"), or every row when None.
+    Filters on the day prefix so mixed "T"/space stamps still compare correctly;
+    rows without a dated scraped_at cannot be placed and are always returned.
+    """
+    uri = "file:" + os.path.abspath(db_path) + "?mode=ro"
+    conn = sqlite3.connect(uri, uri=True)
+    try:
+        cols = [r[1] for r in conn.execute(f"PRAGMA table_info({TABLE})").fetchall()]
+        if since_day and "scraped_at" in cols:
+            cur = conn.execute(
+                f"SELECT * FROM {TABLE} WHERE substr(scraped_at, 1, 10) >= ? "
+                "OR scraped_at IS NULL OR scraped_at NOT GLOB '[0-9][0-9][0-9][0-9]-[0-9][0-9]-[0-9][0-9]*'",
+                (since_day,),
+            )
+        else:
+            cur = conn.execute(f"SELECT * FROM {TABLE}")
+        df = pd.DataFrame.from_records(cur.fetchall(), columns=[d[0] for d in cur.description])
+    finally:
+        conn.close()
+    return df.astype("string")
+
+
+def primary_key(db_path: str) -> str:
+    """
+    Dedupe key an existing store was created with (for tools that open it without the portal config).
+    """
+    uri = "file:" + os.path.abspath(db_path) + "?mode=ro"
+    conn = sqlite3.connect(uri, uri=True)
+    try:
+        rows = conn.execute(f"PRAGMA table_info({TABLE})").fetchall()
+    finally:
+        conn.close()
+    keys = [r[1] for r in rows if r[5]]
+    if not keys:
+        raise ValueError(f"Store {db_path} has no '{TABLE}' table")
+    return keys[0]
+
+
+class JobStore:
+    """
+    Embedded storage engine for one portal (WAL mode, safe to share across threads).
+    """
+
+    def __init__(self, db_path: str, dedupe_key: str):
+        self.db_path = db_path
+        self.dedupe_key = dedupe_key
+        self.writes = 0  # upserted batches since open (export only when > 0)
+
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(f"CREATE TABLE IF NOT EXISTS {TABLE} ({_q(dedupe_key)} TEXT PRIMARY KEY)")
+        self._conn.commit()
+        self._columns = self._load_columns()
+
+        if dedupe_key not in self._columns:
+            raise ValueError(f"Store {db_path} is keyed on '{self._columns[0]}', not '{dedupe_key}'")
+        self._migrate_stamps()
+
+    # -------------------------
+    # Schema
+    # -------------------------
+    def _load_columns(self) -> List[str]:
+        return [r[1] for r in self._conn.execute(f"PRAGMA table_info({TABLE})").fetchall()]
+
+    def _ensure_columns(self, cols: Iterable[str]) -> None:
+        for c in cols:
+            if c not in self._columns:
+                self._conn.execute(f"ALTER TABLE {TABLE} ADD COLUMN {_q(c)} TEXT")
+                self._columns.append(c)
+
+    def _migrate_stamps(self) -> None:
+        # stores written before scraped_at was normalized
+        if "scraped_at" not in self._columns:
+            return
+        with self._conn:
+            self._conn.execute(
+                f"UPDATE {TABLE} SET scraped_at = substr(scraped_at, 1, 10) || 'T' || substr(scraped_at, 12) "
+                "WHERE scraped_at GLOB ?",
+                (SPACED_STAMP_GLOB,),
+            )
+
+    @property
+    def columns(self) -> List[str]:
+        return list(self._columns)
+
+    # -------------------------
+    # Read
+    # -------------------------
+    def count(self) -> int:
+        with self._lock:
+            return int(self._conn.execute(f"SELECT COUNT(*) FROM {TABLE}").fetchone()[0])
+
+    def key_index(self) -> Dict[str, Optional[str]]:
+        """
+        key -> scraped_at for every stored row.
+        """
+        with self._lock:
+            if "scraped_at" in self._columns:
+                sql = f"SELECT {_q(self.dedupe_key)}, scraped_at FROM {TABLE}"
+            else:
+                sql = f"SELECT {_q(self.dedupe_key)}, NULL FROM {TABLE}"
+            return dict(self._conn.execute(sql).fetchall())
+
+    def to_frame(self) -> pd.DataFrame:
+        """
+        All rows, newest scraped_at first (the workbook export order).
+        """
+        with self._lock:
+            order = " ORDER BY scraped_at DESC" if "scraped_at" in self._columns else ""
+            cur = self._conn.execute(f"SELECT * FROM {TABLE}{order}")
+            cols = [d[0] for d in cur.description]
+            df = pd.DataFrame.from_records(cur.fetchall(), columns=cols)
+        return df.astype("string")
+
+    # -------------------------
+    # Write
+    # -------------------------
+    def upsert(
+        self,
+        rows: List[Dict],
+        update_cols: Optional[List[str]] = None,
+        overwrite_existing: bool = False,
+    ) -> int:
+        """
+        INSERT ... ON CONFLICT DO UPDATE for a batch of row dicts.
+        Returns number of NEW keys inserted.
+        """
+        key = self.dedupe_key
+        batch_cols = list(dict.fromkeys([key] + [c for r in rows for c in r.keys()]))
+
+        records = []
+        for r in rows:
+            k = _to_db(r.get(key))
+            if k is None or not k.strip():
+                continue
+            records.append(tuple([k.strip()] + [_to_db(r.get(c)) for c in batch_cols[1:]]))
+        if not records:
+            return 0
+        if "scraped_at" in batch_cols[1:]:
+            i = batch_cols.index("scraped_at")
+            records = [rec[:i] + (_iso_stamp(rec[i]),) + rec[i + 1:] for rec in records]
+
+        if update_cols is None:
+            upd = [c for c in batch_cols if c != key]
+        else:
+            upd = [c for c in update_cols if c in batch_cols and c != key]
+
+        sets = []
+        for c in upd:
+            if c == "scraped_at":
+                continue
+            if overwrite_existing:
+                sets.append(f"{_q(c)} = COALESCE(excluded.{_q(c)}, {TABLE}.{_q(c)})")
+            else:
+                sets.append(f"{_q(c)} = COALESCE({TABLE}.{_q(c)}, excluded.{_q(c)})")
+
+        if "scraped_at" in batch_cols:
+            # normalized ISO-8601 text compares chronologically; MAX() is NULL if either side is NULL
+            if "scraped_at" in upd and overwrite_existing:
+                sets.append(f"scraped_at = COALESCE(excluded.scraped_at, {TABLE}.scraped_at)")
+            elif "scraped_at" in upd:
+                sets.append(
+                    f"scraped_at = COALESCE(MAX({TABLE}.scraped_at, excluded.scraped_at), "
+                    f"{TABLE}.scraped_at, excluded.scraped_at)"
+                )
+            else:
+                sets.append(f"scraped_at = COALESCE(MAX({TABLE}.scraped_at, excluded.scraped_at), {TABLE}.scraped_at)")
+
+        col_sql = ", ".join(_q(c) for c in batch_cols)
+        ph = ", ".join("?" for _ in batch_cols)
+        conflict = f"DO UPDATE SET {', '.join(sets)}" if sets else "DO NOTHING"
+        sql = f"INSERT INTO {TABLE} ({col_sql}) VALUES ({ph}) ON CONFLICT({_q(key)}) {conflict}"
+
+        batch_keys = list(dict.fromkeys(r[0] for r in records))
+
+        with self._lock, self._conn:
+            self._ensure_columns(batch_cols)
+            existing = 0
+            for i in range(0, len(batch_keys), 500):
+                chunk = batch_keys[i:i + 500]
+                existing += self._conn.execute(
+                    f"SELECT COUNT(*) FROM {TABLE} WHERE {_q(key)} IN ({', '.join('?' for _ in chunk)})",
+                    chunk,
+                ).fetchone()[0]
+            self._conn.executemany(sql, records)
+            self.writes += 1
+
+        return len(batch_keys) - existing
+
+    def fill_blanks(self, df: pd.DataFrame, cols: List[str]) -> int:
+        """
+        Set `cols` of already-stored rows where they are NULL (never inserts, never overwrites).
+        Returns number of rows changed.
+        """
+        key = self.dedupe_key
+        cols = [c for c in dict.fromkeys(cols) if c in df.columns and c != key]
+        if df is None or df.empty or key not in df.columns or not cols:
+            return 0
+
+        records = []
+        for k, *values in df[[key] + cols].itertuples(index=False, name=None):
+            k = _to_db(k)
+            if k is None or not k.strip():
+                continue
+            records.append(tuple(_to_db(v) for v in values) + (k.strip(),))
+        if not records:
+            return 0
+
+        sets = ", ".join(f"{_q(c)} = COALESCE({_q(c)}, ?)" for c in cols)
+        blank = " OR ".join(f"{_q(c)} IS NULL" for c in cols)
+        sql = f"UPDATE {TABLE} SET {sets} WHERE {_q(key)} = ? AND ({blank})"
+
+        with self._lock, self._conn:
+            self._ensure_columns(cols)
+            before = self._conn.total_changes
+            self._conn.executemany(sql, records)
+            changed = self._conn.total_changes - before
+            if changed:
+                self.writes += 1
+        return changed
+
+    def seed_from_frame(self, df: pd.DataFrame) -> int:
+        """
+        Bulk-load an existing workbook into an empty store (keeps its column order).
+        """
+        if df is None or df.empty or self.dedupe_key not in df.columns:
+            return 0
+        df = df.loc[:, ~df.columns.duplicated()]
+        rows = df.to_dict(orient="records")
+        inserted = self.upsert(rows, update_cols=None)
+        self.writes = 0
+        return inserted
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,134 @@
+# key_index.py
+from __future__ import annotations
+
+import os
+import sqlite3
+from contextlib import closing
+from typing import Dict, Iterable, Optional, Tuple
+
+
+# =========================
+# Key index sidecar
+# =========================
+# One small SQLite file per portal workbook:
+#   keys(key PRIMARY KEY, scraped_at)   -> membership + freshness without opening the .xlsx
+#   meta(name PRIMARY KEY, value)       -> dedupe key + workbook mtime/size it was built from
+#
+# The sidecar is trusted only while the stored (mtime, size) matches the workbook.
+# Any drift (manual edit, OneDrive sync, failed copy) => rebuild from the workbook.
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS keys (
+    key TEXT PRIMARY KEY,
+    scraped_at TEXT
+);
+CREATE TABLE IF NOT EXISTS meta (
+    name TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+def key_index_path(xlsx_path: str) -> str:
+    """
+    data/merojob_jobs.xlsx -> data/_internal/merojob_jobs.keys.sqlite
+    """
+    folder = os.path.join(os.path.dirname(xlsx_path), "_internal")
+    stem = os.path.splitext(os.path.basename(xlsx_path))[0]
+    return os.path.join(folder, f"{stem}.keys.sqlite")
+
+
+def workbook_stamp(xlsx_path: str) -> Optional[str]:
+    try:
+        st = os.stat(xlsx_path)
+    except OSError:
+        return None
+    return f"{st.st_mtime_ns}:{st.st_size}"
+
+
+def _connect(path: str) -> sqlite3.Connection:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    conn = sqlite3.connect(path)
+    conn.executescript(SCHEMA)
+    return conn
+
+
+class KeyIndex:
+    """
+    key -> last scraped_at for one workbook, persisted next to it.
+    """
+
+    def __init__(self, xlsx_path: str, dedupe_key: str, path: Optional[str] = None):
+        self.xlsx_path = xlsx_path
+        self.dedupe_key = dedupe_key
+        self.path = path or key_index_path(xlsx_path)
+
+    # -------------------------
+    # Sync state
+    # -------------------------
+    def _meta(self, conn: sqlite3.Connection) -> Dict[str, str]:
+        return dict(conn.execute("SELECT name, value FROM meta").fetchall())
+
+    def in_sync(self) -> bool:
+        """
+        True when the sidecar was built from the workbook as it is on disk right now.
+        """
+        stamp = workbook_stamp(self.xlsx_path)
+        if stamp is None or not os.path.exists(self.path):
+            return False
+        try:
+            with closing(_connect(self.path)) as conn:
+                meta = self._meta(conn)
+        except sqlite3.Error:
+            return False
+        return meta.get("dedupe_key") == self.dedupe_key and meta.get("workbook_stamp") == stamp
+
+    def _stamp(self, conn: sqlite3.Connection) -> None:
+        conn.executemany(
+            "INSERT INTO meta(name, value) VALUES (?, ?) "
+            "ON CONFLICT(name) DO UPDATE SET value = excluded.value",
+            [
+                ("dedupe_key", self.dedupe_key),
+                ("workbook_stamp", workbook_stamp(self.xlsx_path) or ""),
+            ],
+        )
+
+    # -------------------------
+    # Read
+    # -------------------------
+    def load(self) -> Dict[str, Optional[str]]:
+        with closing(_connect(self.path)) as conn:
+            return dict(conn.execute("SELECT key, scraped_at FROM keys").fetchall())
+
+    def __contains__(self, key: str) -> bool:
+        with closing(_connect(self.path)) as conn:
+            return conn.execute("SELECT 1 FROM keys WHERE key = ?", (key,)).fetchone() is not None
+
+    # -------------------------
+    # Write
+    # -------------------------
+    def rebuild(self, items: Iterable[Tuple[str, Optional[str]]]) -> None:
+        """
+        Replace the whole index, then stamp it with the current workbook state.
+        """
+        with closing(_connect(self.path)) as conn, conn:
+            conn.execute("DELETE FROM keys")
+            conn.executemany(
+                "INSERT INTO keys(key, scraped_at) VALUES (?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET scraped_at = excluded.scraped_at",
+                items,
+            )
+            self._stamp(conn)
+
+    def upsert(self, items: Iterable[Tuple[str, Optional[str]]]) -> None:
+        """
+        Write the stored (key, scraped_at) of a just-written batch, then re-stamp.
+        Only valid when the index was in sync with the workbook BEFORE the write.
+        """
+        with closing(_connect(self.path)) as conn, conn:
+            conn.executemany(
+                "INSERT INTO keys(key, scraped_at) VALUES (?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET scraped_at = excluded.scraped_at",
+                items,
+            )
+            self._stamp(conn)
@@ -0,0 +1,263 @@
+# master_store.py
+from __future__ import annotations
+
+import json
+import os
+import shutil
+import time
+from typing import Dict, List, Optional, Sequence
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+except ImportError:  # dashboards fall back to the master CSV
+    pa = ds = pq = None
+
+
+# =========================
+# Parquet master dataset
+# =========================
+# data_local/jobs_master_parquet/
+#   source=merojob/scrape_day=2026-02-23/part-0.parquet
+#   ...
+#   _manifest.json   -> columns + content hash per partition (written last)
+#
+# - every data column is stored as string (dictionary-encoded pages in Parquet),
+#   except INT64_COLS (global_key_hash, salary_min/max) and FLOAT64_COLS (exp_*_years)
+# - low-cardinality columns come back as pandas `category`
+# - only partitions whose content hash changed are rewritten
+
+LOCAL_CACHE_DIR = "/Users/bikal/Data_scraping/data_local"
+MASTER_PARQUET_DIR = os.path.join(LOCAL_CACHE_DIR, "jobs_master_parquet")
+MANIFEST_NAME = "_manifest.json"
+
+PARTITION_COLS = ["source", "scrape_day"]
+VOLATILE_COLS = ["master_built_at"]  # not stored; the manifest keeps written_at instead
+UNKNOWN_DAY = "unknown"
+
+INT64_COLS = ["global_key_hash", "salary_min", "salary_max"]
+FLOAT64_COLS = ["exp_min_years", "exp_max_years"]
+
+CATEGORICAL_COLS = [
+    "source",
+    "region",
+    "country",
+    "work_mode",
+    "employment_type",
+    "type",
+    "commitment",
+    "salary_currency",
+    "salary_period",
+    "category_primary",
+    "domain_l1",
+    "domain_l2",
+    "domain_l3",
+    "tax_confidence",
+]
+
+
+def parquet_available() -> bool:
+    return pq is not None
+
+
+def manifest_path(root: str = MASTER_PARQUET_DIR) -> str:
+    return os.path.join(root, MANIFEST_NAME)
+
+
+def master_mtime(root: str = MASTER_PARQUET_DIR) -> Optional[float]:
+    """
+    Changes once per successful master write (dashboards poll this).
+    """
+    try:
+        return os.path.getmtime(manifest_path(root))
+    except OSError:
+        return None
+
+
+def _load_manifest(root: str) -> Dict:
+    try:
+        with open(manifest_path(root), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {"columns": [], "partitions": {}}
+
+
+def _save_manifest(root: str, manifest: Dict) -> None:
+    path = manifest_path(root)
+    tmp = path + f".tmp_{int(time.time())}"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+    os.replace(tmp, path)
+
+
+def _partition_dir(source: str, day: str) -> str:
+    return f"source={source}/scrape_day={day}"
+
+
+def scrape_day(values: pd.Series) -> pd.Series:
+    dt = pd.to_datetime(values, errors="coerce", format="mixed")
+    return dt.dt.strftime("%Y-%m-%d").fillna(UNKNOWN_DAY).astype("string")
+
+
+def _to_storage_frame(master: pd.DataFrame) -> pd.DataFrame:
+    # per-build stamps would change every partition's hash every cycle
+    out = master.drop(columns=[c for c in VOLATILE_COLS if c in master.columns])
+    for c in out.columns:
+        if c in INT64_COLS:
+            out[c] = pd.to_numeric(out[c], errors="coerce").astype("Int64")
+            continue
+        if c in FLOAT64_COLS:
+            out[c] = pd.to_numeric(out[c], errors="coerce").astype("Float64")
+            continue
+        if pd.api.types.is_datetime64_any_dtype(out[c]):
+            out[c] = out[c].dt.strftime("%Y-%m-%d %H:%M:%S.%f")  # lossless: incremental builds re-read it
+        out[c] = out[c].astype("string")
+    out["source"] = out["source"].fillna("unknown").str.strip().str.lower()
+    out["scrape_day"] = scrape_day(master["scraped_at"]) if "scraped_at" in master.columns else UNKNOWN_DAY
+    return out
+
+
+def _content_hash(part: pd.DataFrame) -> str:
+    h = pd.util.hash_pandas_object(part, index=False)
+    return f"{len(part)}:{int(h.sum()) & 0xFFFFFFFFFFFFFFFF:016x}"
+
+
+def write_master_parquet(master: pd.DataFrame, root: str = MASTER_PARQUET_DIR) -> Dict[str, int]:
+    """
+    Write the master frame as a partitioned dataset. Returns counts:
+    written / unchanged / removed partitions.
+    """
+    if pq is None:
+        raise RuntimeError("pyarrow is required for the Parquet master (pip install pyarrow)")
+
+    os.makedirs(root, exist_ok=True)
+    manifest = _load_manifest(root)
+    old_parts: Dict[str, str] = manifest.get("partitions", {})
+
+    frame = _to_storage_frame(master)
+    data_cols = [c for c in frame.columns if c not in PARTITION_COLS]
+
+    # a new/removed column changes every partition's schema -> rewrite all
+    schema_changed = manifest.get("columns") != data_cols
+
+    new_parts: Dict[str, str] = {}
+    written = unchanged = 0
+
+    for (source, day), part in frame.groupby(PARTITION_COLS, sort=False, observed=True):
+        part = part[data_cols]
+        key = _partition_dir(source, day)
+        digest = _content_hash(part)
+        new_parts[key] = digest
+
+        if not schema_changed and old_parts.get(key) == digest:
+            unchanged += 1
+            continue
+
+        folder = os.path.join(root, key)
+        os.makedirs(folder, exist_ok=True)
+        out_path = os.path.join(folder, "part-0.parquet")
+        tmp_path = os.path.join(folder, f"_part-0.parquet.tmp_{int(time.time())}")  # "_" = ignored by readers
+        table = pa.Table.from_pandas(part.reset_index(drop=True), preserve_index=False)
+        pq.write_table(table, tmp_path, use_dictionary=True, compression="zstd")
+        os.replace(tmp_path, out_path)
+        written += 1
+
+    removed = 0
+    for key in set(old_parts) - set(new_parts):
+        shutil.rmtree(os.path.join(root, key), ignore_errors=True)
+        removed += 1
+
+    _save_manifest(root, {
+        "columns": data_cols,
+        "partitions": new_parts,
+        "written_at": pd.Timestamp.now().isoformat(timespec="seconds"),
+    })
+    return {"written": written, "unchanged": unchanged, "removed": removed}
+
+
+def _arrow_type(column: str):
+    if column in INT64_COLS:
+        return pa.int64()
+    return pa.float64() if column in FLOAT64_COLS else pa.string()
+
+
+def _dataset(root: str, columns: List[str]):
+    schema = pa.schema(
+        [(c, _arrow_type(c)) for c in columns]
+        + [("source", pa.string()), ("scrape_day", pa.string())]
+    )
+    return ds.dataset(
+        root,
+        format="parquet",
+        schema=schema,
+        partitioning=ds.partitioning(pa.schema([("source", pa.string()), ("scrape_day", pa.string())]), flavor="hive"),
+        exclude_invalid_files=True,
+        ignore_prefixes=["_", "."],
+    )
+
+
+def latest_day(root: str = MASTER_PARQUET_DIR) -> Optional[str]:
+    days = [
+        k.split("scrape_day=", 1)[1]
+        for k in _load_manifest(root).get("partitions", {})
+        if "scrape_day=" in k and not k.endswith(UNKNOWN_DAY)
+    ]
+    return max(days) if days else None
+
+
+def read_master(
+    columns: Optional[Sequence[str]] = None,
+    since_day: Optional[str] = None,
+    last_n_days: Optional[int] = None,
+    sources: Optional[Sequence[str]] = None,
+    root: str = MASTER_PARQUET_DIR,
+) -> pd.DataFrame:
+    """
+    Read only the requested columns and partitions.
+    - since_day: "YYYY-MM-DD" lower bound on scrape_day
+    - last_n_days: since (latest stored day - N days)
+    - sources: portal names
+    Missing columns come back as NA (same as a CSV without that header).
+    """
+    if pq is None or not os.path.exists(manifest_path(root)):
+        return pd.DataFrame()
+
+    manifest = _load_manifest(root)
+    stored = list(manifest.get("columns", []))
+    if not manifest.get("partitions"):
+        return pd.DataFrame(columns=list(columns or stored))
+
+    if last_n_days is not None and since_day is None:
+        latest = latest_day(root)
+        if latest:
+            since_day = (pd.Timestamp(latest) - pd.Timedelta(days=int(last_n_days))).strftime("%Y-%m-%d")
+
+    dataset = _dataset(root, stored)
+
+    expr = None
+    if since_day:
+        expr = (ds.field("scrape_day") >= since_day) & (ds.field("scrape_day") != UNKNOWN_DAY)
+    if sources:
+        e = ds.field("source").isin(list(sources))
+        expr = e if expr is None else expr & e
+
+    wanted = list(columns) if columns else stored + ["source"]
+    readable = [c for c in dict.fromkeys(wanted) if c in stored or c in PARTITION_COLS]
+
+    df = dataset.to_table(columns=readable, filter=expr).to_pandas()
+    for c in wanted:
+        if c not in df.columns:
+            df[c] = pd.NA
+    for c in INT64_COLS:
+        if c in df.columns:
+            df[c] = df[c].astype("Int64")
+    for c in FLOAT64_COLS:
+        if c in df.columns:
+            df[c] = df[c].astype("Float64")
+    for c in CATEGORICAL_COLS:
+        if c in df.columns:
+            df[c] = df[c].astype("category")
+    return df[wanted]
@@ -3,7 +3,7 @@ from __future__ import annotations
 
 import re
 import time
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Set, Tuple
 from urllib.parse import urlparse, urljoin
 
 from selenium.webdriver.common.by import By
@@ -18,6 +18,13 @@ from scraper_core import (
     clean_or_non,
     classify_it_non_it,
     categorize_role_taxonomy,   # ✅ ADD THIS
+    KnownPageStreak,
+    fetch_html,
+    html_to_soup,
+    looks_like_challenge,
+    snapshot_soup,
+    soup_inner_text,
+    soup_pick_text,
 )
 
 BASE = "https://www.jobsnepal.com"
@@ -25,6 +32,23 @@ LISTING_URL = "https://www.jobsnepal.com/jobs?page={page}"
 
 JOB_DETAIL_RE = re.compile(r"^https://(www\.)?jobsnepal\.com/.+-(\d+)$", re.I)
 
+OVERVIEW_ROWS_CSS = "div.job-overview-inner table tr"
+OVERVIEW_SPAN_CSS = "span.font-weight-semibold"
+OVERVIEW_CITY_CSS = "[itemprop='addressLocality']"
+
+DESCRIPTION_CSS = [
+    "#div-job-details",
+    "div#div-job-details span[itemprop='description']",
+    "div.job-details-by-emloyer",
+    "span[itemprop='description']",
+]
+
+TITLE_CSS = ["div.job-details h1.job-title", "h1.job-title", "h1"]
+COMPANY_TITLE_CSS = ".company-info .company-title"
+COMPANY_ANCHOR_CSS = "h3.job-company a[href]"
+EMPLOYER_ANCHOR_CSS = "a[href^='employer/'], a[href*='/employer/']"
+DATE_POSTED_META_CSS = "meta[itemprop='datePosted']"
+
 
 # -------------------------
 # URL COLLECTION
@@ -51,8 +75,11 @@ def collect_job_urls(
     limit: int = 200,
     per_page: int = 30,      # accepted for unified pipeline signature (not used)
     sleep_sec: float = 0.3,  # used for pacing
+    known_keys: Optional[Set[str]] = None,
+    stop_after_known_pages: int = 0,
 ) -> List[str]:
     urls: List[str] = []
+    known_streak = KnownPageStreak(known_keys, stop_after_known_pages)
 
     pages = max(1, int(pages or 1))
     limit = int(limit or 200)
@@ -63,6 +90,7 @@ def collect_job_urls(
         WebDriverWait(driver, 15).until(EC.presence_of_element_located((By.TAG_NAME, "body")))
         time.sleep(sleep_sec)
 
+        page_urls: List[str] = []
         hrefs = _js_collect_links(driver)
         for href in hrefs:
             if not JOB_DETAIL_RE.match(href):
@@ -70,10 +98,15 @@ def collect_job_urls(
             if "jobsnepal.com" not in urlparse(href).netloc.lower():
                 continue
             urls.append(href)
+            page_urls.append(href)
 
         if len(urls) >= limit:
             break
 
+        if known_streak.page(page_urls):
+            print(f"[JOBSNEPAL] {known_streak.streak} consecutive listing pages with only known jobs. Stopping early.")
+            break
+
         time.sleep(sleep_sec)
 
     # dedupe preserve order
@@ -87,6 +120,58 @@ def collect_job_urls(
     return out[:limit]
 
 
+def collect_job_urls_http(
+    session,
+    pages: int = 10,
+    limit: int = 200,
+    per_page: int = 30,      # accepted for unified pipeline signature (not used)
+    sleep_sec: float = 0.3,
+    known_keys: Optional[Set[str]] = None,
+    stop_after_known_pages: int = 0,
+) -> List[str]:
+    """
+    Same as collect_job_urls, but reads the listing HTML over plain HTTP.
+    """
+    urls: List[str] = []
+    known_streak = KnownPageStreak(known_keys, stop_after_known_pages)
+
+    pages = max(1, int(pages or 1))
+    limit = int(limit or 200)
+    sleep_sec = float(sleep_sec or 0.3)
+
+    for p in range(1, pages + 1):
+        page_url = LISTING_URL.format(page=p)
+        soup = html_to_soup(fetch_html(session, page_url))
+
+        page_urls: List[str] = []
+        for a in soup.select("a[href]"):
+            href = urljoin(page_url, (a.get("href") or "").split("#")[0].strip())
+            if not JOB_DETAIL_RE.match(href):
+                continue
+            if "jobsnepal.com" not in urlparse(href).netloc.lower():
+                continue
+            urls.append(href)
+            page_urls.append(href)
+
+        if len(urls) >= limit:
+            break
+
+        if known_streak.page(page_urls):
+            print(f"[JOBSNEPAL] {known_streak.streak} consecutive listing pages with only known jobs. Stopping early.")
+            break
+
+        time.sleep(sleep_sec)
+
+    seen = set()
+    out: List[str] = []
+    for u in urls:
+        if u not in seen:
+            seen.add(u)
+            out.append(u)
+
+    return out[:limit]
+
+
 # -------------------------
 # HELPERS
 # -------------------------
@@ -96,114 +181,73 @@ def _extract_job_id_from_url(url: str) -> Optional[str]:
     return m.group(1) if m else None
 
 
-def _get_text(driver, css: str) -> Optional[str]:
-    try:
-        return clean(driver.find_element(By.CSS_SELECTOR, css).text)
-    except Exception:
-        return None
-
-
-def _get_meta_content(driver, css: str) -> Optional[str]:
-    try:
-        el = driver.find_element(By.CSS_SELECTOR, css)
-        return clean(el.get_attribute("content"))
-    except Exception:
-        return None
-
-
-def _get_anchor_text_href(driver, css: str) -> Tuple[Optional[str], Optional[str]]:
-    try:
-        a = driver.find_element(By.CSS_SELECTOR, css)
-        t = clean(a.text)
-        href = (a.get_attribute("href") or "").strip()
-        if href:
-            href = urljoin(BASE, href)
-        return t, (href or None)
-    except Exception:
+def _get_anchor_text_href(soup, css: str) -> Tuple[Optional[str], Optional[str]]:
+    a = soup.select_one(css)
+    if a is None:
         return None, None
+    t = clean(soup_inner_text(a))
+    href = (a.get("href") or "").strip()
+    if href:
+        href = urljoin(BASE, href)
+    return t, (href or None)
 
 
 def _norm_label(s: str) -> str:
     return re.sub(r"\s+", " ", (s or "").strip().lower())
 
 
-def _parse_overview_table(driver) -> Dict[str, Optional[str]]:
+def _parse_overview_table(soup) -> Dict[str, Optional[str]]:
     out: Dict[str, Optional[str]] = {}
 
-    try:
-        rows = driver.find_elements(By.CSS_SELECTOR, "div.job-overview-inner table tr")
-    except Exception:
-        rows = []
-
-    for tr in rows:
-        try:
-            tds = tr.find_elements(By.CSS_SELECTOR, "td")
-            if len(tds) < 2:
-                continue
+    for tr in soup.select(OVERVIEW_ROWS_CSS):
+        tds = tr.select("td")
+        if len(tds) < 2:
+            continue
 
-            label = clean(tds[0].text) or ""
-            value_td = tds[1]
-            value_text = clean(value_td.text)
-            lab = _norm_label(label)
-            if not lab:
-                continue
+        label = clean(soup_inner_text(tds[0])) or ""
+        value_td = tds[1]
+        value_text = clean(soup_inner_text(value_td))
+        lab = _norm_label(label)
+        if not lab:
+            continue
 
-            out[lab] = value_text
+        out[lab] = value_text
 
+        if lab in {"category", "position type", "education"}:
+            spans = [clean(soup_inner_text(x)) for x in value_td.select(OVERVIEW_SPAN_CSS)]
+            joined = ", ".join([x for x in spans if x])
             if lab == "category":
-                spans = value_td.find_elements(By.CSS_SELECTOR, "span.font-weight-semibold")
-                cats = [clean(s.text) for s in spans if clean(s.text)]
-                out["categories"] = ", ".join(cats) if cats else value_text
-
+                out["categories"] = joined or value_text
             elif lab == "position type":
-                spans = value_td.find_elements(By.CSS_SELECTOR, "span.font-weight-semibold")
-                types = [clean(s.text) for s in spans if clean(s.text)]
-                out["employment_type"] = ", ".join(types) if types else value_text
-
-            elif lab == "position level":
-                out["position"] = value_text
-
-            elif lab == "salary":
-                out["salary_raw"] = value_text
+                out["employment_type"] = joined or value_text
+            else:
+                out["education"] = joined or value_text
 
-            elif lab == "posted date":
-                out["posted_date"] = value_text
+        elif lab == "position level":
+            out["position"] = value_text
 
-            elif lab == "city":
-                city = None
-                try:
-                    city = clean(value_td.find_element(By.CSS_SELECTOR, "[itemprop='addressLocality']").text)
-                except Exception:
-                    city = None
-                out["city"] = city or value_text
+        elif lab == "salary":
+            out["salary_raw"] = value_text
 
-            elif lab == "education":
-                spans = value_td.find_elements(By.CSS_SELECTOR, "span.font-weight-semibold")
-                edu = [clean(s.text) for s in spans if clean(s.text)]
-                out["education"] = ", ".join(edu) if edu else value_text
+        elif lab == "posted date":
+            out["posted_date"] = value_text
 
-        except Exception:
-            continue
+        elif lab == "city":
+            city_el = value_td.select_one(OVERVIEW_CITY_CSS)
+            city = clean(soup_inner_text(city_el)) if city_el is not None else None
+            out["city"] = city or value_text
 
     return out
 
 
-def _get_job_description_text(driver) -> str:
-    candidates = [
-        "#div-job-details",
-        "div#div-job-details span[itemprop='description']",
-        "div.job-details-by-emloyer",
-        "span[itemprop='description']",
-    ]
-
-    for css in candidates:
-        try:
-            el = driver.find_element(By.CSS_SELECTOR, css)
-            txt = clean(el.text)
-            if txt and len(txt) > 30:
-                return txt
-        except Exception:
-            pass
+def _get_job_description_text(soup) -> str:
+    for css in DESCRIPTION_CSS:
+        el = soup.select_one(css)
+        if el is None:
+            continue
+        txt = clean(soup_inner_text(el))
+        if txt and len(txt) > 30:
+            return txt
 
     return ""
 
@@ -330,39 +374,76 @@ def parse_job_detail(driver, url: str) -> Optional[Dict]:
     WebDriverWait(driver, 15).until(EC.presence_of_element_located((By.TAG_NAME, "body")))
     time.sleep(0.2)
 
-    desc_text = _get_job_description_text(driver)
-    ov = _parse_overview_table(driver)
+    return _parse_snapshot(snapshot_soup(driver), url)
 
-    job_id = _extract_job_id_from_url(url)
 
-    title = (
-        _get_text(driver, "div.job-details h1.job-title")
-        or _get_text(driver, "h1.job-title")
-        or _get_text(driver, "h1")
-    )
+def parse_job_detail_http(session, url: str) -> Optional[Dict]:
+    """
+    Same row as parse_job_detail, fetched with a plain HTTP session.
+    Raises RuntimeError("BLOCKED_OR_CHALLENGE") / RuntimeError("NEEDS_BROWSER")
+    when the page must be rendered by Chrome instead.
+    """
+    soup = html_to_soup(fetch_html(session, url))
+
+    page_title = clean(soup.title.get_text()) if soup.title else ""
+    if looks_like_challenge(page_title, soup_inner_text(soup.body)):
+        raise RuntimeError("BLOCKED_OR_CHALLENGE")
+    if soup.select_one("h1") is None and not soup.select(OVERVIEW_ROWS_CSS):
+        # client-rendered shell, nothing to parse without JS
+        raise RuntimeError("NEEDS_BROWSER")
+
+    return _parse_snapshot(soup, url)
+
 
-    company = _get_text(driver, ".company-info .company-title")
+def _parse_snapshot(soup, url: str) -> Dict:
+    """
+    All field extraction runs on the in-process tree (HTTP HTML or a single
+    driver.page_source snapshot), never through per-field WebDriver calls.
+    """
+    desc_text = _get_job_description_text(soup)
+    ov = _parse_overview_table(soup)
+
+    title = soup_pick_text(soup, TITLE_CSS)
+
+    company = soup_pick_text(soup, [COMPANY_TITLE_CSS])
     company_link = None
 
     if not company:
-        company, company_link = _get_anchor_text_href(driver, "h3.job-company a[href]")
+        company, company_link = _get_anchor_text_href(soup, COMPANY_ANCHOR_CSS)
 
     if not company_link:
-        _, company_link = _get_anchor_text_href(driver, "a[href^='employer/'], a[href*='/employer/']")
+        _, company_link = _get_anchor_text_href(soup, EMPLOYER_ANCHOR_CSS)
+
+    meta = soup.select_one(DATE_POSTED_META_CSS)
+    posted_meta = clean(meta.get("content")) if meta is not None else None
+
+    return _build_row(url, desc_text, ov, title, company, company_link, posted_meta)
+
+
+def _build_row(
+    url: str,
+    desc_text: str,
+    ov: Dict[str, Optional[str]],
+    title: Optional[str],
+    company: Optional[str],
+    company_link: Optional[str],
+    posted_meta: Optional[str],
+) -> Dict:
+    job_id = _extract_job_id_from_url(url)
 
     categories = ov.get("categories")
     location = ov.get("city")
 
     # ✅ Country: JobsNepal is Nepal-focused. Always default Nepal.
-    # Only override if infer_country confidently returns something else.
-    inferred = infer_country(location or "", default="Nepal")
+    # Only override if the location names another country.
+    inferred = infer_country(location or "", default="Nepal", stated_only=True)
     country = inferred or "Nepal"
 
     employment_type = ov.get("employment_type")
     position = ov.get("position")
     salary_raw = ov.get("salary_raw")
 
-    posted_date = _get_meta_content(driver, "meta[itemprop='datePosted']") or ov.get("posted_date")
+    posted_date = posted_meta or ov.get("posted_date")
 
     combined_for_mode = " ".join([desc_text or "", location or ""]).strip()
     work_mode = infer_work_mode(combined_for_mode)
@@ -375,13 +456,13 @@ def parse_job_detail(driver, url: str) -> Optional[Dict]:
     typ = employment_type
 
     tax = categorize_role_taxonomy(
-    title=title or "",
-    skills=skills or "",
-    position=position or "",
-    employment_type=employment_type or "",
-    description=desc_text or "",
-    industry=categories or "",
-)
+        title=title or "",
+        skills=skills or "",
+        position=position or "",
+        employment_type=employment_type or "",
+        description=desc_text or "",
+        industry=categories or "",
+    )
 
     return {
         "job_id": clean_or_non(job_id, default="Non"),
@@ -3,15 +3,16 @@ from __future__ import annotations
 
 import time
 import re
+import random
 import logging
-from typing import List, Dict, Optional, Tuple
-from urllib.parse import quote_plus
+import statistics
+from typing import Callable, Iterator, List, Dict, Optional, Set, Tuple
+from urllib.parse import quote_plus, urljoin
 
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.common.exceptions import (
     TimeoutException,
-    StaleElementReferenceException,
     InvalidSessionIdException,
     WebDriverException,
 )
@@ -24,11 +25,17 @@ from scraper_core import (
     classify_it_non_it,
     categorize_role_taxonomy, 
     make_linkedin_driver,  # ✅ ADD THIS
+    KnownPageStreak,
+    driver_command_count,
+    snapshot_soup,
+    soup_inner_text,
+    soup_pick_text,
 )
 
 logger = logging.getLogger("linkedin")
 
 WAIT_TIMEOUT = 25
+BASE_URL = "https://www.linkedin.com"
 
 # -------------------------
 # IMPORTANT: Persistent Chrome profile (keeps you logged in)
@@ -84,6 +91,97 @@ ABOUT_JOB_MT4_SELECTORS = [
 
 SKILLS_HEADER_SELECTOR = "h3.js-skills-header"
 
+POPUP_DISMISS_SELECTORS = [
+    "button.modal__dismiss",
+    "button.artdeco-modal__dismiss",
+    "button[aria-label='Dismiss']",
+    "button[aria-label='Close']",
+    "button[aria-label='Close dialog']",
+]
+
+# -------------------------
+# Readiness waits (in-page MutationObserver, one execute_async_script each)
+# -------------------------
+# Every wait resolves on a DOM change instead of sleeping a fixed time:
+#   ANY_SELECTOR_JS   first of `selectors` present                 -> selector | null (timeout)
+#   DETAIL_FOR_JOB_JS detail pane shows the clicked job id         -> "ready" | "authwall" | "timeout"
+#                     (a link / data-job-id for that id inside the pane, then the
+#                     description block or a short quiet period for lazy sections)
+#   LIST_SETTLE_JS    after a scroll: cards mounted, then quiet     -> "changed" | "idle"
+ANY_SELECTOR_JS = """
+const [selectors, timeoutMs, done] = arguments;
+const hit = () => selectors.find(s => document.querySelector(s)) || null;
+let found = hit();
+if (found) return done(found);
+const obs = new MutationObserver(() => {
+  found = hit();
+  if (found) { obs.disconnect(); clearTimeout(timer); done(found); }
+});
+obs.observe(document.documentElement, {childList: true, subtree: true});
+const timer = setTimeout(() => { obs.disconnect(); done(null); }, timeoutMs);
+"""
+
+DETAIL_FOR_JOB_JS = """
+const [jobId, paneSelectors, contentSelectors, quietMs, timeoutMs, done] = arguments;
+const authwall = () => /authwall|\\/login|checkpoint/.test(location.href.toLowerCase());
+const shows = () => {
+  for (const s of paneSelectors) {
+    const pane = document.querySelector(s);
+    if (pane && (pane.querySelector(`a[href*="/jobs/view/${jobId}"]`) || pane.querySelector(`[data-job-id="${jobId}"]`))) return true;
+  }
+  return false;
+};
+const stale = new Set(contentSelectors.map(s => document.querySelector(s)).filter(Boolean));  // previous job's
+const complete = () => contentSelectors.some(s => { const el = document.querySelector(s); return el && !stale.has(el); });
+let finished = false, quiet = null, timer = null, shownAt = null;
+const finish = (v) => { if (finished) return; finished = true; obs.disconnect(); clearTimeout(quiet); clearTimeout(timer); done(v); };
+const check = () => {
+  if (authwall()) return finish("authwall");
+  if (!shows()) return;
+  shownAt = shownAt || Date.now();
+  if (complete() || Date.now() - shownAt > 4 * quietMs) return finish("ready");
+  clearTimeout(quiet);
+  quiet = setTimeout(() => finish("ready"), quietMs);  // no description block: ready once the pane stops changing
+};
+const obs = new MutationObserver(check);
+obs.observe(document.documentElement, {childList: true, subtree: true, attributes: true, attributeFilter: ["href", "data-job-id"]});
+timer = setTimeout(() => finish(shows() ? "ready" : "timeout"), timeoutMs);
+check();
+"""
+
+LIST_SETTLE_JS = """
+const [container, quietMs, growMs, done] = arguments;
+let finished = false, changed = false, quiet = null;
+const finish = () => {
+  if (finished) return;
+  finished = true; obs.disconnect(); clearTimeout(quiet); clearTimeout(idle); clearTimeout(cap);
+  done(changed ? "changed" : "idle");
+};
+const obs = new MutationObserver(() => {
+  changed = true;
+  clearTimeout(quiet);
+  quiet = setTimeout(finish, quietMs);
+});
+obs.observe(container || document.documentElement, {childList: true, subtree: true});
+const idle = setTimeout(() => { if (!changed) finish(); }, growMs);
+const cap = setTimeout(finish, growMs * 2);  // a list that never stops changing
+"""
+
+CLOSE_POPUPS_JS = """
+let n = 0;
+for (const s of arguments[0]) {
+  for (const b of Array.from(document.querySelectorAll(s)).slice(0, 3)) {
+    if (b.offsetParent !== null && !b.disabled) { try { b.click(); n++; } catch (e) {} }
+  }
+}
+return n;
+"""
+
+DETAIL_QUIET_MS = 300   # detail pane without a description block: ready after this long without changes
+LIST_QUIET_MS = 250     # scrolled list: cards done mounting after this long without changes
+LIST_GROW_MS = 2500     # scrolled list: nothing mounted within this => no more cards right now
+LIST_IDLE_SCROLLS = 3   # consecutive idle scrolls without new job ids => end of the list
+
 
 # ============================================================
 # NEW: Multi-country listing URL builder (country geoId-based)
@@ -102,24 +200,11 @@ def build_listing_url(country: str, geo_id: str, start: int = 0) -> str:
 # Popup close
 # -------------------------
 def _close_popups(driver) -> None:
-    selectors = [
-        "button.modal__dismiss",
-        "button.artdeco-modal__dismiss",
-        "button[aria-label='Dismiss']",
-        "button[aria-label='Close']",
-        "button[aria-label='Close dialog']",
-    ]
-    for sel in selectors:
-        try:
-            for b in driver.find_elements(By.CSS_SELECTOR, sel)[:3]:
-                try:
-                    if b.is_displayed() and b.is_enabled():
-                        b.click()
-                        time.sleep(0.15)
-                except Exception:
-                    pass
-        except Exception:
-            pass
+    # one round trip: every visible dismiss button clicked in-page
+    try:
+        driver.execute_script(CLOSE_POPUPS_JS, POPUP_DISMISS_SELECTORS)
+    except Exception:
+        pass
 
 
 # -------------------------
@@ -173,8 +258,7 @@ def _maybe_prompt_login_if_needed(driver) -> None:
 # -------------------------
 def _safe_click(driver, el) -> bool:
     try:
-        driver.execute_script("arguments[0].scrollIntoView({block:'center'});", el)
-        time.sleep(0.15)
+        driver.execute_script("arguments[0].scrollIntoView({block:'center', behavior:'instant'});", el)
         el.click()
         return True
     except Exception:
@@ -185,30 +269,64 @@ def _safe_click(driver, el) -> bool:
             return False
 
 
+def _async_script(driver, script: str, *args):
+    # every readiness script resolves itself before its own timeout; this is only the safety net
+    if not getattr(driver, "_readiness_timeout_set", False):
+        driver.set_script_timeout(WAIT_TIMEOUT + 10)
+        driver._readiness_timeout_set = True
+    return driver.execute_async_script(script, *args)
+
+
 def _wait_for_any(driver, selectors: List[str], timeout: int = WAIT_TIMEOUT) -> Optional[str]:
     end = time.time() + timeout
     while time.time() < end:
-        for sel in selectors:
-            try:
-                if driver.find_elements(By.CSS_SELECTOR, sel):
-                    return sel
-            except Exception:
-                pass
-        time.sleep(0.2)
+        try:
+            found = _async_script(driver, ANY_SELECTOR_JS, selectors, int((end - time.time()) * 1000))
+        except WebDriverException:
+            # page navigated mid-wait (script unloaded) or the session died
+            if not _driver_alive(driver):
+                break
+            time.sleep(0.2)
+            continue
+        if found:
+            return found
+        break
     raise TimeoutException(f"Timeout waiting for any of: {selectors}")
 
 
-def _find_first(driver, selectors: List[str]):
-    for sel in selectors:
-        for _ in range(3):
-            try:
-                return driver.find_element(By.CSS_SELECTOR, sel)
-            except StaleElementReferenceException:
-                time.sleep(0.2)
-                continue
-            except Exception:
-                break
-    return None
+def _wait_detail_for_job(driver, job_id: str, timeout: int = WAIT_TIMEOUT) -> str:
+    """
+    After clicking a card: wait until the detail pane shows that job id.
+    Returns "ready", "authwall" or "timeout".
+    """
+    try:
+        state = _async_script(
+            driver, DETAIL_FOR_JOB_JS, job_id, DETAIL_READY_SELECTORS, ABOUT_JOB_MT4_SELECTORS,
+            DETAIL_QUIET_MS, int(timeout * 1000),
+        )
+    except WebDriverException:
+        state = None
+    if state in ("ready", "authwall"):
+        return state
+    return "authwall" if _is_on_authwall(driver) else "timeout"
+
+
+def _wait_list_settle(driver, container) -> str:
+    """
+    After a scroll: "changed" once newly mounted cards stop changing, "idle" if nothing mounted.
+    """
+    try:
+        return _async_script(driver, LIST_SETTLE_JS, container, LIST_QUIET_MS, LIST_GROW_MS) or "idle"
+    except WebDriverException:
+        time.sleep(0.9)  # the old fixed step
+        return "changed"
+
+
+def _jitter_pause(bounds) -> None:
+    # optional politeness policy (ScrapeConfig.linkedin_jitter_sec); never needed for readiness
+    lo, hi = (tuple(float(x) for x in (bounds or ())) + (0.0, 0.0))[:2]
+    if hi > 0:
+        time.sleep(random.uniform(lo, max(lo, hi)))
 
 
 def _find_all_first_match(driver, selectors: List[str]):
@@ -222,38 +340,23 @@ def _find_all_first_match(driver, selectors: List[str]):
     return []
 
 
-def _get_text_from_any(driver, selectors: List[str]) -> Optional[str]:
-    for _ in range(3):
+def _select_first(soup, selectors: List[str]):
+    for sel in selectors:
         try:
-            el = _find_first(driver, selectors)
-            return clean(el.text) if el else None
-        except StaleElementReferenceException:
-            time.sleep(0.2)
-            continue
+            el = soup.select_one(sel)
         except Exception:
-            return None
+            continue
+        if el is not None:
+            return el
     return None
 
 
-def _get_anchor_text_href_from_any(driver, selectors: List[str]) -> Tuple[Optional[str], Optional[str]]:
-    """
-    Stale-safe: LinkedIn rerenders the top card, so element handles go stale.
-    Retry by re-finding and re-reading.
-    """
-    for _ in range(4):
-        try:
-            el = _find_first(driver, selectors)
-            if not el:
-                return None, None
-            txt = clean(el.text)
-            href = el.get_attribute("href") or None
-            return txt, href
-        except StaleElementReferenceException:
-            time.sleep(0.25)
-            continue
-        except Exception:
-            return None, None
-    return None, None
+def _get_anchor_text_href(soup, selectors: List[str]) -> Tuple[Optional[str], Optional[str]]:
+    el = _select_first(soup, selectors)
+    if el is None:
+        return None, None
+    href = (el.get("href") or "").strip()
+    return clean(soup_inner_text(el)), (urljoin(BASE_URL, href) if href else None)
 
 
 def _get_left_scroll_container(driver):
@@ -295,7 +398,7 @@ def _extract_job_id_from_card(card) -> Optional[str]:
 def _scroll_left_results_until_loaded(driver, target=25, timeout=55):
     """
     Scroll LEFT results pane until target unique job ids are mounted in DOM
-    (LinkedIn virtualizes job cards).
+    (LinkedIn virtualizes job cards). Each scroll waits for the list to settle, not a fixed delay.
     """
     end = time.time() + timeout
     container = _get_left_scroll_container(driver)
@@ -303,6 +406,7 @@ def _scroll_left_results_until_loaded(driver, target=25, timeout=55):
     seen = set()
     last_count = 0
     stable_loops = 0
+    settle = "changed"
 
     while time.time() < end:
         _close_popups(driver)
@@ -323,7 +427,8 @@ def _scroll_left_results_until_loaded(driver, target=25, timeout=55):
             stable_loops = 0
             last_count = len(seen)
 
-        if stable_loops >= 12:
+        # card count stopped growing: idle scrolls end it quickly, a busy list gets the old bound
+        if (settle == "idle" and stable_loops >= LIST_IDLE_SCROLLS) or stable_loops >= 12:
             return cards
 
         try:
@@ -334,7 +439,7 @@ def _scroll_left_results_until_loaded(driver, target=25, timeout=55):
         except Exception:
             pass
 
-        time.sleep(0.9)
+        settle = _wait_list_settle(driver, container)
 
     return _find_all_first_match(driver, JOB_CARD_SELECTORS)
 
@@ -401,13 +506,12 @@ def _parse_optional_kv(text_block: str) -> Dict[str, Optional[str]]:
     return kv
 
 
-def _extract_skills(driver) -> Optional[str]:
-    try:
-        header = driver.find_element(By.CSS_SELECTOR, SKILLS_HEADER_SELECTOR)
-        p = header.find_element(By.XPATH, "following::p[1]")
-        return clean(p.text)
-    except Exception:
+def _extract_skills(soup) -> Optional[str]:
+    header = soup.select_one(SKILLS_HEADER_SELECTOR)
+    if header is None:
         return None
+    p = header.find_next("p")
+    return clean(soup_inner_text(p)) if p is not None else None
 
 
 def _driver_alive(driver) -> bool:
@@ -456,18 +560,28 @@ def _open(driver, url: str, attempts: int = 3):
 # ============================================================
 # MAIN ENTRY (CALLED BY run_pipeline.py rows mode)
 # ============================================================
-def linkedin_parse(config) -> List[Dict]:
+def linkedin_parse(
+    config,
+    skip_key: Optional[Callable[[str], bool]] = None,
+    known_keys: Optional[Set[str]] = None,
+    stop_after_known_pages: int = 0,
+) -> Iterator[Dict]:
     """
-    Multi-country LinkedIn scraper.
+    Multi-country LinkedIn scraper. Yields each row as soon as it is extracted,
+    so the caller can save while the crawl goes on (close() the generator to quit Chrome early).
     - Loops over config.linkedin_targets
     - Adds `country` column for every row
+    - skip_key(job_id) -> True skips the card before clicking (already stored + fresh)
+    - stops a country's pagination after `stop_after_known_pages` pages of only known job ids
     """
-    rows: List[Dict] = []
+    n_rows = 0
     seen_ids = set()
+    job_secs: List[float] = []   # card click -> row extracted
 
     pages = int(getattr(config, "pages", 1) or 1)
     limit = int(getattr(config, "limit", 60) or 60)
     page_size = int(getattr(config, "linkedin_page_size", 25) or 25)
+    jitter = getattr(config, "linkedin_jitter_sec", None)
 
     # NEW: multi-country targets (list of dicts with country + geoId)
     targets = list(getattr(config, "linkedin_targets", []) or [])
@@ -485,11 +599,11 @@ def linkedin_parse(config) -> List[Dict]:
         # Ensure logged in
         ok, driver = _open(driver, "https://www.linkedin.com/jobs/", attempts=3)
         if not ok:
-            return rows
+            return
         _maybe_prompt_login_if_needed(driver)
 
         for t in targets:
-            if limit and len(rows) >= limit:
+            if limit and n_rows >= limit:
                 break
 
             country = str(t.get("country", "")).strip() or "Unknown"
@@ -499,9 +613,10 @@ def linkedin_parse(config) -> List[Dict]:
                 continue
 
             logger.info(f"\n🌍 TARGET: {country} | geoId={geo_id}")
+            known_streak = KnownPageStreak(known_keys, stop_after_known_pages)
 
             for page_index in range(1, pages + 1):
-                if limit and len(rows) >= limit:
+                if limit and n_rows >= limit:
                     break
 
                 start = (page_index - 1) * page_size
@@ -526,19 +641,26 @@ def linkedin_parse(config) -> List[Dict]:
                 if not cards:
                     break
 
+                page_ids: List[str] = []
+
                 for card in cards:
-                    if limit and len(rows) >= limit:
+                    if limit and n_rows >= limit:
                         break
 
+                    cmds_before = driver_command_count(driver)
                     _close_popups(driver)
 
                     job_id = _extract_job_id_from_card(card)
                     if not job_id:
                         continue
+                    page_ids.append(job_id)
                     if job_id in seen_ids:
                         continue
                     seen_ids.add(job_id)
 
+                    if skip_key and skip_key(job_id):
+                        continue
+
                     link = None
                     for sel in JOB_LINK_SELECTORS:
                         try:
@@ -549,48 +671,43 @@ def linkedin_parse(config) -> List[Dict]:
                     if not link:
                         continue
 
+                    t_job = time.perf_counter()
                     if not _safe_click(driver, link):
                         continue
 
-                    time.sleep(1.2)
-                    _close_popups(driver)
-
-                    if _is_on_authwall(driver):
+                    state = _wait_detail_for_job(driver, job_id)
+                    if state == "authwall":
                         logger.warning(f"[{country}] authwall appeared after click")
                         _maybe_prompt_login_if_needed(driver)
                         continue
-
-                    try:
-                        _wait_for_any(driver, DETAIL_READY_SELECTORS, timeout=WAIT_TIMEOUT)
-                    except TimeoutException:
+                    if state != "ready":
+                        logger.warning(f"[{country}] detail pane never showed job_id={job_id}")
                         continue
 
-                    time.sleep(0.6)
+                    # one round trip: detail pane -> in-process tree, all selectors run locally
+                    detail = snapshot_soup(driver, DETAIL_READY_SELECTORS)
 
-                    title = _get_text_from_any(driver, TITLE_SELECTORS)
-                    company, company_link = _get_anchor_text_href_from_any(driver, COMPANY_SELECTORS)
+                    title = soup_pick_text(detail, TITLE_SELECTORS)
+                    company, company_link = _get_anchor_text_href(detail, COMPANY_SELECTORS)
 
-                    tertiary_text = _get_text_from_any(driver, TERTIARY_SELECTORS) or ""
+                    tertiary_text = soup_pick_text(detail, TERTIARY_SELECTORS) or ""
                     location, posted_date, num_applicants = _parse_tertiary(tertiary_text)
 
-                    pref_texts: List[str] = []
-                    try:
-                        strongs = driver.find_elements(By.CSS_SELECTOR, PREF_STRONG_SELECTOR)
-                        pref_texts = [clean(s.text) for s in strongs if clean(s.text)]
-                    except Exception:
-                        pass
+                    pref_texts = [clean(soup_inner_text(s)) for s in detail.select(PREF_STRONG_SELECTOR)]
+                    pref_texts = [p for p in pref_texts if p]
                     work_mode, employment_type = _parse_prefs(pref_texts)
 
                     position = typ = compensation = commitment = None
-                    mt4 = _find_first(driver, ABOUT_JOB_MT4_SELECTORS)
-                    if mt4:
-                        kv = _parse_optional_kv(mt4.text)
+                    mt4 = _select_first(detail, ABOUT_JOB_MT4_SELECTORS)
+                    mt4_text = soup_inner_text(mt4) if mt4 is not None else ""
+                    if mt4 is not None:
+                        kv = _parse_optional_kv(mt4_text)
                         position = kv.get("position")
                         typ = kv.get("type")
                         compensation = kv.get("compensation")
                         commitment = kv.get("commitment")
 
-                    skills = _extract_skills(driver)
+                    skills = _extract_skills(detail)
 
                     category_primary = classify_it_non_it(
                         designation=title or "",
@@ -602,10 +719,7 @@ def linkedin_parse(config) -> List[Dict]:
 
 
                     # Build a better description signal for taxonomy
-                    desc_text = ""
-                    mt4 = _find_first(driver, ABOUT_JOB_MT4_SELECTORS)
-                    if mt4:
-                        desc_text = clean(mt4.text)
+                    desc_text = clean(mt4_text) or ""
 
                     tax = categorize_role_taxonomy(
                         title=title or "",
@@ -616,13 +730,13 @@ def linkedin_parse(config) -> List[Dict]:
                         industry="",
                     )
 
-                    rows.append({
+                    row = {
                         "job_id": job_id,
                         "title": title,
                         "company": company,
                         "company_link": company_link,
                         "location": location,
-                        "country": country,  # ✅ NEW COLUMN
+                        "country": infer_country(location, default=country),  # search target when the location is vague
                         "posted_date": posted_date,
                         "num_applicants": num_applicants,
                         "work_mode": work_mode,
@@ -640,16 +754,31 @@ def linkedin_parse(config) -> List[Dict]:
                         "job_url": job_url,
                         "source": "linkedin",
                         "scraped_at": now_iso(),
-                    })
+                    }
 
-                    logger.info(f"[{country}] appended job_id={job_id} rows={len(rows)}")
+                    n_rows += 1
+                    job_secs.append(time.perf_counter() - t_job)
+                    logger.info(
+                        f"[{country}] extracted job_id={job_id} rows={n_rows} "
+                        f"webdriver_cmds={driver_command_count(driver) - cmds_before} sec={job_secs[-1]:.2f}"
+                    )
+                    yield row
+                    _jitter_pause(jitter)
+
+                if known_streak.page(page_ids):
+                    logger.info(f"[{country}] {known_streak.streak} consecutive pages with only known jobs. Stopping early.")
+                    break
 
                 # small pacing between pages/countries reduces blocks
                 time.sleep(1.0)
 
-        return rows
-
     finally:
+        if job_secs:
+            ordered = sorted(job_secs)
+            logger.info(
+                f"Per-job latency (click -> row): n={len(ordered)} mean={statistics.mean(ordered):.2f}s "
+                f"p50={ordered[len(ordered) // 2]:.2f}s p90={ordered[int(len(ordered) * 0.9)]:.2f}s"
+            )
         try:
             driver.quit()
         except Exception:
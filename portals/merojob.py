@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import re
 import time
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Set
 
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
@@ -20,11 +20,26 @@ from scraper_core import (
     infer_country,
     classify_it_non_it,
     categorize_role_taxonomy,   # ✅ ADD THIS
+    KnownPageStreak,
+    fetch_html,
+    html_to_soup,
+    looks_like_challenge,
+    snapshot_soup,
+    soup_inner_text,
+    soup_pick_attr,
+    soup_pick_text,
 )
 
 BASE = "https://merojob.com"
 SEARCH = f"{BASE}/search"
 
+LISTING_LINK_CSS = 'h3 a[href^="/"]'
+COMPANY_CSS = ['a[href*="/employer/"]']
+LOCATION_CSS = [
+    '[data-sentry-component="JobHeader"] span',
+    "span.text-muted",
+]
+
 
 # -------------------------
 # Driver health + safe navigation
@@ -53,15 +68,15 @@ def _safe_get(driver, url: str, timeout: int = 30) -> None:
         except Exception:
             pass
 
-        # detect common block pages
-        title = (driver.title or "").lower()
-        body_text = ""
+        # detect common block pages (title + body text in one round trip)
         try:
-            body_text = (driver.find_element(By.TAG_NAME, "body").text or "").lower()
+            title, body_text = driver.execute_script(
+                "return [document.title || '', document.body ? document.body.innerText : ''];"
+            )
         except Exception:
-            body_text = ""
+            title, body_text = "", ""
 
-        if ("attention required" in title) or ("cloudflare" in title) or ("verify you are human" in body_text):
+        if looks_like_challenge(title, body_text):
             raise RuntimeError("BLOCKED_OR_CHALLENGE")
 
     except (InvalidSessionIdException, WebDriverException) as e:
@@ -89,30 +104,6 @@ def _text_after_label(full_text: str, label: str) -> Optional[str]:
     return clean(m.group(1)) if m else None
 
 
-def _pick_text(driver, css_list: List[str]) -> Optional[str]:
-    for sel in css_list:
-        try:
-            el = driver.find_element(By.CSS_SELECTOR, sel)
-            t = clean(el.text)
-            if t:
-                return t
-        except Exception:
-            continue
-    return None
-
-
-def _pick_attr(driver, css_list: List[str], attr: str) -> Optional[str]:
-    for sel in css_list:
-        try:
-            el = driver.find_element(By.CSS_SELECTOR, sel)
-            v = clean(el.get_attribute(attr))
-            if v:
-                return v
-        except Exception:
-            continue
-    return None
-
-
 # -------------------------
 # 1) COLLECT URLS (List page)
 # -------------------------
@@ -122,6 +113,8 @@ def collect_job_urls(
     limit: int = 200,
     per_page: int = 6,
     sleep_sec: float = 0.5,
+    known_keys: Optional[Set[str]] = None,
+    stop_after_known_pages: int = 0,
 ) -> List[str]:
     pages = max(1, int(pages or 1))
     limit = int(limit or 200)
@@ -130,6 +123,7 @@ def collect_job_urls(
 
     urls: List[str] = []
     seen = set()
+    known_streak = KnownPageStreak(known_keys, stop_after_known_pages)
 
     for page in range(1, pages + 1):
         page_url = f"{SEARCH}?limit={per_page}&offset={page}"
@@ -139,7 +133,7 @@ def collect_job_urls(
 
         try:
             WebDriverWait(driver, 25).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, 'h3 a[href^="/"]'))
+                EC.presence_of_element_located((By.CSS_SELECTOR, LISTING_LINK_CSS))
             )
         except TimeoutException:
             print("[MEROJOB] No job links found (timeout). Skipping page.")
@@ -147,7 +141,8 @@ def collect_job_urls(
                 time.sleep(sleep_sec)
             continue
 
-        a_tags = driver.find_elements(By.CSS_SELECTOR, 'h3 a[href^="/"]')
+        a_tags = driver.find_elements(By.CSS_SELECTOR, LISTING_LINK_CSS)
+        page_urls: List[str] = []
 
         for a in a_tags:
             href = (a.get_attribute("href") or "").strip()
@@ -159,6 +154,8 @@ def collect_job_urls(
                 continue
 
             u = _abs_url(href.replace(BASE, "")) if href.startswith(BASE) else _abs_url(href)
+            if u:
+                page_urls.append(u)
             if u and u not in seen:
                 seen.add(u)
                 urls.append(u)
@@ -169,6 +166,68 @@ def collect_job_urls(
         if len(urls) >= limit:
             break
 
+        if known_streak.page(page_urls):
+            print(f"[MEROJOB] {known_streak.streak} consecutive listing pages with only known jobs. Stopping early.")
+            break
+
+        if sleep_sec:
+            time.sleep(sleep_sec)
+
+    return urls
+
+
+def collect_job_urls_http(
+    session,
+    pages: int = 1,
+    limit: int = 200,
+    per_page: int = 6,
+    sleep_sec: float = 0.5,
+    known_keys: Optional[Set[str]] = None,
+    stop_after_known_pages: int = 0,
+) -> List[str]:
+    """
+    Listing pages over plain HTTP. Returns [] when the listing is not
+    server-rendered so the caller can fall back to collect_job_urls.
+    """
+    pages = max(1, int(pages or 1))
+    limit = int(limit or 200)
+    per_page = int(per_page or 6)
+    sleep_sec = float(sleep_sec or 0.0)
+
+    urls: List[str] = []
+    seen = set()
+    known_streak = KnownPageStreak(known_keys, stop_after_known_pages)
+
+    for page in range(1, pages + 1):
+        page_url = f"{SEARCH}?limit={per_page}&offset={page}"
+        print(f"[MEROJOB] Collecting page {page}/{pages} (http): {page_url}")
+
+        soup = html_to_soup(fetch_html(session, page_url))
+
+        page_urls: List[str] = []
+
+        for a in soup.select(LISTING_LINK_CSS):
+            href = (a.get("href") or "").strip()
+            if not href or "/employer/" in href or "/search" in href:
+                continue
+
+            u = _abs_url(href)
+            if u:
+                page_urls.append(u)
+            if u and u not in seen:
+                seen.add(u)
+                urls.append(u)
+
+            if len(urls) >= limit:
+                break
+
+        if len(urls) >= limit:
+            break
+
+        if known_streak.page(page_urls):
+            print(f"[MEROJOB] {known_streak.streak} consecutive listing pages with only known jobs. Stopping early.")
+            break
+
         if sleep_sec:
             time.sleep(sleep_sec)
 
@@ -194,27 +253,64 @@ def parse_job_detail(driver, job_url: str) -> Optional[Dict]:
         print("[MEROJOB] h1 not found (timeout). Skipping.")
         return None
 
-    try:
-        page_text = driver.find_element(By.TAG_NAME, "body").text or ""
-    except Exception:
-        page_text = ""
+    return _parse_snapshot(snapshot_soup(driver), job_url)
+
+
+def parse_job_detail_http(session, job_url: str) -> Optional[Dict]:
+    """
+    Same row as parse_job_detail, fetched with a plain HTTP session.
+    Raises RuntimeError("BLOCKED_OR_CHALLENGE") / RuntimeError("NEEDS_BROWSER")
+    when the page must be rendered by Chrome instead.
+    """
+    job_url = (job_url or "").strip()
+    if not job_url:
+        return None
+
+    print(f"[MEROJOB] Parsing (http): {job_url}")
+    soup = html_to_soup(fetch_html(session, job_url))
+
+    page_title = clean(soup.title.get_text()) if soup.title else ""
+    if looks_like_challenge(page_title, soup_inner_text(soup.body)):
+        raise RuntimeError("BLOCKED_OR_CHALLENGE")
+    if soup.select_one("h1") is None:
+        # client-rendered shell, nothing to parse without JS
+        raise RuntimeError("NEEDS_BROWSER")
+
+    return _parse_snapshot(soup, job_url)
+
+
+def _parse_snapshot(soup, job_url: str) -> Dict:
+    """
+    All field extraction runs on the in-process tree (HTTP HTML or a single
+    driver.page_source snapshot), never through per-field WebDriver calls.
+    """
+    page_text = soup_inner_text(soup.body)
+
+    title = soup_pick_text(soup, ["h1"])
+
+    company_link = soup_pick_attr(soup, COMPANY_CSS, "href")
+    company = soup_pick_text(soup, COMPANY_CSS)
+    location = soup_pick_text(soup, LOCATION_CSS)
+
+    return _build_row(job_url, page_text, title, company, company_link, location)
 
-    title = _pick_text(driver, ["h1"])
 
+def _build_row(
+    job_url: str,
+    page_text: str,
+    title: Optional[str],
+    company: Optional[str],
+    company_link: Optional[str],
+    location: Optional[str],
+) -> Dict:
     posted_date = _text_after_label(page_text, "Published on:")
 
-    company_link = _pick_attr(driver, ['a[href*="/employer/"]'], "href")
     if company_link and company_link.startswith("/"):
         company_link = BASE + company_link
 
-    company = _pick_text(driver, ['a[href*="/employer/"]'])
     if company:
         company = clean(company.split("\n")[0])
 
-    location = _pick_text(driver, [
-        '[data-sentry-component="JobHeader"] span',
-        "span.text-muted",
-    ])
     if not location:
         for pat in [
             r"\bJob Location\s*:\s*([^\n]+)",
@@ -227,7 +323,7 @@ def parse_job_detail(driver, job_url: str) -> Optional[Dict]:
                 break
 
     # ✅ FIX 1: Always safe country (never empty)
-    country = infer_country(location or "", default="Nepal") or "Nepal"
+    country = infer_country(location or "", default="Nepal", stated_only=True) or "Nepal"
 
     employment_type = None
     for k in ["Full Time", "Part Time", "Contract", "Internship", "Freelance"]:
@@ -6,25 +6,44 @@ import time
 import shutil
 import argparse
 import logging
-import subprocess
-import sys
 from logging.handlers import RotatingFileHandler
-from typing import Callable, Dict, Optional, Set, List
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, Optional, Set, List, Tuple
 
+import numpy as np
 import pandas as pd
 
 from config import CONFIG
-from scraper_core import make_fast_driver
+from driver_pool import DriverPool, HostThrottle
+from job_store import JobStore
+from key_index import KeyIndex
+from write_behind import WriteBehind
+from scraper_core import driver_command_count, effective_block_patterns, make_fast_driver, make_http_session
 
 # Portal modules
-from portals.merojob import collect_job_urls as mero_collect, parse_job_detail as mero_parse
-from portals.jobsnepal import collect_job_urls as jobs_collect, parse_job_detail as jobs_parse
+from portals.merojob import (
+    collect_job_urls as mero_collect,
+    collect_job_urls_http as mero_collect_http,
+    parse_job_detail as mero_parse,
+    parse_job_detail_http as mero_parse_http,
+)
+from portals.jobsnepal import (
+    collect_job_urls as jobs_collect,
+    collect_job_urls_http as jobs_collect_http,
+    parse_job_detail as jobs_parse,
+    parse_job_detail_http as jobs_parse_http,
+)
 from portals.linkedin import linkedin_parse
+from analysis.post_cycle import run_post_cycle
 
 
+# http mode: plain requests + HTML parsing; "collect"/"parse" (Selenium) are
+# only used as a fallback for challenge pages or JS-only pages.
 PORTALS = {
     "merojob": {
-        "mode": "selenium",
+        "mode": "http",
+        "collect_http": mero_collect_http,
+        "parse_http": mero_parse_http,
         "collect": mero_collect,
         "parse": mero_parse,
         "pages": CONFIG.pages,
@@ -34,7 +53,9 @@ PORTALS = {
         "autosave_every": 5,          
     },
     "jobsnepal": {
-        "mode": "selenium",
+        "mode": "http",
+        "collect_http": jobs_collect_http,
+        "parse_http": jobs_parse_http,
         "collect": jobs_collect,
         "parse": jobs_parse,
         "pages": CONFIG.pages,
@@ -50,6 +71,9 @@ PORTALS = {
     },
 }
 
+# parse_http errors that mean "this page needs a real browser"
+HTTP_FALLBACK_ERRORS = {"BLOCKED_OR_CHALLENGE", "NEEDS_BROWSER"}
+
 # =========================
 # Logging
 # =========================
@@ -89,55 +113,29 @@ def setup_logger(name: str) -> logging.Logger:
 # =========================
 def run_post_cycle_tasks(logger: logging.Logger) -> None:
     """
-    After scraping + UPSERT:
-    1) Build master dataset (usually jobs_master.csv/xlsx)
-    2) Recompute quality report
-    Uses the current venv python (sys.executable).
+    After scraping + UPSERT, in this process (analysis/post_cycle.py):
+    1) Backfill taxonomy (only rows missing it)
+    2) Build master dataset (jobs_master.*) + save backfilled workbooks concurrently
+    3) Recompute quality report
+    Portal workbooks are parsed once and shared by all stages.
     """
-    project_root = os.path.dirname(os.path.abspath(__file__))
+    try:
+        run_post_cycle(logger)
+    except Exception:
+        logger.exception("❌ Post-cycle tasks failed.")
 
-    build_master_path = os.path.join(project_root, "analysis", "build_master.py")
-    portal_quality_path = os.path.join(project_root, "analysis", "portal_quality.py")
 
-    # 1) Build master
-    if os.path.exists(build_master_path):
-        logger.info("📦 Post-task: Building master dataset (jobs_master.*)...")
-        try:
-            subprocess.run(
-                [sys.executable, build_master_path],
-                check=True,
-                cwd=project_root,
-            )
-            logger.info("✅ Master build complete.")
-        except subprocess.CalledProcessError as e:
-            logger.exception(f"❌ build_master.py failed: {e}")
-    else:
-        logger.warning(f"⚠ build_master.py not found at: {build_master_path}")
-     
-    # 1.5) Backfill taxonomy
-    backfill_tax_path = os.path.join(project_root, "analysis", "backfill_taxonomy.py")
-    if os.path.exists(backfill_tax_path):
-        logger.info("🏷️ Post-task: Backfilling taxonomy for old rows (domain_l1/l2/l3)...")
-        try:
-            subprocess.run([sys.executable, backfill_tax_path], check=True, cwd=project_root)
-            logger.info("✅ Taxonomy backfill complete.")
-        except subprocess.CalledProcessError as e:
-            logger.exception(f"❌ backfill_taxonomy.py failed: {e}")
-            
-    # 2) Quality report
-    if os.path.exists(portal_quality_path):
-        logger.info("📊 Post-task: Recomputing portal quality report (portal_quality_report.xlsx)...")
-        try:
-            subprocess.run(
-                [sys.executable, portal_quality_path],
-                check=True,
-                cwd=project_root,
-            )
-            logger.info("✅ Portal quality report updated.")
-        except subprocess.CalledProcessError as e:
-            logger.exception(f"❌ portal_quality.py failed: {e}")
-    else:
-        logger.warning(f"⚠ portal_quality.py not found at: {portal_quality_path}")
+# =========================
+# Drivers
+# =========================
+def make_scraper_driver():
+    """
+    Chrome for non-LinkedIn portals, with the ScrapeConfig resource-blocking profile.
+    """
+    blocked = None
+    if CONFIG.block_resources:
+        blocked = effective_block_patterns(CONFIG.blocked_url_patterns, CONFIG.allowed_url_patterns)
+    return make_fast_driver(headless=CONFIG.headless, blocked_url_patterns=blocked)
 
 
 # =========================
@@ -153,6 +151,7 @@ def get_output_paths(portal_name: str) -> Dict[str, str]:
     return {
         "xlsx": os.path.join(data_dir, f"{portal_name}_jobs.xlsx"),
         "urls": os.path.join(internal_dir, f"{portal_name}_urls_latest.txt"),
+        "store": os.path.join(CONFIG.store_dir, f"{portal_name}_jobs.sqlite"),
     }
 
 
@@ -165,24 +164,106 @@ def _is_excel_temp_file(path: str) -> bool:
     return base.startswith("~$")
 
 
-def load_existing_values(xlsx_path: str, key: str) -> Set[str]:
+def load_existing_index(xlsx_path: str, key: str) -> Dict[str, Optional[str]]:
     """
-    Used only for quick 'how many exist already' logging.
-    NOTE: UPSERT logic does not depend on this set.
+    key -> stored scraped_at for every saved row.
+    Served from the key index sidecar; the workbook is read (key + scraped_at
+    columns only) just when the sidecar is missing or drifted, then rebuilt.
+    Drives the freshness policy; UPSERT logic does not depend on it.
     """
     if _is_excel_temp_file(xlsx_path):
-        return set()
+        return {}
 
     if not os.path.exists(xlsx_path):
-        return set()
+        return {}
+
+    index = KeyIndex(xlsx_path, key)
+    try:
+        if index.in_sync():
+            return index.load()
+    except Exception as e:
+        print(f"[WARN] Key index unreadable, rebuilding: {index.path}\n  -> {e}")
+
+    out = _read_index_from_excel(xlsx_path, key)
+    if out is None:
+        return {}
+    try:
+        index.rebuild(out.items())
+    except Exception as e:
+        print(f"[WARN] Could not rebuild key index: {index.path}\n  -> {e}")
+    return out
+
 
+def _read_index_from_excel(xlsx_path: str, key: str) -> Optional[Dict[str, Optional[str]]]:
+    """
+    None when the workbook could not be read (the sidecar is then left untouched).
+    """
     try:
-        df_old = pd.read_excel(xlsx_path, engine="openpyxl")
+        df_old = pd.read_excel(xlsx_path, engine="openpyxl", usecols=lambda c: c in {key, "scraped_at"})
         if key not in df_old.columns:
-            return set()
-        return set(df_old[key].dropna().astype(str).str.strip().tolist())
+            return {}
+        keys = df_old[key].astype("string").str.strip()
+        if "scraped_at" in df_old.columns:
+            stamps = df_old["scraped_at"].astype("string")
+        else:
+            stamps = pd.Series(pd.NA, index=df_old.index, dtype="string")
+
+        out: Dict[str, Optional[str]] = {}
+        for k, ts in zip(keys.tolist(), stamps.tolist()):
+            if k is pd.NA or not k:
+                continue
+            out[k] = None if ts is pd.NA else ts
+        return out
     except Exception:
-        return set()
+        return None
+
+
+def load_existing_values(xlsx_path: str, key: str) -> Set[str]:
+    """
+    Used only for quick 'how many exist already' logging.
+    NOTE: UPSERT logic does not depend on this set.
+    """
+    return set(load_existing_index(xlsx_path, key))
+
+
+def _parse_scraped_at(value: Optional[str]) -> Optional[datetime]:
+    if not value:
+        return None
+    try:
+        dt = datetime.fromisoformat(str(value).strip())
+    except ValueError:
+        return None
+    # now_iso() stores naive UTC; normalize aware values to the same
+    if dt.tzinfo is not None:
+        dt = dt.astimezone(timezone.utc).replace(tzinfo=None)
+    return dt
+
+
+def is_fresh(key: str, index: Dict[str, Optional[str]], max_age_hours: float, now: Optional[datetime] = None) -> bool:
+    """
+    True when `key` is stored and was scraped less than max_age_hours ago.
+    max_age_hours <= 0 disables the policy (everything is re-scraped).
+    """
+    if max_age_hours <= 0 or key not in index:
+        return False
+    scraped = _parse_scraped_at(index.get(key))
+    if scraped is None:
+        return False
+    now = now or datetime.utcnow()
+    return (now - scraped) < timedelta(hours=max_age_hours)
+
+
+def filter_stale_urls(
+    urls: List[str],
+    index: Dict[str, Optional[str]],
+    max_age_hours: float,
+) -> Tuple[List[str], int]:
+    """
+    Keep only URLs that are new or stale. Returns (urls_to_visit, skipped_fresh).
+    """
+    now = datetime.utcnow()
+    keep = [u for u in urls if not is_fresh(u.strip(), index, max_age_hours, now=now)]
+    return keep, len(urls) - len(keep)
 
 
 def save_latest_urls(urls: List[str], path: str) -> None:
@@ -230,6 +311,53 @@ def _atomic_write_excel(df: pd.DataFrame, out_path: str) -> None:
     os.replace(tmp_path, out_path)
 
 
+def _publish_local_copy(local_path: str, xlsx_path: str) -> bool:
+    """
+    Copy the locally written workbook back to OneDrive (atomic replace).
+    """
+    try:
+        tmp_remote = xlsx_path + f".tmp_{int(time.time())}"
+        shutil.copy2(local_path, tmp_remote)
+        os.replace(tmp_remote, xlsx_path)
+        return True
+    except Exception as e:
+        print(f"[WARN] Could not copy updated Excel back to OneDrive yet: {e}")
+        print(f"[WARN] Local updated file is here: {local_path}")
+        return False
+
+
+def _update_key_index(
+    xlsx_path: str,
+    dedupe_key: str,
+    df: pd.DataFrame,
+    batch_keys: Optional[List[str]],
+    was_in_sync: bool,
+) -> None:
+    """
+    Keep the key index sidecar in step with a workbook that was just written.
+    In sync before the write => upsert only the batch keys; otherwise rebuild from `df`.
+    """
+    index = KeyIndex(xlsx_path, dedupe_key)
+    keys = df[dedupe_key].astype("string")
+    if "scraped_at" in df.columns:
+        stamps = df["scraped_at"].astype("string")
+    else:
+        stamps = pd.Series(pd.NA, index=df.index, dtype="string")
+    pairs = pd.DataFrame({"k": keys, "ts": stamps}).dropna(subset=["k"]).drop_duplicates("k")
+
+    if was_in_sync and batch_keys is not None:
+        pairs = pairs[pairs["k"].isin(batch_keys)]
+
+    items = [(k, None if ts is pd.NA else ts) for k, ts in zip(pairs["k"].tolist(), pairs["ts"].tolist())]
+    try:
+        if was_in_sync and batch_keys is not None:
+            index.upsert(items)
+        else:
+            index.rebuild(items)
+    except Exception as e:
+        print(f"[WARN] Could not update key index: {index.path}\n  -> {e}")
+
+
 def _read_excel_with_retry(path: str, retries: int = 3, pause: float = 1.5) -> pd.DataFrame:
     last_err = None
     for attempt in range(1, retries + 1):
@@ -242,6 +370,67 @@ def _read_excel_with_retry(path: str, retries: int = 3, pause: float = 1.5) -> p
     raise last_err
 
 
+def _missingish_mask(values: pd.Series, placeholders: Set[str]) -> pd.Series:
+    return values.isna() | values.astype("string").str.strip().isin(placeholders).fillna(False)
+
+
+def _to_datetime_series(values: pd.Series) -> pd.Series:
+    try:
+        return pd.to_datetime(values, errors="coerce", format="mixed")
+    except (TypeError, ValueError):
+        # mixed naive / tz-aware stamps
+        return pd.to_datetime(values, errors="coerce", format="mixed", utc=True)
+
+
+def _merge_existing(
+    old_idx: pd.DataFrame,
+    new_idx: pd.DataFrame,
+    update_cols: List[str],
+    overwrite_existing: bool,
+    placeholders: Set[str],
+    newest_scraped_at: bool,
+) -> pd.DataFrame:
+    """
+    Apply new values to keys that already exist in old_idx (both indexed by the dedupe key),
+    in place, touching only the overlapping rows:
+    - overwrite_existing=False: fill only blank/placeholder cells
+    - overwrite_existing=True: overwrite with any non-blank new value
+    - newest scraped_at wins (compared once, vectorized)
+    """
+    # last occurrence wins if a batch repeats a key
+    new_idx = new_idx[~new_idx.index.duplicated(keep="last")]
+    pos = np.flatnonzero(old_idx.index.isin(new_idx.index))
+    if not len(pos):
+        return old_idx
+
+    sub = old_idx.iloc[pos].copy()
+    incoming = new_idx.reindex(sub.index)
+    changed: List[str] = []
+
+    for col in update_cols:
+        take = ~_missingish_mask(incoming[col], placeholders)
+        if not overwrite_existing:
+            take &= _missingish_mask(sub[col], placeholders)
+        if take.any():
+            sub[col] = sub[col].mask(take, incoming[col])
+            changed.append(col)
+
+    if newest_scraped_at:
+        o = sub["scraped_at"]
+        n = incoming["scraped_at"]
+        both = ~_missingish_mask(o, placeholders) & ~_missingish_mask(n, placeholders)
+        newer = both & (_to_datetime_series(n) > _to_datetime_series(o)).fillna(False)
+        if newer.any():
+            sub["scraped_at"] = o.mask(newer, n)
+            changed.append("scraped_at")
+
+    # write back only the touched cells
+    for col in dict.fromkeys(changed):
+        old_idx.iloc[pos, old_idx.columns.get_loc(col)] = sub[col].to_numpy()
+
+    return old_idx
+
+
 def upsert_rows_to_excel(
     xlsx_path: str,
     new_rows: List[Dict],
@@ -269,14 +458,6 @@ def upsert_rows_to_excel(
     # ---- placeholders ----
     PLACEHOLDERS = {"Non", "non", "", "N/A", "na", "NA", "-", "—", "None", "NONE", "<NA>", "nan"}
 
-    def _is_missingish(v) -> bool:
-        if v is None:
-            return True
-        s = str(v).strip()
-        if s in PLACEHOLDERS:
-            return True
-        return False
-
     def _normalize_df(df: pd.DataFrame, all_cols: List[str]) -> pd.DataFrame:
         # add missing columns
         for c in all_cols:
@@ -305,6 +486,9 @@ def upsert_rows_to_excel(
 
     new_df = pd.DataFrame(new_rows)
 
+    # sidecar state BEFORE this write decides incremental update vs rebuild
+    index_was_in_sync = KeyIndex(xlsx_path, dedupe_key).in_sync()
+
     # local cache
     _ensure_dir(LOCAL_CACHE_DIR)
     local_path = os.path.join(LOCAL_CACHE_DIR, os.path.basename(xlsx_path))
@@ -340,13 +524,8 @@ def upsert_rows_to_excel(
         new_df = _normalize_df(new_df, all_cols)
 
         _atomic_write_excel(new_df, local_path)
-        try:
-            tmp_remote = xlsx_path + f".tmp_{int(time.time())}"
-            shutil.copy2(local_path, tmp_remote)
-            os.replace(tmp_remote, xlsx_path)
-        except Exception as e:
-            print(f"[WARN] Could not copy updated Excel back to OneDrive yet: {e}")
-            print(f"[WARN] Local updated file is here: {local_path}")
+        if _publish_local_copy(local_path, xlsx_path):
+            _update_key_index(xlsx_path, dedupe_key, new_df, None, False)
 
         return len(new_df)
 
@@ -376,32 +555,15 @@ def upsert_rows_to_excel(
     if inserted:
         old_idx = pd.concat([old_idx, new_idx.loc[new_ids]], axis=0)
 
-    # Existing keys => fill/update selected columns
-    common_ids = new_idx.index.intersection(old_idx.index)
-    for jid in common_ids:
-        for col in update_cols:
-            new_val = new_idx.at[jid, col]
-            if _is_missingish(new_val):
-                continue
-
-            if overwrite_existing:
-                old_idx.at[jid, col] = new_val
-            else:
-                old_val = old_idx.at[jid, col]
-                if _is_missingish(old_val):
-                    old_idx.at[jid, col] = new_val
-
-        # Keep newest scraped_at if present
-        if "scraped_at" in all_cols:
-            o = old_idx.at[jid, "scraped_at"]
-            n = new_idx.at[jid, "scraped_at"]
-            # If either missing, skip
-            if not _is_missingish(o) and not _is_missingish(n):
-                try:
-                    if pd.to_datetime(n, errors="coerce") > pd.to_datetime(o, errors="coerce"):
-                        old_idx.at[jid, "scraped_at"] = n
-                except Exception:
-                    pass
+    # Existing keys => fill/update selected columns (columnar, one mask per column)
+    old_idx = _merge_existing(
+        old_idx,
+        new_idx,
+        update_cols,
+        overwrite_existing=overwrite_existing,
+        placeholders=PLACEHOLDERS,
+        newest_scraped_at="scraped_at" in all_cols,
+    )
 
     merged = old_idx.reset_index()
 
@@ -412,39 +574,158 @@ def upsert_rows_to_excel(
 
     # write
     _atomic_write_excel(merged, local_path)
-
-    try:
-        tmp_remote = xlsx_path + f".tmp_{int(time.time())}"
-        shutil.copy2(local_path, tmp_remote)
-        os.replace(tmp_remote, xlsx_path)
-    except Exception as e:
-        print(f"[WARN] Could not copy updated Excel back to OneDrive yet: {e}")
-        print(f"[WARN] Local updated file is here: {local_path}")
+    if _publish_local_copy(local_path, xlsx_path):
+        _update_key_index(xlsx_path, dedupe_key, merged, new_idx.index.tolist(), index_was_in_sync)
 
     return inserted
 
+# =========================
+# SQLite store (storage_backend="sqlite")
+# =========================
+def open_job_store(store_path: str, xlsx_path: str, dedupe_key: str, logger: logging.Logger) -> JobStore:
+    """
+    Open the portal store; an empty store is seeded once from the existing workbook.
+    """
+    store = JobStore(store_path, dedupe_key)
+    if store.count() == 0 and os.path.exists(xlsx_path) and not _is_excel_temp_file(xlsx_path):
+        src = _copy_to_local_cache(xlsx_path, LOCAL_CACHE_DIR) or xlsx_path
+        try:
+            df = _read_excel_with_retry(src, retries=3, pause=1.0)
+            seeded = store.seed_from_frame(df)
+            logger.info(f"Seeded store from workbook: {seeded} rows -> {store_path}")
+        except Exception:
+            logger.exception(f"Could not seed store from workbook: {xlsx_path}")
+    return store
+
+
+def export_store_to_excel(store: JobStore, xlsx_path: str) -> int:
+    """
+    Store -> workbook (newest scraped_at first). The workbook is an export artifact
+    in sqlite mode: written once per cycle, never read back by the scraper.
+    """
+    df = store.to_frame()
+    local_path = os.path.join(LOCAL_CACHE_DIR, os.path.basename(xlsx_path))
+    _atomic_write_excel(df, local_path)
+    if _publish_local_copy(local_path, xlsx_path):
+        _update_key_index(xlsx_path, store.dedupe_key, df, None, False)
+    return len(df)
+
+
+def upsert_rows(
+    store: Optional[JobStore],
+    xlsx_path: str,
+    rows: List[Dict],
+    dedupe_key: str,
+    update_cols: Optional[List[str]] = None,
+) -> int:
+    """
+    Storage-backend dispatch for the portal runner. Returns number of NEW keys inserted.
+    """
+    if store is not None:
+        return store.upsert(rows, update_cols=update_cols)
+    return upsert_rows_to_excel(xlsx_path, rows, dedupe_key=dedupe_key, update_cols=update_cols)
+
+
+def make_row_writer(
+    store: Optional[JobStore],
+    xlsx_path: str,
+    dedupe_key: str,
+    logger: logging.Logger,
+    target: str,
+) -> WriteBehind:
+    """
+    Background writer for the portal runner: the scrape loop only hands off batches.
+    """
+    return WriteBehind(
+        save_fn=lambda rows, update_cols: upsert_rows(store, xlsx_path, rows, dedupe_key=dedupe_key, update_cols=update_cols),
+        dedupe_key=dedupe_key,
+        logger=logger,
+        target=target,
+        max_pending=CONFIG.write_queue_batches,
+    )
+
+
 # =========================
 # Portal runner
 # =========================
-def run_portal_once(portal_name: str, cfg: Dict, logger: logging.Logger) -> int:
+def run_portal_once(portal_name: str, cfg: Dict, logger: logging.Logger, deep: bool = False) -> int:
     """
     Supports:
       - selenium: collect URLs -> parse each URL
       - rows: collect rows directly (LinkedIn / future rows portals)
+    deep=True walks every listing page (no early stop on known-only pages).
+    storage_backend="sqlite": rows go to the portal store; the workbook is exported once at the end.
     Returns number of NEW keys inserted (UPSERT may still update existing rows).
     """
     paths = get_output_paths(portal_name)
+    dedupe_key = cfg.get("dedupe_key", "job_url")
+
+    store: Optional[JobStore] = None
+    if (CONFIG.storage_backend or "excel").lower().strip() == "sqlite":
+        store = open_job_store(paths["store"], paths["xlsx"], dedupe_key, logger)
+        logger.info(f"Store path: {paths['store']}")
+
+    try:
+        return _run_portal_cycle(portal_name, cfg, logger, deep, paths, store)
+    finally:
+        if store is not None:
+            try:
+                if store.writes:
+                    t0 = time.perf_counter()
+                    n = export_store_to_excel(store, paths["xlsx"])
+                    logger.info(f"[Export] ✅ {n} rows -> {paths['xlsx']} ({time.perf_counter() - t0:.1f}s)")
+            except Exception:
+                logger.exception("Failed exporting store to Excel.")
+            finally:
+                store.close()
+
+
+def _run_portal_cycle(
+    portal_name: str,
+    cfg: Dict,
+    logger: logging.Logger,
+    deep: bool,
+    paths: Dict[str, str],
+    store: Optional[JobStore],
+) -> int:
     out_xlsx = paths["xlsx"]
     out_urls = paths["urls"]
+    save_target = store.db_path if store is not None else out_xlsx
 
     dedupe_key = cfg.get("dedupe_key", "job_url")
 
     logger.info(f"Excel output path: {out_xlsx}")
     logger.info(f"URL audit path: {out_urls}")
 
-    existing_keys = load_existing_values(out_xlsx, dedupe_key)
+    if store is not None:
+        existing_index = store.key_index()
+    else:
+        existing_index = load_existing_index(out_xlsx, dedupe_key)
+    existing_keys = set(existing_index)
     logger.info(f"Existing {dedupe_key} already saved: {len(existing_keys)}")
 
+    # freshness policy: stored keys scraped less than N hours ago are not re-visited
+    refresh_after_hours = float(cfg.get("refresh_after_hours", CONFIG.refresh_after_hours) or 0)
+    skipped_fresh = 0
+
+    def _skip_fresh(key: str) -> bool:
+        nonlocal skipped_fresh
+        if is_fresh(str(key).strip(), existing_index, refresh_after_hours):
+            skipped_fresh += 1
+            return True
+        return False
+
+    # early stop: K consecutive listing pages with no unseen key ends pagination
+    stop_after_known_pages = 0 if deep else int(
+        cfg.get("listing_stop_after_known_pages", CONFIG.listing_stop_after_known_pages) or 0
+    )
+    if stop_after_known_pages > 0 and existing_keys:
+        logger.info(f"Listing early-stop: after {stop_after_known_pages} page(s) with only known {dedupe_key}s")
+    elif deep:
+        logger.info("Deep crawl: walking all listing pages.")
+    # snapshot: existing_keys grows while rows stream in, and a job scraped this cycle is not "known"
+    known_keys = frozenset(existing_keys) if existing_keys else None
+
     mode = (cfg.get("mode") or "selenium").lower().strip()
 
     # -------------------------
@@ -457,21 +738,19 @@ def run_portal_once(portal_name: str, cfg: Dict, logger: logging.Logger) -> int:
             return 0
 
         autosave_every = int(cfg.get("autosave_every", 5) or 5)
-        inserted_total = 0
         buffer_rows: List[Dict] = []
+        ids: List[str] = []
+        writer = make_row_writer(store, out_xlsx, dedupe_key, logger, save_target)
 
+        # collect_rows may be a generator (LinkedIn): rows are saved while the crawl goes on
+        rows = None
         try:
-            rows = collect_rows_fn(CONFIG) or []
-            logger.info(f"Collected rows: {len(rows)}")
-            if not rows:
-                return 0
-
-            ids = [
-                str(r.get(dedupe_key, "")).strip()
-                for r in rows
-                if str(r.get(dedupe_key, "")).strip()
-            ]
-            save_latest_urls(ids, out_urls)
+            rows = collect_rows_fn(
+                CONFIG,
+                skip_key=_skip_fresh,
+                known_keys=known_keys,
+                stop_after_known_pages=stop_after_known_pages,
+            ) or []
 
             for r in rows:
                 k = str(r.get(dedupe_key, "")).strip()
@@ -479,159 +758,255 @@ def run_portal_once(portal_name: str, cfg: Dict, logger: logging.Logger) -> int:
                     continue
 
                 buffer_rows.append(r)
+                ids.append(k)
                 existing_keys.add(k)
 
                 if len(buffer_rows) >= autosave_every:
-                    inserted = upsert_rows_to_excel(out_xlsx, buffer_rows, dedupe_key=dedupe_key)
-                    inserted_total += inserted
-
-                    logger.info(
-                        f"[Autosave] ✅ Saved batch_rows={len(buffer_rows)} -> {out_xlsx} | "
-                        f"NEW keys this batch={inserted} | NEW keys cycle_total={inserted_total}"
-                    )
-
+                    writer.submit(buffer_rows)
                     buffer_rows = []
 
-            if buffer_rows:
-                inserted = upsert_rows_to_excel(out_xlsx, buffer_rows, dedupe_key=dedupe_key)
-                inserted_total += inserted
-
-                logger.info(
-                    f"[Final Save] ✅ Saved batch_rows={len(buffer_rows)} -> {out_xlsx} | "
-                    f"NEW keys this batch={inserted} | NEW keys cycle_total={inserted_total}"
-                )
-            return inserted_total
+            writer.submit(buffer_rows)
+            buffer_rows = []
 
         except KeyboardInterrupt:
             logger.warning("Interrupted by user (Ctrl+C). Saving buffered rows...")
-            if buffer_rows:
-                inserted = upsert_rows_to_excel(out_xlsx, buffer_rows, dedupe_key=dedupe_key, update_cols=TAX_COLS)
-                inserted_total += inserted
-                logger.info(f"[Interrupt Save] Inserted {inserted} NEW keys (UPSERT applied).")
-            return inserted_total
+            writer.submit(buffer_rows, TAX_COLS)
 
         except Exception:
             logger.exception("Rows-mode portal cycle failed with an unexpected error.")
-            try:
-                if buffer_rows:
-                    inserted = upsert_rows_to_excel(out_xlsx, buffer_rows, dedupe_key=dedupe_key, update_cols=TAX_COLS)
-                    inserted_total += inserted
-                    logger.info(f"[Error Save] Inserted {inserted} NEW keys (UPSERT applied).")
-            except Exception:
-                logger.exception("Failed saving buffered rows after error.")
-            return inserted_total
+            writer.submit(buffer_rows, TAX_COLS)
+
+        finally:
+            close_rows = getattr(rows, "close", None)
+            if close_rows is not None:
+                close_rows()  # generator: runs its cleanup (quits Chrome) right away
+
+        logger.info(f"Collected rows: {len(ids)} | skipped fresh keys: {skipped_fresh}")
+        if ids:
+            save_latest_urls(ids, out_urls)
+
+        inserted_total = writer.close()
+        logger.info(f"Inserted {inserted_total} NEW keys total (UPSERT applied). Saves: {writer.saves}, {writer.save_sec:.1f}s in writer")
+        return inserted_total
 
     # -------------------------
-    # SELENIUM MODE
+    # SELENIUM / HTTP MODE
     # -------------------------
     collect_fn: Optional[Callable] = cfg.get("collect")
     parse_fn: Optional[Callable] = cfg.get("parse")
+    collect_http_fn: Optional[Callable] = cfg.get("collect_http")
+    parse_http_fn: Optional[Callable] = cfg.get("parse_http")
 
     pages = int(cfg.get("pages", 1) or 1)
     limit = int(cfg.get("limit", 200) or 200)
     per_page = int(cfg.get("per_page", 30) or 30)
 
-    if not collect_fn or not parse_fn:
+    if mode == "http" and not parse_http_fn:
+        logger.error("HTTP mode missing parse_http function.")
+        return 0
+    if mode != "http" and (not collect_fn or not parse_fn):
         logger.error("Selenium mode missing collect/parse functions.")
         return 0
 
     autosave_every = int(cfg.get("autosave_every", 5) or 5)
     max_consec_fails = int(cfg.get("max_consec_fails", 3) or 3)
 
-    driver = make_fast_driver(headless=CONFIG.headless)
+    # http mode starts Chrome lazily, only if a page needs the Selenium fallback
+    session = make_http_session() if mode == "http" else None
+    driver = None if mode == "http" else make_scraper_driver()
+
+    def _get_driver():
+        nonlocal driver
+        if driver is None:
+            logger.info("Starting Chrome for Selenium fallback...")
+            driver = make_scraper_driver()
+        return driver
+
+    def _restart_driver() -> None:
+        nonlocal driver
+        if driver is None:
+            return
+        try:
+            driver.quit()
+        except Exception:
+            pass
+        driver = make_scraper_driver()
 
     buffer_rows: List[Dict] = []
-    inserted_total = 0
     consecutive_fails = 0
+    http_fallbacks = 0
+    pool: Optional[DriverPool] = None
+    writer = make_row_writer(store, out_xlsx, dedupe_key, logger, save_target)
 
     try:
-        urls = collect_fn(
-            driver,
-            pages=pages,
-            limit=limit,
-            per_page=per_page,
-            sleep_sec=CONFIG.sleep_between_pages_sec,
-        ) or []
+        urls: List[str] = []
+        if session is not None and collect_http_fn:
+            try:
+                urls = collect_http_fn(
+                    session,
+                    pages=pages,
+                    limit=limit,
+                    per_page=per_page,
+                    sleep_sec=CONFIG.sleep_between_pages_sec,
+                    known_keys=known_keys if dedupe_key == "job_url" else None,
+                    stop_after_known_pages=stop_after_known_pages,
+                ) or []
+            except Exception:
+                logger.exception("HTTP listing collection failed.")
+                urls = []
+
+        if not urls and collect_fn:
+            if session is not None:
+                logger.info("No URLs over HTTP. Collecting listing pages with Selenium...")
+            urls = collect_fn(
+                _get_driver(),
+                pages=pages,
+                limit=limit,
+                per_page=per_page,
+                sleep_sec=CONFIG.sleep_between_pages_sec,
+                known_keys=known_keys if dedupe_key == "job_url" else None,
+                stop_after_known_pages=stop_after_known_pages,
+            ) or []
 
         save_latest_urls(urls, out_urls)
 
         logger.info(f"Total collected URLs: {len(urls)}")
+
+        # urls are the dedupe keys only when dedupe_key == job_url
+        if dedupe_key == "job_url" and refresh_after_hours > 0:
+            urls, skipped_fresh = filter_stale_urls(urls, existing_index, refresh_after_hours)
+            logger.info(
+                f"Freshness policy ({refresh_after_hours:g}h): visiting {len(urls)} new/stale URLs, "
+                f"skipped {skipped_fresh} fresh"
+            )
         if urls:
             logger.info(f"First 10 URLs: {urls[:10]}")
 
-        for i, u in enumerate(urls, 1):
-            logger.info(f"[{portal_name.upper()}] {i}/{len(urls)} {u}")
+        def _iter_sequential():
+            nonlocal session, consecutive_fails, http_fallbacks
 
-            try:
-                row = parse_fn(driver, u)
-                if not row:
+            for idx, u in enumerate(urls):
+                logger.info(f"[{portal_name.upper()}] {idx + 1}/{len(urls)} {u}")
+
+                row = None
+                cmds_before = driver_command_count(driver) if driver is not None else 0
+                try:
+                    if session is not None:
+                        try:
+                            row = parse_http_fn(session, u)
+                        except RuntimeError as e:
+                            if str(e) not in HTTP_FALLBACK_ERRORS or not parse_fn:
+                                raise
+                            http_fallbacks += 1
+                            logger.info(f"HTTP fetch needs a browser ({e}). Selenium fallback: {u}")
+                            row = parse_fn(_get_driver(), u)
+                    else:
+                        row = parse_fn(driver, u)
+
+                    if row:
+                        consecutive_fails = 0
+                    else:
+                        consecutive_fails += 1
+
+                except Exception as e:
                     consecutive_fails += 1
-                    continue
+                    msg = str(e)
+
+                    if "BLOCKED_OR_CHALLENGE" in msg:
+                        logger.warning("Challenge page detected. Restarting driver + cooldown...")
+                        time.sleep(6.0)
+                        _restart_driver()
+                        consecutive_fails = 0
+                    else:
+                        logger.exception(f"Failed to parse URL (skipping): {u}")
+
+                if driver is not None and driver_command_count(driver) > cmds_before:
+                    logger.info(f"[{portal_name.upper()}] webdriver_cmds={driver_command_count(driver) - cmds_before} for {u}")
+
+                yield idx, u, row
+
+                if consecutive_fails >= max_consec_fails:
+                    logger.warning(f"Too many consecutive failures ({consecutive_fails}). Restarting driver...")
+                    _restart_driver()
+                    if session is not None:
+                        session.close()
+                        session = make_http_session()
+                    consecutive_fails = 0
+                    time.sleep(2.0)
 
-                row_key = str(row.get(dedupe_key, "")).strip()
-                if not row_key:
-                    continue
+        workers = int(cfg.get("workers", CONFIG.detail_workers) or 1)
+        if mode == "selenium" and workers > 1 and len(urls) > 1:
+            # listing Chrome is not needed anymore; each worker owns its own
+            try:
+                driver.quit()
+            except Exception:
+                pass
+            driver = None
+
+            pool = DriverPool(
+                make_driver=make_scraper_driver,
+                parse_fn=parse_fn,
+                workers=workers,
+                throttle=HostThrottle(
+                    max_concurrent=CONFIG.max_concurrent_per_host,
+                    min_interval_sec=CONFIG.min_host_interval_sec,
+                ),
+                logger=logger,
+                label=portal_name.upper(),
+                max_consec_fails=max_consec_fails,
+            )
+            logger.info(f"Parsing with DriverPool: workers={pool.workers}")
+            results = pool.imap(urls)
+        else:
+            results = _iter_sequential()
 
-                buffer_rows.append(row)
-                existing_keys.add(row_key)
-                consecutive_fails = 0
-
-            except Exception as e:
-                consecutive_fails += 1
-                msg = str(e)
-
-                if "BLOCKED_OR_CHALLENGE" in msg:
-                    logger.warning("Challenge page detected. Restarting driver + cooldown...")
-                    try:
-                        driver.quit()
-                    except Exception:
-                        pass
-                    time.sleep(6.0)
-                    driver = make_fast_driver(headless=CONFIG.headless)
-                    consecutive_fails = 0
-                    continue
+        for _, u, row in results:
+            if not row:
+                continue
 
-                logger.exception(f"Failed to parse URL (skipping): {u}")
+            row_key = str(row.get(dedupe_key, "")).strip()
+            if not row_key:
+                continue
+
+            buffer_rows.append(row)
+            existing_keys.add(row_key)
 
             if len(buffer_rows) >= autosave_every:
-                try:
-                    inserted = upsert_rows_to_excel(out_xlsx, buffer_rows, dedupe_key=dedupe_key, update_cols=TAX_COLS)
-                    inserted_total += inserted
-                    logger.info(f"[Autosave] ✅ Saved {len(buffer_rows)} rows -> {out_xlsx} | NEW keys: {inserted} | Total saved this cycle: {inserted_total + inserted}")
-                    buffer_rows = []
-                except Exception:
-                    logger.exception("[Autosave] Failed while saving to Excel (continuing).")
+                # hand off and keep scraping; the writer thread does the upsert
+                writer.submit(buffer_rows, TAX_COLS)
+                buffer_rows = []
 
-            if consecutive_fails >= max_consec_fails:
-                logger.warning(f"Too many consecutive failures ({consecutive_fails}). Restarting driver...")
-                try:
-                    driver.quit()
-                except Exception:
-                    pass
-                driver = make_fast_driver(headless=CONFIG.headless)
-                consecutive_fails = 0
-                time.sleep(2.0)
+                if pool is not None:
+                    logger.info(pool.stats_line())
+
+    except KeyboardInterrupt:
+        logger.warning("Interrupted by user (Ctrl+C). Saving buffered rows...")
+        raise
 
     except Exception:
         logger.exception("Portal cycle failed with an unexpected error.")
-        return inserted_total
 
     finally:
-        try:
-            driver.quit()
-        except Exception:
-            pass
+        if driver is not None:
+            try:
+                driver.quit()
+            except Exception:
+                pass
+        if session is not None:
+            session.close()
 
-    if buffer_rows:
-        try:
-            inserted = upsert_rows_to_excel(out_xlsx, buffer_rows, dedupe_key=dedupe_key, update_cols=TAX_COLS)
-            inserted_total += inserted
-            logger.info(f"[Final Save] ✅ Saved {len(buffer_rows)} rows -> {out_xlsx} | NEW keys: {inserted} | Total saved this cycle: {inserted_total}")
-        except Exception:
-            logger.exception("Failed while saving final rows to Excel.")
+        # drain: last partial batch + everything still queued (also on Ctrl+C / errors)
+        writer.submit(buffer_rows, TAX_COLS)
+        buffer_rows = []
+        inserted_total = writer.close()
+
+    if mode == "http":
+        logger.info(f"HTTP mode: Selenium fallbacks this cycle: {http_fallbacks}")
+    if pool is not None:
+        logger.info(pool.stats_line())
 
-    logger.info(f"Inserted {inserted_total} NEW keys total (UPSERT applied).")
-    logger.info(f"Saved to: {out_xlsx}")
+    logger.info(f"Inserted {inserted_total} NEW keys total (UPSERT applied). Saves: {writer.saves}, {writer.save_sec:.1f}s in writer")
+    logger.info(f"Saved to: {save_target}")
     logger.info(f"Latest URL list saved to: {out_urls}")
     return inserted_total
 
@@ -644,6 +1019,8 @@ def parse_args():
     parser.add_argument("--watch", action="store_true", help="Run continuously.")
     parser.add_argument("--interval", type=int, default=CONFIG.watch_default_interval_sec)
     parser.add_argument("--portal", type=str, default="all")
+    parser.add_argument("--deep", action="store_true", help="Walk every listing page (full resync, no early stop).")
+    parser.add_argument("--export", action="store_true", help="Export the SQLite stores to the portal workbooks and exit.")
     return parser.parse_args()
 
 
@@ -661,11 +1038,33 @@ def main():
 
     loggers = {name: setup_logger(name) for name in selected.keys()}
 
+    if args.export:
+        for name, cfg in selected.items():
+            paths = get_output_paths(name)
+            if not os.path.exists(paths["store"]):
+                loggers[name].warning(f"No store to export: {paths['store']}")
+                continue
+            store = JobStore(paths["store"], cfg.get("dedupe_key", "job_url"))
+            try:
+                n = export_store_to_excel(store, paths["xlsx"])
+                loggers[name].info(f"[Export] ✅ {n} rows -> {paths['xlsx']}")
+            finally:
+                store.close()
+        return
+
+    deep_every = int(CONFIG.deep_crawl_every_cycles or 0)
+    cycle = 0
+
     def run_all_once():
+        nonlocal cycle
+        cycle += 1
+        # --deep resyncs on the first cycle; watch mode can also schedule it every N cycles
+        deep = (bool(args.deep) and cycle == 1) or (deep_every > 0 and cycle % deep_every == 0)
+
         for name, cfg in selected.items():
             logger = loggers[name]
             logger.info("----- START CYCLE -----")
-            run_portal_once(portal_name=name, cfg=cfg, logger=logger)
+            run_portal_once(portal_name=name, cfg=cfg, logger=logger, deep=deep)
             logger.info("------ END CYCLE ------\n")
 
         # Post-cycle tasks AFTER all portals
@@ -1,26 +1,181 @@
 # scraper_core.py
 from __future__ import annotations
 
+import json
 import os
 import re
 import tempfile
+import threading
+import time
 from datetime import datetime
-from typing import Dict, Optional, Tuple
-
+from typing import Callable, Dict, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+import pandas as pd
+import requests
+from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from selenium import webdriver
 from selenium.common.exceptions import SessionNotCreatedException
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service
 from webdriver_manager.chrome import ChromeDriverManager
 
+from classify_cache import ClassifierCache, fingerprint
+from config import CONFIG
+from gazetteer import resolve_location, stated_country
+import taxonomy
+
+
+DEFAULT_USER_AGENT = (
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
+    "AppleWebKit/537.36 (KHTML, like Gecko) "
+    "Chrome/121.0.0.0 Safari/537.36"
+)
+
+
+# =========================
+# chromedriver resolution (cached)
+# =========================
+# CHROMEDRIVER_PATH=/path/to/chromedriver skips webdriver-manager entirely.
+CHROMEDRIVER_CACHE_FILE = os.path.join(os.path.expanduser("~"), ".cache", "job_scraper", "chromedriver.json")
+CHROMEDRIVER_RECHECK_SEC = 24 * 3600  # webdriver-manager version check at most once per day
+
+_chromedriver_path: Optional[str] = None
+_chromedriver_lock = threading.Lock()
+
+
+def _read_chromedriver_cache() -> Optional[str]:
+    try:
+        with open(CHROMEDRIVER_CACHE_FILE, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except Exception:
+        return None
+
+    path = data.get("path")
+    checked_at = float(data.get("checked_at", 0) or 0)
+    if not path or not os.path.exists(path):
+        return None
+    if time.time() - checked_at > CHROMEDRIVER_RECHECK_SEC:
+        return None
+    return path
 
-def make_fast_driver(headless: bool = True) -> webdriver.Chrome:
+
+def _write_chromedriver_cache(path: str) -> None:
+    try:
+        os.makedirs(os.path.dirname(CHROMEDRIVER_CACHE_FILE), exist_ok=True)
+        tmp = CHROMEDRIVER_CACHE_FILE + f".tmp_{os.getpid()}"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"path": path, "checked_at": time.time()}, f)
+        os.replace(tmp, CHROMEDRIVER_CACHE_FILE)
+    except Exception as e:
+        print(f"[WARN] Could not write chromedriver cache: {e}")
+
+
+def resolve_chromedriver_path(force_refresh: bool = False) -> str:
+    """
+    Resolve chromedriver once per process (and once per day on disk) instead of
+    running ChromeDriverManager().install() on every driver (re)start.
+    """
+    global _chromedriver_path
+
+    env_path = os.getenv("CHROMEDRIVER_PATH", "").strip()
+    if env_path:
+        return env_path
+
+    with _chromedriver_lock:
+        if _chromedriver_path and not force_refresh and os.path.exists(_chromedriver_path):
+            return _chromedriver_path
+
+        path = None if force_refresh else _read_chromedriver_cache()
+        if not path:
+            path = ChromeDriverManager().install()
+            _write_chromedriver_cache(path)
+
+        _chromedriver_path = path
+        return path
+
+
+def _new_chrome(opts: Options) -> webdriver.Chrome:
+    try:
+        driver = webdriver.Chrome(service=Service(resolve_chromedriver_path()), options=opts)
+    except SessionNotCreatedException as e:
+        # cached driver no longer matches the installed Chrome -> re-resolve once
+        if os.getenv("CHROMEDRIVER_PATH", "").strip() or "version" not in str(e).lower():
+            raise
+        driver = webdriver.Chrome(service=Service(resolve_chromedriver_path(force_refresh=True)), options=opts)
+    return install_command_counter(driver)
+
+
+# =========================
+# WebDriver command counter
+# =========================
+def install_command_counter(driver):
+    """
+    Counts every WebDriver command (each one is an HTTP round trip to chromedriver).
+    WebElement calls go through driver.execute too, so they are included.
+    """
+    if getattr(driver, "_cmd_counter_installed", False):
+        return driver
+
+    original_execute = driver.execute
+    driver._cmd_count = 0
+
+    def _counting_execute(driver_command, params=None):
+        driver._cmd_count += 1
+        return original_execute(driver_command, params)
+
+    driver.execute = _counting_execute
+    driver._cmd_counter_installed = True
+    return driver
+
+
+def driver_command_count(driver) -> int:
+    return int(getattr(driver, "_cmd_count", 0) or 0)
+
+
+# =========================
+# Resource blocking
+# =========================
+IMAGE_URL_PATTERNS = ("*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.ico", "*.avif")
+
+
+def effective_block_patterns(blocked: Sequence[str], allowed: Sequence[str] = ()) -> List[str]:
+    """
+    Network.setBlockedURLs has no allow-list, so allowed entries are applied here:
+    a blocked pattern is dropped if it contains any allowed entry (e.g. allowing
+    "googletagmanager.com" drops "*googletagmanager.com*").
+    """
+    allowed = [a.strip().lower() for a in (allowed or ()) if a and a.strip()]
+    out: List[str] = []
+    for pat in blocked or ():
+        p = (pat or "").strip()
+        if not p or p in out:
+            continue
+        if any(a in p.lower() for a in allowed):
+            continue
+        out.append(p)
+    return out
+
+
+def make_fast_driver(
+    headless: bool = True,
+    blocked_url_patterns: Optional[Sequence[str]] = None,
+) -> webdriver.Chrome:
     """
     Default driver for non-LinkedIn portals.
+    blocked_url_patterns: URL wildcards never fetched (images, fonts, media, trackers).
     """
     opts = Options()
     opts.page_load_strategy = "eager"
 
+    blocked = list(blocked_url_patterns or [])
+    # the content setting turns off EVERY image: only when no image type was allow-listed,
+    # otherwise Network.setBlockedURLs blocks the remaining image patterns on its own
+    if all(p in blocked for p in IMAGE_URL_PATTERNS):
+        opts.add_experimental_option("prefs", {"profile.managed_default_content_settings.images": 2})
+
     if headless:
         opts.add_argument("--headless=new")
 
@@ -40,16 +195,9 @@ def make_fast_driver(headless: bool = True) -> webdriver.Chrome:
     opts.add_argument("--disable-backgrounding-occluded-windows")
     opts.add_argument("--disable-ipc-flooding-protection")
 
-    opts.add_argument(
-        "user-agent=Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
-        "AppleWebKit/537.36 (KHTML, like Gecko) "
-        "Chrome/121.0.0.0 Safari/537.36"
-    )
+    opts.add_argument(f"user-agent={DEFAULT_USER_AGENT}")
 
-    driver = webdriver.Chrome(
-        service=Service(ChromeDriverManager().install()),
-        options=opts,
-    )
+    driver = _new_chrome(opts)
 
     try:
         driver.execute_cdp_cmd(
@@ -65,6 +213,13 @@ def make_fast_driver(headless: bool = True) -> webdriver.Chrome:
     except Exception:
         pass
 
+    if blocked:
+        try:
+            driver.execute_cdp_cmd("Network.enable", {})
+            driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": blocked})
+        except Exception as e:
+            print(f"[WARN] Resource blocking not applied: {e}")
+
     driver.set_page_load_timeout(90)
     return driver
 
@@ -116,10 +271,7 @@ def make_linkedin_driver(headless: bool, profile_path: str, profile_dir: str) ->
     opts.add_argument(f"--profile-directory={profile_dir}")
 
     try:
-        driver = webdriver.Chrome(
-            service=Service(ChromeDriverManager().install()),
-            options=opts,
-        )
+        driver = _new_chrome(opts)
         driver.set_page_load_timeout(90)
         return driver
     except Exception as e:
@@ -140,10 +292,7 @@ def make_linkedin_driver(headless: bool, profile_path: str, profile_dir: str) ->
         opts2.add_argument(f"--user-data-dir={tmp_profile}")
         opts2.add_argument("--profile-directory=Default")
 
-        driver = webdriver.Chrome(
-            service=Service(ChromeDriverManager().install()),
-            options=opts2,
-        )
+        driver = _new_chrome(opts2)
         driver.set_page_load_timeout(90)
         return driver
 
@@ -163,6 +312,199 @@ def now_iso() -> str:
     return datetime.utcnow().isoformat()
 
 
+# =========================
+# HTTP fetch engine (no browser)
+# =========================
+CHALLENGE_TITLE_MARKERS = ("attention required", "cloudflare", "just a moment")
+CHALLENGE_BODY_MARKERS = ("verify you are human", "checking your browser")
+
+# Elements that start a new line in the browser's innerText.
+_BLOCK_TAGS = {
+    "address", "article", "aside", "blockquote", "dd", "details", "div", "dl", "dt",
+    "fieldset", "figcaption", "figure", "footer", "form", "h1", "h2", "h3", "h4", "h5",
+    "h6", "header", "hr", "li", "main", "nav", "ol", "p", "pre", "section", "summary",
+    "table", "tbody", "thead", "tfoot", "tr", "ul",
+}
+_SKIP_TAGS = {"script", "style", "noscript", "template", "svg", "head"}
+
+
+def make_http_session(pool_size: int = 8, retries: int = 2) -> requests.Session:
+    """
+    Pooled keep-alive session for plain HTML detail pages.
+    requests negotiates gzip/deflate and decodes transparently.
+    """
+    session = requests.Session()
+    session.headers.update({
+        "User-Agent": DEFAULT_USER_AGENT,
+        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+        "Accept-Language": "en-US,en;q=0.9",
+        "Accept-Encoding": "gzip, deflate",
+        "Connection": "keep-alive",
+    })
+
+    retry = Retry(
+        total=retries,
+        backoff_factor=0.8,
+        status_forcelist=(429, 500, 502, 504),
+        allowed_methods=("GET", "HEAD"),
+        respect_retry_after_header=True,
+    )
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def looks_like_challenge(title: str, body_text: str) -> bool:
+    t = (title or "").lower()
+    b = (body_text or "").lower()
+    return any(k in t for k in CHALLENGE_TITLE_MARKERS) or any(k in b for k in CHALLENGE_BODY_MARKERS)
+
+
+def fetch_html(session: requests.Session, url: str, timeout: float = 20.0) -> str:
+    """
+    GET a page and return its HTML.
+    Raises RuntimeError("BLOCKED_OR_CHALLENGE") for bot-check responses so callers
+    can fall back to Selenium.
+    """
+    resp = session.get(url, timeout=timeout)
+
+    if resp.status_code in (403, 503):
+        raise RuntimeError("BLOCKED_OR_CHALLENGE")
+    resp.raise_for_status()
+
+    if not resp.encoding or resp.encoding.lower() == "iso-8859-1":
+        resp.encoding = resp.apparent_encoding or "utf-8"
+    return resp.text
+
+
+def html_to_soup(html: str) -> BeautifulSoup:
+    return BeautifulSoup(html or "", "lxml")
+
+
+def soup_inner_text(node) -> str:
+    """
+    Approximates the browser's innerText (what Selenium's `.text` returns):
+    whitespace collapsed inside lines, block elements and <br> start new lines.
+    """
+    if node is None:
+        return ""
+
+    parts: List[str] = []
+
+    def _walk(el) -> None:
+        for child in el.children:
+            name = getattr(child, "name", None)
+            if name is None:
+                if type(child).__name__ in {"Comment", "Doctype", "Declaration", "ProcessingInstruction", "CData"}:
+                    continue
+                parts.append(str(child))
+                continue
+            if name in _SKIP_TAGS:
+                continue
+            if name == "br":
+                parts.append("\n")
+                continue
+            is_block = name in _BLOCK_TAGS
+            if is_block:
+                parts.append("\n")
+            elif name in {"td", "th"}:
+                parts.append(" ")
+            _walk(child)
+            if is_block:
+                parts.append("\n")
+
+    _walk(node)
+
+    lines = []
+    for line in "".join(parts).split("\n"):
+        line = re.sub(r"[^\S\n]+", " ", line).strip()
+        if line:
+            lines.append(line)
+    return "\n".join(lines)
+
+
+def snapshot_soup(driver, container_css: Optional[List[str]] = None) -> BeautifulSoup:
+    """
+    One WebDriver round trip: the rendered DOM (or the first matching container)
+    parsed into an in-process tree, so every selector after this is local.
+    """
+    html = None
+    if container_css:
+        try:
+            html = driver.execute_script(
+                """
+                for (const sel of arguments[0]) {
+                  const el = document.querySelector(sel);
+                  if (el) return el.outerHTML;
+                }
+                return null;
+                """,
+                list(container_css),
+            )
+        except Exception:
+            html = None
+    if not html:
+        html = driver.page_source
+    return html_to_soup(html)
+
+
+def soup_pick_text(soup, css_list: List[str]) -> Optional[str]:
+    for sel in css_list:
+        try:
+            el = soup.select_one(sel)
+        except Exception:
+            continue
+        if el is None:
+            continue
+        t = clean(soup_inner_text(el))
+        if t:
+            return t
+    return None
+
+
+def soup_pick_attr(soup, css_list: List[str], attr: str) -> Optional[str]:
+    for sel in css_list:
+        try:
+            el = soup.select_one(sel)
+        except Exception:
+            continue
+        if el is None:
+            continue
+        v = clean(el.get(attr))
+        if v:
+            return v
+    return None
+
+
+# =========================
+# Listing pagination early-stop
+# =========================
+class KnownPageStreak:
+    """
+    Stops listing pagination after `stop_after` consecutive pages whose keys are
+    all already stored (no unseen jobs). Disabled when known_keys is None or
+    stop_after <= 0 (deep crawl).
+    """
+
+    def __init__(self, known_keys: Optional[Set[str]] = None, stop_after: int = 0):
+        self.known_keys = known_keys
+        self.stop_after = int(stop_after or 0)
+        self.streak = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.known_keys is not None and self.stop_after > 0
+
+    def page(self, page_keys: List[str]) -> bool:
+        """Record one listing page; True means stop paginating."""
+        if not self.enabled or not page_keys:
+            return False
+        unseen = sum(1 for k in page_keys if k not in self.known_keys)
+        self.streak = 0 if unseen else self.streak + 1
+        return self.streak >= self.stop_after
+
+
 # --- (rest of your functions remain unchanged) ---
 def infer_work_mode(text: str) -> Optional[str]:
     t = (text or "").lower()
@@ -175,73 +517,79 @@ def infer_work_mode(text: str) -> Optional[str]:
         return "On-site"
     return None
 
-def infer_country(location_text: str | None, default: str = "Nepal") -> str:
+def infer_country(location_text: str | None, default: str = "Nepal", stated_only: bool = False) -> str:
     """
-    Very simple country inference.
-    For MeroJob/JobsNepal, defaulting to Nepal is usually correct.
-    You can expand this later with more rules.
+    Country of a free-text location via the bundled gazetteer (gazetteer.py);
+    `default` when nothing in it is known (empty, "Remote", "APAC", ...).
+    stated_only: only a country the text names counts (portals that list one
+    country's jobs: "Hyderabad, Sindh" there stays `default`).
     """
-    t = (location_text or "").lower().strip()
-
-    # obvious Nepal matches
-    if any(k in t for k in ["nepal", "kathmandu", "lalitpur", "bhaktapur", "pokhara", "butwal", "biratnagar", "dharan"]):
-        return "Nepal"
-
-    # if location looks empty/unknown, still default Nepal
-    if not t or t in {"non", "none", "na", "n/a"}:
-        return default
-
-    # fallback default
-    return default
+    if stated_only:
+        return stated_country(location_text) or default
+    return resolve_location(location_text).country or default
+
+
+# =========================
+# IT / Non-IT quick classifier (compiled once)
+# =========================
+# ✅ longer phrases are safe as substring matches
+IT_PHRASE_KEYWORDS = (
+    "information technology",
+    "software development", "software engineer",
+    "full stack", "fullstack",
+    "data engineer", "data scientist",
+    "machine learning", "cybersecurity", "cyber security",
+    "system administrator", "technical support", "help desk", "helpdesk",
+    "cloud computing", "devops",
+    "rest api", "api development",
+)
+
+# ✅ single words must be WHOLE WORD matches (avoid false positives)
+IT_WORD_KEYWORDS = (
+    "developer", "programmer", "engineer",
+    "python", "java", "javascript", "react", "node", "django", "flask",
+    "php", "laravel",
+    "docker", "kubernetes",
+    "aws", "azure", "gcp",
+    "network", "database", "sql",
+    "ai", "ml", "qa", "sdet",
+)
+
+IT_SPECIAL_PATTERNS = (
+    r"\.net\b",
+    r"\bc\+\+\b",
+    r"\bc#\b",
+    r"\bgolang\b",
+    r"\bgo\b",
+)
+
+# one alternation, one search: the text is IT as soon as ANY keyword matches anywhere
+_IT_ANY_RE = re.compile("|".join(
+    [re.escape(k) for k in IT_PHRASE_KEYWORDS]
+    + [r"\b(?:" + "|".join(re.escape(w) for w in IT_WORD_KEYWORDS) + r")\b"]
+    + list(IT_SPECIAL_PATTERNS)
+))
+
+
+def _classify_it_non_it(text: str) -> str:
+    return "IT" if _IT_ANY_RE.search(text) else "Non-IT"
+
+
+# lowercased input text -> "IT" | "Non-IT"; a keyword edit above changes the version.
+# Memory only: one regex search is cheaper than a SQLite lookup (benchmarks/hot_parsers.py),
+# the persistent store is kept for taxonomy.categorize.
+IT_NON_IT_CACHE = ClassifierCache(
+    "it_non_it", fingerprint(_IT_ANY_RE.pattern, _classify_it_non_it), CONFIG.classify_cache_size
+)
 
 
 def classify_it_non_it(designation: str = "", industry: str = "", full_text: str = "") -> str:
     text = f"{designation} {industry} {full_text}".lower()
-
-    # ✅ longer phrases are safe as substring matches
-    phrase_keywords = [
-        "information technology",
-        "software development", "software engineer",
-        "full stack", "fullstack",
-        "data engineer", "data scientist",
-        "machine learning", "cybersecurity", "cyber security",
-        "system administrator", "technical support", "help desk", "helpdesk",
-        "cloud computing", "devops",
-        "rest api", "api development",
-    ]
-
-    # ✅ single words must be WHOLE WORD matches (avoid false positives)
-    word_keywords = [
-        "developer", "programmer", "engineer",
-        "python", "java", "javascript", "react", "node", "django", "flask",
-        "php", "laravel",
-        "docker", "kubernetes",
-        "aws", "azure", "gcp",
-        "network", "database", "sql",
-        "ai", "ml", "qa", "sdet",
-    ]
-
-    special_patterns = [
-        r"\.net\b",
-        r"\bc\+\+\b",
-        r"\bc#\b",
-        r"\bgolang\b",
-        r"\bgo\b",
-    ]
-
-    for k in phrase_keywords:
-        if k in text:
-            return "IT"
-
-    for w in word_keywords:
-        if re.search(rf"\b{re.escape(w)}\b", text):
-            return "IT"
-
-    for pat in special_patterns:
-        if re.search(pat, text):
-            return "IT"
-
-    return "Non-IT"
+    label = IT_NON_IT_CACHE.get(text)
+    if label is None:
+        label = _classify_it_non_it(text)
+        IT_NON_IT_CACHE.put(text, label)
+    return label
 
 def categorize_role_taxonomy(
     title: str = "",
@@ -259,354 +607,43 @@ def categorize_role_taxonomy(
       domain_l3: e.g. Next.js | SEO | Payroll ...
       tax_confidence: float 0..1
 
-    Rule-based and safe. You can expand keywords anytime.
-    """
-
-    def _norm(x: str) -> str:
-        x = (x or "").lower()
-        x = re.sub(r"\s+", " ", x).strip()
-        return x
-
-    text = _norm(f"{title} {skills} {position} {employment_type} {industry} {description}")
-
-    # -----------------------------
-    # 1) IT detection (reuse your robust signals)
-    # -----------------------------
-    it_phrase_keywords = [
-        "information technology",
-        "software development", "software engineer",
-        "full stack", "fullstack",
-        "data engineer", "data scientist",
-        "machine learning", "cybersecurity", "cyber security",
-        "system administrator", "technical support", "help desk", "helpdesk",
-        "cloud computing", "devops",
-        "rest api", "api development",
-    ]
-    it_word_keywords = [
-        "developer", "programmer", "engineer",
-        "python", "java", "javascript", "react", "node", "django", "flask",
-        "php", "laravel",
-        "docker", "kubernetes",
-        "aws", "azure", "gcp",
-        "network", "database", "sql",
-        "ai", "ml", "qa", "sdet",
-    ]
-    it_special_patterns = [
-        r"\.net\b",
-        r"\bc\+\+\b",
-        r"\bc#\b",
-        r"\bgolang\b",
-        r"\bgo\b",
-    ]
-
-    it_hits = 0
-    for k in it_phrase_keywords:
-        if k in text:
-            it_hits += 2
-    for w in it_word_keywords:
-        if re.search(rf"\b{re.escape(w)}\b", text):
-            it_hits += 1
-    for pat in it_special_patterns:
-        if re.search(pat, text):
-            it_hits += 2
-
-    is_it = it_hits >= 2
-
-    # -----------------------------
-    # 2) IT taxonomy (L1/L2/L3)
-    # -----------------------------
-    if is_it:
-        # L1 buckets
-        it_l1_rules = {
-            "Security": [r"\bsoc\b", "siem", "pentest", "penetration", "vulnerability", "blue team", "red team", "grc", "iso 27001", "owasp", "incident response"],
-            "DevOps": ["devops", "sre", "kubernetes", "docker", "ci/cd", "jenkins", "github actions", "terraform", "ansible", "helm", "prometheus", "grafana"],
-            "Data": ["data engineer", "etl", "data warehouse", "power bi", "tableau", "dbt", "spark", "hadoop", "analytics", "bi developer"],
-            "AI": ["machine learning", "deep learning", "nlp", "computer vision", "llm", "pytorch", "tensorflow", "genai", "generative ai"],
-            "Frontend": ["frontend", "front end", "react", "vue", "angular", "javascript", "typescript", "next.js", "nuxt", "tailwind", "html", "css"],
-            "Backend": ["backend", "back end", "api", "django", "fastapi", "flask", "spring", "node", "express", ".net", "asp.net", "laravel", "rails"],
-            "Mobile": ["android", "ios", "swift", "kotlin", "flutter", "react native", "xamarin"],
-            "QA": ["qa", "quality assurance", "sdet", "automation testing", "selenium", "cypress", "playwright", "jmeter"],
-            "IT-Other": ["system admin", "sysadmin", "it support", "helpdesk", "network engineer", "ccna", "linux admin", "windows server"],
-        }
-
-        def _score_bucket(rules: list) -> int:
-            s = 0
-            for r in rules:
-                if r.startswith(r"\b"):
-                    if re.search(r, text):
-                        s += 2
-                else:
-                    if r in text:
-                        s += 1
-            return s
-
-        l1_scores = {k: _score_bucket(v) for k, v in it_l1_rules.items()}
-        domain_l1 = max(l1_scores, key=lambda k: l1_scores[k]) if l1_scores else "IT-Other"
-        if l1_scores.get(domain_l1, 0) == 0:
-            domain_l1 = "IT-Other"
-
-        # L2 / L3
-        domain_l2 = None
-        domain_l3 = None
-
-        if domain_l1 == "Frontend":
-            if "react" in text:
-                domain_l2 = "React"
-                if "next" in text:
-                    domain_l3 = "Next.js"
-            elif "vue" in text:
-                domain_l2 = "Vue"
-                if "nuxt" in text:
-                    domain_l3 = "Nuxt"
-            elif "angular" in text:
-                domain_l2 = "Angular"
-            else:
-                domain_l2 = "Vanilla"
-
-        elif domain_l1 == "Backend":
-            if "python" in text:
-                domain_l2 = "Python"
-                if "django" in text:
-                    domain_l3 = "Django"
-                elif "fastapi" in text:
-                    domain_l3 = "FastAPI"
-                elif "flask" in text:
-                    domain_l3 = "Flask"
-            elif ".net" in text or "asp.net" in text or "c#" in text:
-                domain_l2 = ".NET"
-                if "asp.net" in text:
-                    domain_l3 = "ASP.NET"
-            elif "java" in text:
-                domain_l2 = "Java"
-                if "spring" in text:
-                    domain_l3 = "Spring"
-            elif "node" in text or "express" in text:
-                domain_l2 = "Node"
-                if "express" in text:
-                    domain_l3 = "Express"
-            elif "php" in text:
-                domain_l2 = "PHP"
-                if "laravel" in text:
-                    domain_l3 = "Laravel"
-
-        elif domain_l1 == "AI":
-            if "nlp" in text or "language model" in text or "llm" in text:
-                domain_l2 = "NLP"
-            elif "computer vision" in text or "opencv" in text:
-                domain_l2 = "CV"
-            else:
-                domain_l2 = "ML"
-
-            if "pytorch" in text:
-                domain_l3 = "PyTorch"
-            elif "tensorflow" in text:
-                domain_l3 = "TensorFlow"
-
-        elif domain_l1 == "Data":
-            if "data engineer" in text or "etl" in text:
-                domain_l2 = "Engineering"
-            elif "power bi" in text or "tableau" in text or "analytics" in text:
-                domain_l2 = "Analytics"
-            else:
-                domain_l2 = "Science"
-
-        elif domain_l1 == "Security":
-            if "soc" in text or "siem" in text:
-                domain_l2 = "SOC"
-            elif "pentest" in text or "penetration" in text:
-                domain_l2 = "Offensive"
-            elif "grc" in text or "compliance" in text:
-                domain_l2 = "GRC"
-            else:
-                domain_l2 = "Defensive"
-
-        elif domain_l1 == "DevOps":
-            if "kubernetes" in text or "helm" in text:
-                domain_l2 = "Kubernetes"
-            elif "terraform" in text or "iac" in text:
-                domain_l2 = "IaC"
-            elif "ci/cd" in text or "jenkins" in text or "github actions" in text:
-                domain_l2 = "CI/CD"
-            else:
-                domain_l2 = "Cloud"
-
-        elif domain_l1 == "QA":
-            if "automation" in text or "selenium" in text or "cypress" in text or "playwright" in text:
-                domain_l2 = "Automation"
-            else:
-                domain_l2 = "Manual"
-
-        elif domain_l1 == "Mobile":
-            if "flutter" in text:
-                domain_l2 = "Cross-platform"
-                domain_l3 = "Flutter"
-            elif "react native" in text:
-                domain_l2 = "Cross-platform"
-                domain_l3 = "React Native"
-            elif "android" in text or "kotlin" in text:
-                domain_l2 = "Android"
-            elif "ios" in text or "swift" in text:
-                domain_l2 = "iOS"
-            else:
-                domain_l2 = "Cross-platform"
-
-        # confidence: based on it_hits + l1 score
-        base = min(1.0, 0.35 + (it_hits * 0.08) + (l1_scores.get(domain_l1, 0) * 0.05))
-
-        return {
-            "category_primary": "IT",
-            "domain_l1": domain_l1,
-            "domain_l2": domain_l2,
-            "domain_l3": domain_l3,
-            "tax_confidence": round(float(base), 3),
-        }
-
-    # -----------------------------
-    # 3) NON-IT taxonomy (L1/L2/L3)
-    # -----------------------------
-    non_it_rules = {
-        "Sales": ["sales", "business development", "b2b", "b2c", "account executive", "lead generation", "cold call", "crm", "pipeline", "inside sales", "field sales"],
-        "Marketing": ["marketing", "seo", "sem", "google ads", "facebook ads", "content", "copywriting", "brand", "social media", "digital marketing", "growth"],
-        "Finance": ["finance", "account", "accounting", "audit", "tax", "vat", "payroll", "budget", "cfo", "controller", "banking", "treasury"],
-        "HR": ["human resource", "hr", "recruit", "talent", "onboarding", "payroll", "performance", "training", "compensation", "benefits"],
-        "Operations": ["operations", "admin", "administration", "office", "procurement", "supply chain", "inventory", "warehouse", "compliance", "process"],
-        "Customer Support": ["customer support", "customer service", "call center", "support", "helpdesk", "complaint", "ticket", "csr"],
-        "Education": ["teacher", "teaching", "instructor", "lecturer", "school", "college", "curriculum", "tutor", "training"],
-        "Healthcare": ["nurse", "doctor", "medical", "clinic", "hospital", "pharmacy", "lab", "health", "dentist", "radiology"],
-        "Engineering": ["civil engineer", "mechanical engineer", "electrical engineer", "architect", "construction", "site engineer", "autocad", "quantity surveyor"],
-        "Legal": ["legal", "lawyer", "advocate", "paralegal", "contract", "litigation", "compliance officer"],
-        "Hospitality": ["hotel", "restaurant", "chef", "cook", "barista", "waiter", "front desk", "housekeeping", "hospitality"],
-        "Logistics": ["logistics", "delivery", "driver", "fleet", "transport", "shipment", "dispatch", "courier", "import", "export", "customs"],
-        "Design": ["graphic designer", "designer", "photoshop", "illustrator", "indesign", "video editor", "motion graphics", "premiere", "after effects"],
-        "Management": ["manager", "project manager", "product manager", "team lead", "director", "head of", "supervisor", "coordinator"],
-        "Non-IT-Other": [],
-    }
-
-    def _score_list(lst) -> int:
-        s = 0
-        for k in lst:
-            if k in text:
-                # phrases get higher weight
-                s += 2 if " " in k else 1
-        return s
-
-    scores = {k: _score_list(v) for k, v in non_it_rules.items()}
-    domain_l1 = max(scores, key=lambda k: scores[k]) if scores else "Non-IT-Other"
-    if scores.get(domain_l1, 0) == 0:
-        domain_l1 = "Non-IT-Other"
-
-    domain_l2 = None
-    domain_l3 = None
-
-    # L2/L3 specialization examples
-    if domain_l1 == "Sales":
-        if "b2b" in text:
-            domain_l2 = "B2B"
-        elif "b2c" in text:
-            domain_l2 = "B2C"
-        else:
-            domain_l2 = "General"
-        if "crm" in text or "salesforce" in text:
-            domain_l3 = "CRM"
-
-    elif domain_l1 == "Marketing":
-        if "seo" in text:
-            domain_l2 = "SEO"
-        elif "sem" in text or "google ads" in text:
-            domain_l2 = "Performance"
-            domain_l3 = "Google Ads" if "google ads" in text else None
-        elif "social media" in text:
-            domain_l2 = "Social"
-        else:
-            domain_l2 = "General"
-
-    elif domain_l1 == "Finance":
-        if "audit" in text:
-            domain_l2 = "Audit"
-        elif "tax" in text or "vat" in text:
-            domain_l2 = "Tax"
-        elif "payroll" in text:
-            domain_l2 = "Payroll"
-        else:
-            domain_l2 = "Accounting"
-
-    elif domain_l1 == "HR":
-        if "recruit" in text or "talent" in text:
-            domain_l2 = "Recruitment"
-        elif "training" in text or "l&d" in text:
-            domain_l2 = "L&D"
-        elif "payroll" in text:
-            domain_l2 = "Payroll"
-        else:
-            domain_l2 = "General"
-
-    elif domain_l1 == "Operations":
-        if "procurement" in text:
-            domain_l2 = "Procurement"
-        elif "supply chain" in text or "inventory" in text:
-            domain_l2 = "Supply Chain"
-        elif "admin" in text or "administration" in text or "office" in text:
-            domain_l2 = "Admin"
-        else:
-            domain_l2 = "General"
-
-    elif domain_l1 == "Customer Support":
-        if "call center" in text:
-            domain_l2 = "Call Center"
-        elif "chat" in text:
-            domain_l2 = "Chat Support"
-        else:
-            domain_l2 = "General"
-
-    elif domain_l1 == "Engineering":
-        if "civil" in text:
-            domain_l2 = "Civil"
-        elif "mechanical" in text:
-            domain_l2 = "Mechanical"
-        elif "electrical" in text:
-            domain_l2 = "Electrical"
-        elif "architect" in text:
-            domain_l2 = "Architecture"
-        else:
-            domain_l2 = "General"
-
-    elif domain_l1 == "Healthcare":
-        if "nurse" in text:
-            domain_l2 = "Nursing"
-        elif "pharmacy" in text:
-            domain_l2 = "Pharmacy"
-        elif "lab" in text:
-            domain_l2 = "Lab"
-        else:
-            domain_l2 = "General"
-
-    elif domain_l1 == "Design":
-        if "video" in text or "premiere" in text or "after effects" in text:
-            domain_l2 = "Video"
-        else:
-            domain_l2 = "Graphic"
-
-    elif domain_l1 == "Management":
-        if "project manager" in text:
-            domain_l2 = "Project"
-        elif "product manager" in text:
-            domain_l2 = "Product"
-        else:
-            domain_l2 = "General"
-
-    # confidence: based on best bucket score
-    best = scores.get(domain_l1, 0)
-    conf = min(1.0, 0.30 + (best * 0.12))
-    if domain_l1 == "Non-IT-Other":
-        conf = 0.35
-
-    return {
-        "category_primary": "Non-IT",
-        "domain_l1": domain_l1,
-        "domain_l2": domain_l2,
-        "domain_l3": domain_l3,
-        "tax_confidence": round(float(conf), 3),
-    }
+    Rule-based and safe. Rules live in resources/taxonomy_rules.json (compiled by taxonomy.py).
+    """
+    return taxonomy.categorize(title, skills, position, employment_type, description, industry)
+
+
+def categorize_role_taxonomy_batch(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    categorize_role_taxonomy() for a whole DataFrame.
+    Reads title / skills / position / employment_type / description / industry
+    (missing columns and NA cells = ""), returns the five taxonomy columns on df's index.
+    """
+    return taxonomy.categorize_batch(df)
+
+
+# =========================
+# Experience / salary parsers (compiled once)
+# =========================
+def _num(name: str) -> str:
+    return rf"(?P<{name}>\d+(?:\.\d+)?)"
+
+
+# kinds in priority order (range > "N+" > "more than N" > "N year")
+_EXPERIENCE_KINDS = {
+    "range": rf"{_num('lo')}\s*-\s*{_num('hi')}\s*year",
+    "plus": rf"{_num('plus_n')}\s*\+\s*year",
+    "more": rf"more than\s*{_num('more_n')}\s*year",
+    "single": rf"{_num('n')}\s*year",
+}
+
+# one left-to-right pass over all kinds.
+# No match of a lower kind can swallow the start of a higher one (all of them end at "year"),
+# so the first match of each kind equals a separate re.search() for that kind.
+_EXPERIENCE_RE = re.compile("|".join(f"(?P<{kind}>{p})" for kind, p in _EXPERIENCE_KINDS.items()))
+
+_SALARY_HIDDEN = ("not disclosed", "based on experience", "negotiable")
+_SALARY_NPR = ("npr", "rs", "रु")
+_SALARY_NUMBER_RE = re.compile(r"\d[\d,]*")
 
 
 def normalize_experience_years(experience_raw: Optional[str]) -> Tuple[Optional[float], Optional[float]]:
@@ -618,21 +655,24 @@ def normalize_experience_years(experience_raw: Optional[str]) -> Tuple[Optional[
     if "not required" in s or "no experience" in s:
         return 0.0, 0.0
 
-    m = re.search(r"(\d+(\.\d+)?)\s*-\s*(\d+(\.\d+)?)\s*year", s)
-    if m:
-        return float(m.group(1)), float(m.group(3))
-
-    m = re.search(r"(\d+(\.\d+)?)\s*\+\s*year", s)
-    if m:
-        return float(m.group(1)), None
-
-    m = re.search(r"more than\s*(\d+(\.\d+)?)\s*year", s)
-    if m:
-        return float(m.group(1)), None
+    if "year" not in s:  # every pattern ends in "year"
+        return None, None
 
-    m = re.search(r"(\d+(\.\d+)?)\s*year", s)
-    if m:
-        v = float(m.group(1))
+    first: Dict[str, "re.Match[str]"] = {}
+    for m in _EXPERIENCE_RE.finditer(s):
+        if m.lastgroup not in first:
+            first[m.lastgroup] = m
+            if m.lastgroup == "range":
+                break
+
+    if "range" in first:
+        return float(first["range"].group("lo")), float(first["range"].group("hi"))
+    if "plus" in first:
+        return float(first["plus"].group("plus_n")), None
+    if "more" in first:
+        return float(first["more"].group("more_n")), None
+    if "single" in first:
+        v = float(first["single"].group("n"))
         return v, v
 
     return None, None
@@ -649,12 +689,10 @@ def normalize_salary(salary_raw: Optional[str]) -> Tuple[Optional[int], Optional
     s = salary_raw.strip()
     low = s.lower()
 
-    if any(k in low for k in ["not disclosed", "based on experience", "negotiable"]):
+    if any(k in low for k in _SALARY_HIDDEN):
         return None, None, None, None
 
-    currency = None
-    if any(k in low for k in ["npr", "rs", "रु"]):
-        currency = "NPR"
+    currency = "NPR" if any(k in low for k in _SALARY_NPR) else None
 
     period = None
     if "month" in low:
@@ -664,7 +702,7 @@ def normalize_salary(salary_raw: Optional[str]) -> Tuple[Optional[int], Optional
     elif "day" in low:
         period = "day"
 
-    nums = [int(x.replace(",", "")) for x in re.findall(r"(\d[\d,]*)", s)]
+    nums = [int(x.replace(",", "")) for x in _SALARY_NUMBER_RE.findall(s)]
     if not nums:
         return None, None, currency, period
 
@@ -676,3 +714,126 @@ def normalize_salary(salary_raw: Optional[str]) -> Tuple[Optional[int], Optional
 
 def parse_salary(salary_raw: Optional[str]) -> Tuple[Optional[int], Optional[int], Optional[str], Optional[str]]:
     return normalize_salary(salary_raw)
+
+
+# =========================
+# Experience / salary over whole columns (master build)
+# =========================
+# Same regexes and precedence as the scalar parsers above, one pandas pass per
+# column instead of one Python call per row. Parity: benchmarks/hot_parsers.py
+SALARY_COLS = ["salary_min", "salary_max", "salary_currency", "salary_period"]
+EXPERIENCE_COLS = ["exp_min_years", "exp_max_years"]
+
+_INT64_MAX = 2**63 - 1
+
+
+def _py_strings(values: pd.Series) -> pd.Series:
+    # Python str semantics (str.lower, \d in any script), "" -> NA like `not raw`; positional index
+    return values.reset_index(drop=True).astype(pd.StringDtype("python")).replace("", pd.NA)
+
+
+def _contains_any(s: pd.Series, terms: Sequence[str]) -> np.ndarray:
+    hit = np.zeros(len(s), dtype=bool)
+    for term in terms:
+        hit |= s.str.contains(term, regex=False).fillna(False).to_numpy(dtype=bool)
+    return hit
+
+
+def _numbers(strings: pd.Series, cast: Callable, dtype: str) -> pd.Series:
+    """
+    Captured number strings -> dtype. ASCII digits in one numpy cast, anything else
+    (Devanagari digits, huge digit runs) through int()/float() like the scalar parsers.
+    """
+    out = pd.Series(pd.NA, index=strings.index, dtype=dtype)
+    fast = strings.str.fullmatch(r"[0-9.]{1,18}").fillna(False).to_numpy(dtype=bool)
+    if fast.any():
+        out[fast] = strings[fast].to_numpy(dtype=object).astype(np.int64 if dtype == "Int64" else np.float64)
+    slow = strings[~fast].dropna().map(cast)
+    if dtype == "Int64":
+        slow = slow[slow.abs() <= _INT64_MAX]
+    if len(slow):
+        out[slow.index] = slow.astype(dtype)
+    return out
+
+
+def _per_unique(values: pd.Series, parse: Callable[[pd.Series], pd.DataFrame]) -> pd.DataFrame:
+    # master columns repeat heavily: parse each distinct value once, then broadcast back
+    codes, uniques = pd.factorize(values.astype(pd.StringDtype("python")))
+    codes = np.where(codes < 0, len(uniques), codes)
+    parsed = parse(pd.Series(uniques).reindex(range(len(uniques) + 1)))  # last row = missing
+    return parsed.take(codes).set_axis(values.index)
+
+
+def _salary_frame(values: pd.Series) -> pd.DataFrame:
+    s = _py_strings(values).str.strip()
+    low = s.str.lower()
+    live = s.notna().to_numpy(dtype=bool) & ~_contains_any(low, _SALARY_HIDDEN)
+
+    currency = np.where(live & _contains_any(low, _SALARY_NPR), "NPR", None)
+    period = np.select(
+        [_contains_any(low, ("month",)), _contains_any(low, ("year", "annum")), _contains_any(low, ("day",))],
+        ["month", "year", "day"],
+        default=None,
+    )
+    out = pd.DataFrame({
+        "salary_min": pd.Series(pd.NA, index=s.index, dtype="Int64"),
+        "salary_max": pd.Series(pd.NA, index=s.index, dtype="Int64"),
+        "salary_currency": pd.Series(currency, dtype="string"),
+        "salary_period": pd.Series(np.where(live, period, None), dtype="string"),
+    })
+
+    if live.any():
+        found = s[live].str.extractall(f"({_SALARY_NUMBER_RE.pattern})")
+        if len(found):
+            nums = _numbers(found[0].str.replace(",", "", regex=False), int, "Int64")
+            by_row = nums.groupby(level=0)
+            overflow = nums.isna().groupby(level=0).any()
+            lo, hi = by_row.min().mask(overflow), by_row.max().mask(overflow)
+            out.loc[lo.index, "salary_min"] = lo
+            out.loc[hi.index, "salary_max"] = hi
+    return out
+
+
+def _experience_frame(values: pd.Series) -> pd.DataFrame:
+    s = _py_strings(values).str.lower().str.strip()
+    present = s.notna().to_numpy(dtype=bool)
+    zero = present & _contains_any(s, ("not required", "no experience"))
+    pending = present & ~zero & _contains_any(s, ("year",))
+
+    lo = pd.Series(pd.NA, index=s.index, dtype="Float64")
+    hi = pd.Series(pd.NA, index=s.index, dtype="Float64")
+
+    # first match of each kind, highest kind wins (same as the finditer pass)
+    for kind, pattern in _EXPERIENCE_KINDS.items():
+        if not pending.any():
+            break
+        found = s[pending].str.extract(pattern)
+        found = found[found.iloc[:, 0].notna()]
+        if not len(found):
+            continue
+        first = _numbers(found.iloc[:, 0], float, "Float64")
+        lo[found.index] = first
+        if kind == "range":
+            hi[found.index] = _numbers(found.iloc[:, 1], float, "Float64")
+        elif kind == "single":
+            hi[found.index] = first
+        pending[found.index.to_numpy()] = False
+
+    lo[zero] = 0.0
+    hi[zero] = 0.0
+    return pd.DataFrame({"exp_min_years": lo, "exp_max_years": hi})
+
+
+def normalize_salary_columns(values: pd.Series) -> pd.DataFrame:
+    """
+    normalize_salary() over a whole column -> SALARY_COLS (Int64 min/max, string currency/period).
+    A digit run too big for int64 (phone numbers, IDs) leaves that row's min/max NA.
+    """
+    return _per_unique(values, _salary_frame)
+
+
+def normalize_experience_columns(values: pd.Series) -> pd.DataFrame:
+    """
+    normalize_experience_years() over a whole column -> EXPERIENCE_COLS (Float64).
+    """
+    return _per_unique(values, _experience_frame)
@@ -0,0 +1,606 @@
+# taxonomy.py
+from __future__ import annotations
+
+import json
+import os
+import pickle
+import re
+import threading
+import time
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+import pandas as pd
+
+from classify_cache import ClassifierCache, fingerprint
+from config import CONFIG
+
+
+# =========================
+# Role taxonomy engine
+# =========================
+# categorize_role_taxonomy() used to rebuild its keyword lists and run ~30
+# re.search() calls + ~150 substring scans per row. Here every keyword is
+# compiled once into a trie-shaped regex (KeywordMatcher); one pass over the
+# text's words yields every keyword hit, scoring walks only the hits, and the
+# L2 / L3 decision tables read hits from a set. Output is identical to the
+# original rules (see benchmarks/taxonomy_parity.py).
+#
+# The rules themselves are data: resources/taxonomy_rules.json
+#   it_signals          weighted keywords; score >= min_score => IT
+#   it_l1 / non_it_l1   ordered buckets of weighted keywords (first highest score wins)
+#   it_l2_l3 / ...      per-L1 decision tables: first row whose "any" term hits gives
+#                       L2 (a row without "any" always matches); L3 from the row's own
+#                       "l3" table, else the L1's "l3" table
+#   confidence          the tax_confidence formula's constants
+#
+# Keyword kinds (same semantics as the original rules):
+#   "substring"  "sales"          -> anywhere in the text (decision-table terms too)
+#   "word"       "java"           -> whole word (\b on both sides)
+#   "regex"      r"\.net\b"       -> literal with optional \b at either end
+#
+# The compiled engine is pickled per rules version under resources/_compiled/
+# and loaded lazily on first use.
+
+ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
+RULES_PATH = os.path.join(ROOT_DIR, "resources", "taxonomy_rules.json")
+ARTIFACT_DIR = os.path.join(ROOT_DIR, "resources", "_compiled")
+
+TAX_COLS = ["category_primary", "domain_l1", "domain_l2", "domain_l3", "tax_confidence"]
+
+# categorize() argument names, in the order their text is joined
+TEXT_COLS = ["title", "skills", "position", "employment_type", "industry", "description"]
+
+
+
+# =========================
+# Compiled matcher
+# =========================
+Term = Tuple[str, bool, bool]  # (literal, \b before, \b after)
+
+_ESCAPED = re.compile(r"\\(.)")
+_LITERAL_BODY = re.compile(r"(?:\\.|[^\\.^$*+?{}\[\]|()])+")
+
+
+def parse_term(rule: str, regex: bool = True) -> Term:
+    """
+    r"\bc\+\+\b" -> ("c++", True, True); r"\.net\b" -> (".net", False, True)
+    regex=False: plain substring keyword -> ("sales", False, False)
+    Only literals with optional \b at either end are supported.
+    """
+    if not regex:
+        return rule, False, False
+    left = rule.startswith(r"\b")
+    right = rule.endswith(r"\b") and len(rule) > 2
+    body = rule[2 if left else 0: len(rule) - 2 if right else len(rule)]
+    if not _LITERAL_BODY.fullmatch(body):
+        raise ValueError(f"Unsupported taxonomy rule (literal with optional \\b only): {rule!r}")
+    return _ESCAPED.sub(r"\1", body), left, right
+
+
+_WORD_RUN = re.compile(r"\w+")
+
+WORD_CACHE_MAX = 200_000  # distinct words remembered by the matcher
+
+
+def _is_word_literal(lit: str) -> bool:
+    return bool(lit) and all(ch.isalnum() or ch == "_" for ch in lit)  # same as regex \w
+
+
+def _term_regex(term: Term) -> "re.Pattern[str]":
+    lit, left, right = term
+    return re.compile((r"\b" if left else "") + re.escape(lit) + (r"\b" if right else ""))
+
+
+def _trie_regex(literals: Iterable[str]) -> str:
+    """
+    Literals -> one regex whose greedy match at a position is the LONGEST literal there.
+    """
+    root: Dict = {}
+    for lit in literals:
+        node = root
+        for ch in lit:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def _pattern(node: Dict) -> str:
+        alts = [re.escape(ch) + _pattern(child) for ch, child in sorted(node.items()) if ch != ""]
+        if not alts:
+            return ""
+        body = alts[0] if len(alts) == 1 else "(?:" + "|".join(alts) + ")"
+        return "(?:" + body + ")?" if "" in node else body
+
+    return _pattern(root)
+
+
+def term_key(term: Term):
+    # plain keywords are keyed by their literal, \b-terms by the whole tuple
+    return term if (term[1] or term[2]) else term[0]
+
+
+class Hits:
+    """
+    Result of one scan: `keys` holds every present literal and every matching \b-term.
+    """
+
+    __slots__ = ("keys",)
+
+    def __init__(self, keys: Set):
+        self.keys = keys
+
+    def has(self, literal: str) -> bool:
+        return literal in self.keys
+
+    def matches(self, term: Term) -> bool:
+        return term_key(term) in self.keys
+
+
+class WeightedBuckets:
+    """
+    Bucket scores = sum of weights of the bucket's terms that hit.
+    Walks the (few) hits instead of every rule.
+    """
+
+    def __init__(self, buckets: List[Tuple[str, List[Tuple[Term, int]]]]):
+        self.names = [name for name, _ in buckets]
+        self.terms = [term for _, rules in buckets for term, _ in rules]
+        self._index: Dict = {}
+        for b, (_, rules) in enumerate(buckets):
+            for term, weight in rules:
+                self._index.setdefault(term_key(term), []).append((b, weight))
+
+    def scores(self, hits: Hits) -> List[Tuple[str, int]]:
+        totals = [0] * len(self.names)
+        index = self._index
+        for key in hits.keys:
+            for b, weight in index.get(key, ()):
+                totals[b] += weight
+        return list(zip(self.names, totals))
+
+    def batch_scores(self, rows: np.ndarray, keys: List, n_rows: int) -> np.ndarray:
+        """
+        Sparse hit matrix (hit i = row rows[i] has keys[i]) -> (n_rows, n_buckets) int scores.
+        """
+        out = np.zeros((n_rows, len(self.names)), dtype=np.int64)
+        entries = [(r, b, w) for r, k in zip(rows, keys) for b, w in self._index.get(k, ())]
+        if entries:
+            r, b, w = (np.asarray(x, dtype=np.int64) for x in zip(*entries))
+            np.add.at(out, (r, b), w)
+        return out
+
+
+class KeywordMatcher:
+    """
+    Every keyword compiled into one trie regex over "atoms" (runs of word characters).
+
+    scan(text):
+      1) one regex pass splits the text into word runs (\w+)
+      2) each distinct run is matched against the trie once and remembered,
+         so repeated words (across rows too) cost a dict lookup
+      3) multi-word / punctuated keywords ("power bi", "ci/cd", ".net") are
+         confirmed with one substring check, only when all their atoms were seen
+      4) \b-terms: a pure-word term equals a whole run; others use their regex,
+         again only when the literal is present
+    """
+
+    def __init__(self, terms: Iterable[Term]):
+        terms = list(dict.fromkeys(terms))
+        literals = sorted({t[0] for t in terms})
+        self.terms = terms
+
+        self._phrases: List[Tuple[str, FrozenSet[str]]] = [
+            (lit, frozenset(_WORD_RUN.findall(lit))) for lit in literals if not _is_word_literal(lit)
+        ]
+        atoms = sorted({lit for lit in literals if _is_word_literal(lit)} | {a for _, parts in self._phrases for a in parts})
+
+        # zero-width lookahead => the longest atom at every start position (overlaps included)
+        self._atom_regex = re.compile("(?=(" + _trie_regex(atoms) + "))") if atoms else None
+        # a hit of `longest` is also a hit of every atom that prefixes it
+        self._prefixes: Dict[str, Tuple[str, ...]] = {a: tuple(p for p in atoms if a.startswith(p)) for a in atoms}
+
+        self._bounded: List[Tuple[Term, Optional["re.Pattern[str]"]]] = [
+            (t, None if (t[1] and t[2] and _is_word_literal(t[0])) else _term_regex(t))
+            for t in terms
+            if t[1] or t[2]
+        ]
+
+        # scan() only visits rules whose literal / first atom was seen
+        self._phrases_by_atom: Dict[str, List[Tuple[str, FrozenSet[str]]]] = {}
+        for lit, parts in self._phrases:
+            self._phrases_by_atom.setdefault(min(parts), []).append((lit, parts))
+        self._bounded_by_literal: Dict[str, List[Tuple[Term, Optional["re.Pattern[str]"]]]] = {}
+        for term, rx in self._bounded:
+            self._bounded_by_literal.setdefault(term[0], []).append((term, rx))
+        self._word_cache: Dict[str, FrozenSet[str]] = {}
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # the word cache is per process, not part of the compiled artifact
+        return {**self.__dict__, "_word_cache": {}}
+
+    def _atoms_in(self, word: str) -> FrozenSet[str]:
+        found = self._word_cache.get(word)
+        if found is None:
+            found = frozenset(
+                a for m in self._atom_regex.finditer(word) for a in self._prefixes[m.group(1)]
+            ) if self._atom_regex is not None else frozenset()
+            if len(self._word_cache) >= WORD_CACHE_MAX:
+                self._word_cache.clear()
+            self._word_cache[word] = found
+        return found
+
+    def scan(self, text: str) -> Hits:
+        words = set(_WORD_RUN.findall(text))
+
+        cache = self._word_cache
+        present: Set[str] = set().union(*[
+            found if (found := cache.get(w)) is not None else self._atoms_in(w) for w in words
+        ])
+
+        phrases = self._phrases_by_atom
+        for atom in [a for a in present if a in phrases]:
+            for lit, parts in phrases[atom]:
+                if parts <= present and lit in text:
+                    present.add(lit)
+
+        keys: Set = set(present)
+        bounded = self._bounded_by_literal
+        for lit in [p for p in present if p in bounded]:
+            for term, rx in bounded[lit]:
+                if (lit in words) if rx is None else (rx.search(text) is not None):
+                    keys.add(term)
+        return Hits(keys)
+
+
+# =========================
+# Rules file -> compiled engine
+# =========================
+Row = Tuple[Optional[FrozenSet[str]], str, Optional[Tuple]]   # (any-terms or None, value, own l3 rows or None)
+
+_KINDS = {
+    "substring": lambda k: (k, False, False),
+    "word": lambda k: (k, True, True),
+    "regex": parse_term,
+}
+
+
+def _weighted_terms(groups: List[Dict]) -> List[Tuple[Term, int]]:
+    out: List[Tuple[Term, int]] = []
+    for g in groups:
+        kind = g.get("kind", "substring")
+        if kind not in _KINDS:
+            raise ValueError(f"Unknown taxonomy keyword kind {kind!r} (expected one of {sorted(_KINDS)})")
+        out += [(_KINDS[kind](k), int(g.get("weight", 1))) for k in g["terms"]]
+    return out
+
+
+def _rows(table: List[Dict]) -> Tuple[Row, ...]:
+    return tuple(
+        (frozenset(r["any"]) if r.get("any") else None, r["value"], _rows(r["l3"]) if "l3" in r else None)
+        for r in table
+    )
+
+
+def _first(rows: Tuple[Row, ...], keys: Set) -> Optional[Row]:
+    for row in rows:
+        if row[0] is None or not keys.isdisjoint(row[0]):
+            return row
+    return None
+
+
+def _best(scores: List[Tuple[str, int]], default: str) -> Tuple[str, int]:
+    # first bucket with the highest score (file order), `default` when nothing scored
+    name, score = default, 0
+    for k, s in scores:
+        if s > score:
+            name, score = k, s
+    return name, score
+
+
+def _pick(scores: np.ndarray, names: List[str], default: str) -> Tuple[np.ndarray, np.ndarray]:
+    # vectorized _best(): first column with the row max, `default` when the row is all zeros
+    best = scores.max(axis=1)
+    labels = np.asarray(names, dtype=object)[scores.argmax(axis=1)]
+    return np.where(best > 0, labels, default), best
+
+
+class TaxonomyEngine:
+    """
+    One rules file, compiled: keyword matcher, bucket scorers, L2/L3 decision tables.
+    Picklable (see compile_rules).
+    """
+
+    def __init__(self, rules: Dict, version: str):
+        self.version = version
+
+        signals = rules["it_signals"]
+        self.it_min_score = int(signals["min_score"])
+        self.it_signals = WeightedBuckets([("IT", _weighted_terms(signals["rules"]))])
+
+        self.it_default = rules["it_l1"]["default"]
+        self.it_l1 = WeightedBuckets([(b["name"], _weighted_terms(b["rules"])) for b in rules["it_l1"]["buckets"]])
+        self.non_it_default = rules["non_it_l1"]["default"]
+        self.non_it_l1 = WeightedBuckets([(b["name"], _weighted_terms(b["rules"])) for b in rules["non_it_l1"]["buckets"]])
+
+        # L1 -> (l2 rows, l3 rows)
+        self.it_tables = {l1: (_rows(t["l2"]), _rows(t.get("l3", []))) for l1, t in rules["it_l2_l3"].items()}
+        self.non_it_tables = {l1: (_rows(t["l2"]), _rows(t.get("l3", []))) for l1, t in rules["non_it_l2_l3"].items()}
+
+        conf = rules["confidence"]
+        self.conf_it = conf["it"]
+        self.conf_non_it = conf["non_it"]
+        self.conf_max = float(conf["max"])
+        self.conf_digits = int(conf["digits"])
+
+        def _table_terms(tables: Dict) -> Set[str]:
+            terms: Set[str] = set()
+            stack = [rows for l2, l3 in tables.values() for rows in (l2, l3)]
+            while stack:
+                for any_terms, _, sub in stack.pop():
+                    terms |= any_terms or set()
+                    if sub:
+                        stack.append(sub)
+            return terms
+
+        decision_terms = _table_terms(self.it_tables) | _table_terms(self.non_it_tables)
+        self.matcher = KeywordMatcher(
+            self.it_signals.terms
+            + self.it_l1.terms
+            + self.non_it_l1.terms
+            + [(k, False, False) for k in sorted(decision_terms)]
+        )
+
+    # -------------------------
+    # Rule pieces
+    # -------------------------
+    @staticmethod
+    def _l2_l3(tables: Dict, l1: str, keys: Set) -> Tuple[Optional[str], Optional[str]]:
+        table = tables.get(l1)
+        if table is None:
+            return None, None
+        l2_rows, l3_rows = table
+        row = _first(l2_rows, keys)
+        if row is None:
+            return None, None
+        l3 = _first(row[2] if row[2] is not None else l3_rows, keys)
+        return row[1], (l3[1] if l3 is not None else None)
+
+    def it_confidence(self, it_hits: int, l1_score: int) -> float:
+        c = self.conf_it
+        return round(float(min(self.conf_max, c["base"] + (it_hits * c["per_signal"]) + (l1_score * c["per_l1_point"]))), self.conf_digits)
+
+    def non_it_confidence(self, domain_l1: str, best: int) -> float:
+        c = self.conf_non_it
+        if domain_l1 == self.non_it_default:
+            return round(float(c["default_l1"]), self.conf_digits)
+        return round(float(min(self.conf_max, c["base"] + (best * c["per_l1_point"]))), self.conf_digits)
+
+    # -------------------------
+    # Classification
+    # -------------------------
+    def classify_text(self, text: str) -> Dict[str, Optional[str]]:
+        """
+        Taxonomy for already-normalized text (lowercase, single spaces).
+        """
+        h = self.matcher.scan(text)
+        it_hits = self.it_signals.scores(h)[0][1]
+
+        if it_hits >= self.it_min_score:
+            domain_l1, l1_score = _best(self.it_l1.scores(h), self.it_default)
+            domain_l2, domain_l3 = self._l2_l3(self.it_tables, domain_l1, h.keys)
+            return {
+                "category_primary": "IT",
+                "domain_l1": domain_l1,
+                "domain_l2": domain_l2,
+                "domain_l3": domain_l3,
+                "tax_confidence": self.it_confidence(it_hits, l1_score),
+            }
+
+        domain_l1, best = _best(self.non_it_l1.scores(h), self.non_it_default)
+        domain_l2, domain_l3 = self._l2_l3(self.non_it_tables, domain_l1, h.keys)
+        return {
+            "category_primary": "Non-IT",
+            "domain_l1": domain_l1,
+            "domain_l2": domain_l2,
+            "domain_l3": domain_l3,
+            "tax_confidence": self.non_it_confidence(domain_l1, best),
+        }
+
+    def classify_texts(self, texts: Iterable[str]) -> pd.DataFrame:
+        """
+        classify_text() for many already-normalized texts at once (TAX_COLS, one row per text).
+        Keyword hits form a sparse row x keyword matrix; bucket scores, the best L1 and
+        the IT / Non-IT split are computed column-wise. L2 / L3 still read each row's hits.
+        """
+        texts = list(texts)
+        n = len(texts)
+        hits = [self.matcher.scan(t) for t in texts]
+
+        rows = np.repeat(np.arange(n), [len(h.keys) for h in hits])
+        keys = [k for h in hits for k in h.keys]
+
+        it_hits = self.it_signals.batch_scores(rows, keys, n)[:, 0]
+        is_it = it_hits >= self.it_min_score
+
+        it_l1, it_score = _pick(self.it_l1.batch_scores(rows, keys, n), self.it_l1.names, self.it_default)
+        non_l1, non_score = _pick(self.non_it_l1.batch_scores(rows, keys, n), self.non_it_l1.names, self.non_it_default)
+        domain_l1 = np.where(is_it, it_l1, non_l1)
+
+        l2_l3 = [
+            self._l2_l3(self.it_tables if it else self.non_it_tables, l1, h.keys)
+            for l1, h, it in zip(domain_l1, hits, is_it)
+        ]
+
+        # confidence depends on two small ints: evaluate each distinct pair once (exact same float math)
+        conf_cache: Dict[Tuple, float] = {}
+        conf = []
+        for it, n_it, l1, s_it, s_non in zip(is_it, it_hits, domain_l1, it_score, non_score):
+            key = (True, int(n_it), int(s_it)) if it else (False, l1, int(s_non))
+            if key not in conf_cache:
+                conf_cache[key] = self.it_confidence(key[1], key[2]) if it else self.non_it_confidence(key[1], key[2])
+            conf.append(conf_cache[key])
+
+        return pd.DataFrame(
+            {
+                "category_primary": np.where(is_it, "IT", "Non-IT").astype(object),
+                "domain_l1": domain_l1,
+                "domain_l2": [x[0] for x in l2_l3],
+                "domain_l3": [x[1] for x in l2_l3],
+                "tax_confidence": np.asarray(conf, dtype=float),
+            },
+            columns=TAX_COLS,
+        )
+
+
+# code the compiled artifact / cached results depend on (a change = new rules version)
+_ENGINE_CODE = (
+    parse_term, _trie_regex, _weighted_terms, _rows, _first, _best, _pick,
+    WeightedBuckets.__init__, WeightedBuckets.scores, WeightedBuckets.batch_scores,
+    KeywordMatcher.__init__, KeywordMatcher.scan,
+    TaxonomyEngine.__init__, TaxonomyEngine._l2_l3, TaxonomyEngine.it_confidence,
+    TaxonomyEngine.non_it_confidence, TaxonomyEngine.classify_text, TaxonomyEngine.classify_texts,
+)
+
+
+def load_rules(path: str = RULES_PATH) -> Dict:
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def rules_version(rules: Dict) -> str:
+    return fingerprint(rules, *_ENGINE_CODE)
+
+
+def artifact_path(version: str) -> str:
+    return os.path.join(ARTIFACT_DIR, f"taxonomy_{version}.pkl")
+
+
+def compile_rules(path: str = RULES_PATH, use_artifact: bool = True) -> TaxonomyEngine:
+    """
+    Rules file -> TaxonomyEngine. Reuses resources/_compiled/taxonomy_<version>.pkl
+    when present, writes it otherwise (artifact problems only cost a recompile).
+    """
+    rules = load_rules(path)
+    version = rules_version(rules)
+    art = artifact_path(version)
+
+    if use_artifact and os.path.exists(art):
+        try:
+            with open(art, "rb") as f:
+                engine = pickle.load(f)
+            if isinstance(engine, TaxonomyEngine) and engine.version == version:
+                return engine
+        except Exception as e:
+            print(f"[WARN] Ignoring taxonomy artifact {art}: {e}")
+
+    engine = TaxonomyEngine(rules, version)
+    if use_artifact:
+        try:
+            os.makedirs(ARTIFACT_DIR, exist_ok=True)
+            tmp = art + f".tmp_{os.getpid()}_{int(time.time())}"
+            with open(tmp, "wb") as f:
+                pickle.dump(engine, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, art)
+        except OSError as e:
+            print(f"[WARN] Could not write taxonomy artifact {art}: {e}")
+    return engine
+
+
+_ENGINE: Optional[TaxonomyEngine] = None
+_ENGINE_LOCK = threading.Lock()
+
+
+def engine() -> TaxonomyEngine:
+    """
+    The engine for RULES_PATH, loaded on first use.
+    """
+    global _ENGINE
+    if _ENGINE is None:
+        with _ENGINE_LOCK:
+            if _ENGINE is None:
+                _ENGINE = compile_rules()
+    return _ENGINE
+
+
+# =========================
+# Text normalization
+# =========================
+def normalize_text(*parts: str) -> str:
+    # str.split() breaks on exactly the characters `\s` matches (str.isspace)
+    return " ".join(" ".join(f"{p}" for p in parts).lower().split())
+
+
+def batch_text(df: pd.DataFrame) -> pd.Series:
+    """
+    normalize_text() over TEXT_COLS for every row; missing columns / NA cells count as "".
+    """
+    # python storage: pyarrow's lower() differs from str.lower() on a few characters ("İ")
+    dtype = pd.StringDtype("python")
+    parts = [
+        df[c].astype(dtype).fillna("") if c in df.columns else pd.Series("", index=df.index, dtype=dtype)
+        for c in TEXT_COLS
+    ]
+    text = parts[0].str.cat(parts[1:], sep=" ")
+    return text.str.lower().str.replace(r"\s+", " ", regex=True).str.strip()
+
+
+# =========================
+# Public API (memoized)
+# =========================
+# normalized text -> classify_text() result, valid for one rules version
+# (set to ClassifierCache(..., maxsize=0) to disable)
+CACHE: Optional[ClassifierCache] = None
+
+
+def _cache() -> ClassifierCache:
+    global CACHE
+    if CACHE is None:
+        CACHE = ClassifierCache("taxonomy", engine().version, CONFIG.classify_cache_size, CONFIG.classify_cache_db)
+    return CACHE
+
+
+def classify_text(text: str) -> Dict[str, Optional[str]]:
+    return engine().classify_text(text)
+
+
+def classify_texts(texts: Iterable[str]) -> pd.DataFrame:
+    return engine().classify_texts(texts)
+
+
+def categorize(
+    title: str = "",
+    skills: str = "",
+    position: str = "",
+    employment_type: str = "",
+    description: str = "",
+    industry: str = "",
+) -> Dict[str, Optional[str]]:
+    text = normalize_text(title, skills, position, employment_type, industry, description)
+    cache = _cache()
+    tax = cache.get(text)
+    if tax is None:
+        tax = classify_text(text)
+        cache.put(text, tax)
+    return dict(tax)
+
+
+def categorize_batch(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    categorize() for every row of `df` (columns named like its arguments; missing ones = "").
+    Returns TAX_COLS on the same index. Identical texts are classified once,
+    texts already in the cache not at all.
+    """
+    codes, uniques = pd.factorize(batch_text(df), use_na_sentinel=False)
+    uniques = list(uniques)
+
+    cache = _cache()
+    known = cache.get_many(uniques)
+    todo = [t for t in uniques if t not in known]
+    if todo:
+        fresh = classify_texts(todo)
+        records = fresh.astype(object).where(fresh.notna(), None).to_dict("records")
+        cache.put_many(zip(todo, records))
+        known.update(zip(todo, records))
+
+    out = pd.DataFrame([known[t] for t in uniques], columns=TAX_COLS).iloc[codes]
+    out.index = df.index
+    return out
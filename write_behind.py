@@ -0,0 +1,154 @@
+# write_behind.py
+from __future__ import annotations
+
+import logging
+import queue
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+_STOP = object()
+
+
+class WriteBehind:
+    """
+    Background writer for scraped rows.
+
+    - submit(rows) hands a batch to a bounded queue and returns immediately
+      (blocks only when `max_pending` batches are already waiting = backpressure)
+    - the writer thread coalesces everything queued into one save_fn call
+    - close() drains the queue (also after Ctrl+C / errors) and returns NEW keys total
+    - a failed save keeps its rows and retries them with the next batch (and once more at close)
+    """
+
+    def __init__(
+        self,
+        save_fn: Callable[[List[Dict], Optional[List[str]]], int],
+        dedupe_key: str,
+        logger: Optional[logging.Logger] = None,
+        target: str = "",
+        max_pending: int = 8,
+    ):
+        self.save_fn = save_fn
+        self.dedupe_key = dedupe_key
+        self.logger = logger or logging.getLogger("write_behind")
+        self.target = target
+
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max(1, int(max_pending or 1)))
+        self._lock = threading.Lock()
+        self._carry: List[Tuple[List[Dict], Optional[List[str]]]] = []  # rows of failed saves
+        self._closed = False
+
+        self.inserted_total = 0
+        self.saves = 0
+        self.failed_saves = 0
+        self.save_sec = 0.0
+
+        self._thread = threading.Thread(target=self._run, name="write-behind", daemon=True)
+        self._thread.start()
+
+    # -------------------------
+    # Producer side
+    # -------------------------
+    def submit(self, rows: List[Dict], update_cols: Optional[List[str]] = None) -> None:
+        if not rows:
+            return
+        if self._closed:
+            raise RuntimeError("WriteBehind is closed")
+        self._queue.put((list(rows), update_cols))
+
+    def close(self, timeout: Optional[float] = None) -> int:
+        """
+        Flush everything still queued, stop the thread, return NEW keys inserted.
+        """
+        if not self._closed:
+            self._closed = True
+            self._queue.put(_STOP)
+        self._thread.join(timeout=timeout)
+        if self._thread.is_alive():
+            self.logger.warning(f"[Write-behind] still saving after {timeout}s; leaving it to finish in the background.")
+        return self.inserted_total
+
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    # -------------------------
+    # Writer side
+    # -------------------------
+    def _key(self, row: Dict) -> str:
+        return str(row.get(self.dedupe_key, "")).strip()
+
+    def _take_queued(self, first) -> Tuple[List, bool]:
+        """
+        `first` + everything already waiting (non-blocking). Returns (items, stop_seen).
+        """
+        items = [] if first is _STOP else [first]
+        stop = first is _STOP
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is _STOP:
+                stop = True
+                continue
+            items.append(item)
+        return items, stop
+
+    def _groups(self, items: List) -> List[Tuple[List[Dict], Optional[List[str]], int]]:
+        """
+        Coalesce consecutive batches with the same update_cols and no repeated key
+        (a repeated key starts a new group so upsert order is preserved).
+        """
+        groups: List[Tuple[List[Dict], Optional[List[str]], int]] = []
+        keys: set = set()
+        for rows, update_cols in items:
+            row_keys = {self._key(r) for r in rows}
+            if groups and groups[-1][1] == update_cols and not (keys & row_keys):
+                g_rows, g_cols, n = groups[-1]
+                groups[-1] = (g_rows + list(rows), g_cols, n + 1)
+                keys |= row_keys
+            else:
+                groups.append((list(rows), update_cols, 1))
+                keys = set(row_keys)
+        return groups
+
+    def _save(self, rows: List[Dict], update_cols: Optional[List[str]], n_batches: int) -> bool:
+        t0 = time.perf_counter()
+        try:
+            inserted = self.save_fn(rows, update_cols)
+        except Exception:
+            self.failed_saves += 1
+            self.logger.exception(f"[Autosave] Failed while saving {len(rows)} rows.")
+            return False
+        elapsed = time.perf_counter() - t0
+
+        with self._lock:
+            self.inserted_total += inserted
+            self.saves += 1
+            self.save_sec += elapsed
+
+        self.logger.info(
+            f"[Autosave] ✅ Saved {len(rows)} rows ({n_batches} batch(es)) -> {self.target} | "
+            f"NEW keys: {inserted} | Total saved this cycle: {self.inserted_total} | {elapsed:.1f}s"
+        )
+        return True
+
+    def _run(self) -> None:
+        stop = False
+        while not stop:
+            items, stop = self._take_queued(self._queue.get())
+
+            # rows from a failed save go out again first, together with the new ones
+            items = self._carry + items
+            self._carry = []
+
+            for rows, update_cols, n in self._groups(items):
+                if not self._save(rows, update_cols, n):
+                    self._carry.append((rows, update_cols))
+
+        # close(): one last attempt for rows that failed before
+        for rows, update_cols, n in self._groups(self._carry):
+            if not self._save(rows, update_cols, n):
+                self.logger.error(f"[Autosave] Giving up on {len(rows)} unsaved rows after a failed retry.")
+        self._carry = []